@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class TicketAppConfig(AppConfig):
+    name = 'app'
+    default_auto_field = 'django.db.models.BigAutoField'
+
+    def ready(self):
+        from app import signals  # noqa: F401
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from app.services.event_type_service import EventTypeService
+from app.signals import notify_events_changed
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Create the default event types and link every event without a type id to its normalized type"
+
+    def handle(self, *args, **options):
+        updated = EventTypeService.backfill()
+        # the raw type strings were canonicalized, derived data (cards, search, facets) follows
+        for start in range(0, len(updated), BATCH_SIZE):
+            notify_events_changed(updated[start:start + BATCH_SIZE])
+        self.stdout.write(f"Linked {len(updated)} events to their event type")
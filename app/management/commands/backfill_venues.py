@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from app.models.venue import Venue
+from app.services.venue_service import VenueService
+
+
+class Command(BaseCommand):
+    help = "Register a venue for every distinct event place/details venue and link events to it"
+
+    def handle(self, *args, **options):
+        linked = VenueService.backfill()
+        self.stdout.write(f"Linked {len(linked)} events to {Venue.objects.count()} venues; "
+                          f"set coordinates through /api/venues/ to make them searchable")
@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.services.recommendation_service import RecommendationService
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored event recommendations of every user, meant to run nightly"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--k', type=int, default=None, help="Recommendations kept per user")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        users = RecommendationService.build(k=options['k'])
+        self.stdout.write(f"Built recommendations for {users} users in {time.monotonic() - started:.1f}s")
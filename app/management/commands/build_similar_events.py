@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from app.services.similar_event_service import SimilarEventService
+
+
+class Command(BaseCommand):
+    help = "Recompute the \"customers also bought\" neighbours of every event, or only of queued basket changes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queued', action='store_true',
+                            help="Only apply basket changes queued by orders and favorites (run every few minutes)")
+        parser.add_argument('--limit', type=int, default=1000, help="Queued changes applied per pass")
+
+    def handle(self, *args, **options):
+        if options['queued']:
+            applied = total = 0
+            while True:
+                applied = SimilarEventService.refresh_queued(limit=options['limit'])
+                if not applied:
+                    break
+                total += applied
+            self.stdout.write(f"Applied {total} queued basket changes")
+            return
+        rows = SimilarEventService.build()
+        self.stdout.write(f"Stored {rows} similar-event pairs")
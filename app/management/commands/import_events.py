@@ -0,0 +1,38 @@
+import json
+import os
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from app.services.event_import_service import EventImportService
+
+
+class Command(BaseCommand):
+    help = "Import events from a CSV or JSON Lines file (artists as names, '|'-separated in CSV)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help="Username recorded as the creator of the events")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default=None,
+                            help="File format, taken from the extension by default")
+        parser.add_argument('--chunk-size', type=int, default=None, help="Rows written per transaction")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' not found")
+
+        format = options['format'] or os.path.splitext(options['path'])[1].lstrip('.').lower()
+        if format not in ('csv', 'jsonl'):
+            raise CommandError("Cannot tell the file format, pass --format csv or --format jsonl")
+
+        with open(options['path'], encoding='utf-8-sig', newline='') as lines:
+            report = EventImportService.import_rows(EventImportService.read_rows(lines, format), user,
+                                                    chunk_size=options['chunk_size'])
+
+        for error in report['errors']:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['error'])}")
+        self.stdout.write(f"Imported {report['created']} of {report['rows']} rows "
+                          f"({report['failed']} failed, {report['artists_created']} new artists) "
+                          f"in {report['seconds']}s, {report['rows_per_second']} rows/s")
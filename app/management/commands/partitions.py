@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.services.partition_service import PartitionService, PartitionError
+
+
+class Command(BaseCommand):
+    help = "Manage monthly partitions of orders, order products and basket tickets (PostgreSQL only)"
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest='action', required=True)
+
+        convert = subparsers.add_parser('convert', help="One-time switch of the tables to partitioned tables")
+        convert.add_argument('--months-ahead', type=int, default=3)
+
+        create = subparsers.add_parser('create', help="Create partitions for the coming months")
+        create.add_argument('--months-ahead', type=int, default=3)
+
+        archive = subparsers.add_parser('archive', help="Detach old partitions and dump them to .csv.gz files")
+        archive.add_argument('--older-than', type=int, default=24, help="Age in months")
+        archive.add_argument('--archive-dir', default='archive')
+
+    def handle(self, *args, **options):
+        try:
+            if options['action'] == 'convert':
+                tables = PartitionService.convert(months_ahead=options['months_ahead'])
+                self.stdout.write(f"Converted: {', '.join(tables) or 'nothing to do'}")
+            elif options['action'] == 'create':
+                created = PartitionService.create_partitions(months_ahead=options['months_ahead'])
+                self.stdout.write(f"Created {len(created)} partitions")
+            else:
+                archived = PartitionService.archive(options['older_than'], options['archive_dir'])
+                for path in archived:
+                    self.stdout.write(f"Archived {path}")
+                self.stdout.write(f"Archived {len(archived)} partitions")
+        except PartitionError as e:
+            raise CommandError(str(e))
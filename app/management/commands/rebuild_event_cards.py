@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from app.models.event_card import EventCard
+from app.services.event_card_service import EventCardService
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized event cards of every event"
+
+    def handle(self, *args, **options):
+        EventCardService.refresh()
+        self.stdout.write(f"Rebuilt {EventCard.objects.count()} event cards")
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from app.models.event_popularity import EventPopularity
+from app.services.popularity_service import PopularityService
+
+
+class Command(BaseCommand):
+    help = "Recompute the popularity leaderboard of every event"
+
+    def handle(self, *args, **options):
+        PopularityService.refresh()
+        self.stdout.write(f"Rebuilt popularity of {EventPopularity.objects.count()} events")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from app.models.event_card import EventCard
+from app.models.event_rating_summary import EventRatingSummary
+from app.services.event_card_service import EventCardService
+from app.services.rating_summary_service import RatingSummaryService
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Recompute the rating summary of every event from its reviews"
+
+    def handle(self, *args, **options):
+        RatingSummaryService.rebuild()
+        # event cards copy their rating from the summaries
+        event_ids = list(EventCard.objects.values_list('event_id', flat=True))
+        for start in range(0, len(event_ids), BATCH_SIZE):
+            EventCardService.refresh_activity(event_ids[start:start + BATCH_SIZE], 'reviews')
+        self.stdout.write(f"Rebuilt rating summaries of {EventRatingSummary.objects.count()} events")
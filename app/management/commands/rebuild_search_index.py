@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from app.services.event_search_service import EventSearchService
+
+
+class Command(BaseCommand):
+    help = "Create the event full-text search configuration and index, and recompute every search vector"
+
+    def handle(self, *args, **options):
+        EventSearchService.ensure_schema()
+        EventSearchService.refresh()
+        self.stdout.write("Event search index rebuilt")
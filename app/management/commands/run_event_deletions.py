@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from app.services.event_deletion_service import EventDeletionService
+
+
+class Command(BaseCommand):
+    help = "Remove deleted events and their dependents in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10, help="Maximum number of deletions to run")
+        parser.add_argument('--chunk-size', type=int, default=None, help="Rows removed per transaction")
+
+    def handle(self, *args, **options):
+        stats = EventDeletionService.run_pending(limit=options['limit'], chunk_size=options['chunk_size'])
+        self.stdout.write(
+            f"Done {stats['done']}, failed {stats['failed']}, still pending {stats['remaining']}"
+        )
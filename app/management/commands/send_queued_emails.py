@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from app.services.mail_service import MailService
+
+
+class Command(BaseCommand):
+    help = "Retry emails queued while the SMTP server was unavailable"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help="Maximum number of emails to process")
+
+    def handle(self, *args, **options):
+        stats = MailService.flush_queue(limit=options['limit'])
+        self.stdout.write(
+            f"Sent {stats['sent']}, failed {stats['failed']}, still pending {stats['remaining']}"
+        )
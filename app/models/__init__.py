@@ -1,4 +1,7 @@
 from app.models.user import AppUser
+from app.models.event_type import EventType, EventTypeAlias
+from app.models.venue import Venue
+from app.models.event_series import EventSeries
 from app.models.event import Event
 from app.models.technical_issue import TechnicalIssue
 from app.models.loyalty_program import LoyaltyProgram
@@ -8,4 +11,12 @@ from app.models.event_attachment import EventAttachment
 from app.models.ticket import Ticket
 from app.models.orders import *
 from app.models.voucher import Voucher
-from app.models.event_photo import EventPhoto
\ No newline at end of file
+from app.models.event_photo import EventPhoto
+from app.models.queued_email import QueuedEmail
+from app.models.feature_flag import FeatureFlag
+from app.models.event_card import EventCard
+from app.models.event_popularity import EventPopularity
+from app.models.event_recommendation import EventRecommendation
+from app.models.similar_event import SimilarEvent, SimilarEventRefresh
+from app.models.event_rating_summary import EventRatingSummary
+from app.models.event_deletion import EventDeletion
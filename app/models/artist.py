@@ -1,6 +1,8 @@
 from django.db import models
 
-class Artist(models.Model):
+from app.models.versioned import VersionedModel
+
+class Artist(VersionedModel):
     name = models.CharField(max_length=100)
     genre = models.CharField(max_length=100, blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
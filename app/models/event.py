@@ -1,21 +1,75 @@
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from app.models.artist import Artist
+from app.models.event_series import EventSeries
+from app.models.event_type import EventType
+from app.models.venue import Venue
+from app.models.versioned import VersionedModel
 
-class Event(models.Model):
+
+class EventQuerySet(models.QuerySet):
+    def with_serializer_relations(self):
+        """Load everything EventSerializer reads: artists with one more query, the rating summary joined in"""
+        return self.select_related('rating_summary').prefetch_related('artists')
+
+
+class EventManager(models.Manager.from_queryset(EventQuerySet)):
+    """Events that are not waiting for deletion"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class Event(VersionedModel):
     title = models.CharField(max_length=200)
+    # free-text type as sent by clients, canonicalized to event_type.code on save
     type = models.CharField(max_length=200)
+    event_type = models.ForeignKey(EventType, on_delete=models.PROTECT, null=True, blank=True, related_name='events')
     date = models.DateTimeField()
     start_hour = models.TimeField(null=True, blank=True)
     end_hour = models.TimeField(null=True, blank=True)
     place = models.CharField(max_length=200, null=True, blank=True)
+    # venue registry entry of place, linked on save
+    venue = models.ForeignKey(Venue, on_delete=models.SET_NULL, null=True, blank=True, related_name='events')
     price = models.DecimalField(max_digits=10, decimal_places=2)
     seats_no = models.IntegerField(null=True, blank=True)
     description = models.TextField(blank=True, null=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     artists = models.ManyToManyField(Artist, related_name='events')
+    # set on occurrences generated from a series
+    series = models.ForeignKey(EventSeries, on_delete=models.SET_NULL, null=True, blank=True,
+                               related_name='occurrences')
+    # maintained by EventSearchService, GIN-indexed on PostgreSQL
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+    # set when a deletion job is scheduled, the event is hidden until the job removes it
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = EventManager()
+    all_objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date']),
+        ]
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'type' in update_fields:
+            self.event_type = EventType.resolve(self.type)
+            if self.event_type:
+                self.type = self.event_type.code
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'event_type'}
+        if update_fields is None or 'place' in update_fields:
+            # None once the place is blanked
+            self.venue = Venue.resolve(self.place)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'venue'}
+        super().save(*args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,42 @@
+from django.db import models
+
+from app.models.event import Event
+from app.models.event_type import EventType
+
+
+class EventCard(models.Model):
+    """
+    Denormalized catalog card of an event, one row per event.
+
+    Maintained by EventCardService from the events_changed and event_activity_changed signals; never written
+    directly.
+    """
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='card')
+    title = models.CharField(max_length=200)
+    type = models.CharField(max_length=200)
+    event_type = models.ForeignKey(EventType, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    date = models.DateTimeField()
+    start_hour = models.TimeField(null=True, blank=True)
+    end_hour = models.TimeField(null=True, blank=True)
+    place = models.CharField(max_length=200, null=True, blank=True)
+    venue = models.CharField(max_length=255, null=True, blank=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2)
+    artist_names = models.JSONField(default=list)
+    seats_no = models.IntegerField(null=True, blank=True)
+    tickets_sold = models.IntegerField(default=0)
+    seats_left = models.IntegerField(null=True, blank=True)
+    average_rating = models.FloatField(null=True, blank=True)
+    review_count = models.IntegerField(default=0)
+    favorite_count = models.IntegerField(default=0)
+    cover_photo = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date']),
+            models.Index(fields=['event_type', 'date']),
+        ]
+
+    def __str__(self):
+        return f"Card for {self.title}"
@@ -0,0 +1,35 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class EventDeletion(models.Model):
+    """Background removal of a soft-deleted event and everything hanging off it"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    # not a foreign key: the job outlives the event
+    event_id = models.IntegerField(db_index=True)
+    title = models.CharField(max_length=200)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    # {step: {'total': ..., 'deleted': ...}} for each kind of dependent row, plus 'files'
+    progress = models.JSONField(default=dict)
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # last claim or progress of the worker running the job; a 'running' job idle for too long is taken over
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"EventDeletion {self.id} of event {self.event_id} ({self.status})"
@@ -0,0 +1,29 @@
+from django.db import models
+
+from app.models.event import Event
+
+
+class EventPopularity(models.Model):
+    """
+    Leaderboard row of an event, maintained by PopularityService.
+
+    score is the log2 of a forward-decayed activity sum: every ticket, order and favorite counts with a weight
+    that doubles every half-life after a fixed epoch, so scores computed at different times stay comparable
+    and a row only needs recomputing when its own event sees activity.
+    """
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='popularity')
+    # copy of event.date, popular only ranks upcoming events
+    date = models.DateTimeField()
+    score = models.FloatField(default=0)
+    tickets_sold = models.IntegerField(default=0)
+    order_count = models.IntegerField(default=0)
+    favorite_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score', 'date']),
+        ]
+
+    def __str__(self):
+        return f"Popularity of event {self.event_id}: {self.score:.2f}"
@@ -0,0 +1,33 @@
+from django.db import models
+
+from app.models.event import Event
+
+STARS = (1, 2, 3, 4, 5)
+
+
+class EventRatingSummary(models.Model):
+    """
+    Review count, star sum and 1-5 star histogram of an event, maintained by RatingSummaryService.
+
+    The order review endpoints adjust the counters in place; events without reviews have no row.
+    """
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='rating_summary')
+    review_count = models.IntegerField(default=0)
+    stars_sum = models.IntegerField(default=0)
+    stars_1 = models.IntegerField(default=0)
+    stars_2 = models.IntegerField(default=0)
+    stars_3 = models.IntegerField(default=0)
+    stars_4 = models.IntegerField(default=0)
+    stars_5 = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Ratings of event {self.event_id}: {self.average_rating} from {self.review_count}"
+
+    @property
+    def average_rating(self):
+        return round(self.stars_sum / self.review_count, 2) if self.review_count > 0 else None
+
+    @property
+    def histogram(self):
+        return {str(stars): getattr(self, f'stars_{stars}') for stars in STARS}
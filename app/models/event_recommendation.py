@@ -0,0 +1,21 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+from app.models.event import Event
+
+
+class EventRecommendation(models.Model):
+    """Precomputed top-K recommendations of a user, rebuilt by RecommendationService.build"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='event_recommendations')
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='+')
+    rank = models.IntegerField()
+    score = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} for user {self.user_id}: event {self.event_id}"
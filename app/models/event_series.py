@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+from app.models.artist import Artist
+
+
+class EventSeries(models.Model):
+    """
+    A run of the same show on many dates (theater runs, residencies).
+
+    The occurrences are ordinary events linked back through Event.series, generated from the recurrence rule
+    by EventSeriesService; edits to the series are copied onto its upcoming occurrences.
+    """
+    FREQUENCY_CHOICES = [('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly')]
+
+    title = models.CharField(max_length=200)
+    type = models.CharField(max_length=200)
+    start_hour = models.TimeField(null=True, blank=True)
+    end_hour = models.TimeField(null=True, blank=True)
+    place = models.CharField(max_length=200, null=True, blank=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    seats_no = models.IntegerField(null=True, blank=True)
+    description = models.TextField(blank=True, null=True)
+    rules = models.TextField(blank=True, null=True)
+    artists = models.ManyToManyField(Artist, related_name='series', blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    # recurrence rule, see app.utils.recurrence
+    first_date = models.DateTimeField()
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES)
+    interval = models.PositiveIntegerField(default=1)
+    weekdays = models.JSONField(default=list, blank=True)
+    count = models.PositiveIntegerField(null=True, blank=True)
+    until = models.DateField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "Event series"
+
+    def __str__(self):
+        return f"{self.title} ({self.frequency})"
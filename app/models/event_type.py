@@ -0,0 +1,49 @@
+import re
+import unicodedata
+
+from django.db import models
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_type_name(name):
+    """'  Stand-up ' -> 'STAND UP': accent-free, upper case, single spaces"""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(_WORD.findall(text)).upper()
+
+
+class EventType(models.Model):
+    code = models.CharField(max_length=200, unique=True)
+    name = models.CharField(max_length=200)
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def resolve(cls, name):
+        """The type a free-text name or alias stands for, created when the name is new; None for a blank name"""
+        alias = normalize_type_name(name)
+        if not alias:
+            return None
+        match = EventTypeAlias.objects.filter(alias=alias).select_related('event_type').first()
+        if match:
+            return match.event_type
+        event_type, _ = cls.objects.get_or_create(code=alias, defaults={'name': alias.title()})
+        EventTypeAlias.objects.get_or_create(alias=alias, defaults={'event_type': event_type})
+        return event_type
+
+    @staticmethod
+    def ids_matching(names):
+        """Subquery of the type ids the given names or aliases stand for"""
+        aliases = {normalize_type_name(name) for name in names}
+        return EventTypeAlias.objects.filter(alias__in=aliases).values('event_type_id')
+
+
+class EventTypeAlias(models.Model):
+    """Normalized spelling of a type name, every type has at least its own code as an alias"""
+    alias = models.CharField(max_length=200, unique=True)
+    event_type = models.ForeignKey(EventType, on_delete=models.CASCADE, related_name='aliases')
+
+    def __str__(self):
+        return f"{self.alias} -> {self.event_type.code}"
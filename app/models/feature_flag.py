@@ -0,0 +1,11 @@
+from django.db import models
+
+
+class FeatureFlag(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    enabled = models.BooleanField(default=False)
+    description = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {'on' if self.enabled else 'off'}"
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.conf import settings
 from app.models.event import Event
@@ -44,6 +44,12 @@ class Review(models.Model):
     def __str__(self):
         return f"Review {self.id}: {self.numberOfStars} stars"
 
+class OrderQuerySet(models.QuerySet):
+    def with_serializer_relations(self):
+        """Load everything OrderSerializer reads in a fixed number of queries"""
+        return self.select_related('review').prefetch_related('products', 'orderproduct_set__product')
+
+
 class Order(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -60,13 +66,68 @@ class Order(models.Model):
     address = models.TextField()
     products = models.ManyToManyField(Product, through='OrderProduct')
 
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+
     def __str__(self):
         return f"Order {self.id} by {self.user} on {self.date:%Y-%m-%d}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_date = instance.__dict__.get('date')
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self._state.adding or getattr(self, '_saved_date', None) == self.date:
+            super().save(*args, **kwargs)
+        else:
+            # the lines keep a copy of the date, their partition key
+            with transaction.atomic():
+                OrderProduct.objects.filter(order_id=self.id).exclude(order_date=self.date).update(order_date=self.date)
+                super().save(*args, **kwargs)
+        self._saved_date = self.date
+
+    def lines(self):
+        """OrderProducts of this order, filtered on the partition key so that Postgres reads one partition"""
+        return OrderProduct.objects.filter(order_id=self.id, order_date=self.date)
+
+class OrderProductQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """Copy order.date onto order_date like save() does (also used by order.products.add())"""
+        objs = list(objs)
+        order_field = self.model._meta.get_field('order')
+        uncached = {obj.order_id for obj in objs if obj.order_id is not None and not order_field.is_cached(obj)}
+        dates = dict(Order.objects.filter(id__in=uncached).values_list('id', 'date')) if uncached else {}
+        for obj in objs:
+            if obj.order_id is None:
+                continue
+            if order_field.is_cached(obj):
+                obj.order_date = obj.order.date
+            elif obj.order_id in dates:
+                obj.order_date = dates[obj.order_id]
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class OrderProduct(models.Model):
-    order = models.ForeignKey(Order, on_delete=models.CASCADE)
+    # Order is range-partitioned by date on Postgres (see PartitionService), and a foreign key
+    # constraint can't point at a partitioned table's id alone, so it is enforced by the ORM only
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, db_constraint=False)
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.IntegerField(default=1)
+    # copy of order.date, the partition key of this table
+    order_date = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = OrderProductQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        if self.order_id is not None:
+            self.order_date = self.order.date
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.quantity} x {self.product} (Order {self.order.id})"
@@ -80,7 +141,8 @@ class IssueReport(models.Model):
     order = models.ForeignKey(
         Order,
         on_delete=models.CASCADE,
-        related_name='issue_reports'
+        related_name='issue_reports',
+        db_constraint=False
     )
     opis = models.TextField()
     zalacznik = models.FileField(upload_to='issue_attachments/', blank=True, null=True)
@@ -108,7 +170,8 @@ class RefundRequest(models.Model):
     order = models.ForeignKey(
         'Order',
         on_delete=models.CASCADE,
-        related_name='refund_requests'
+        related_name='refund_requests',
+        db_constraint=False
     )
     reason = models.TextField()
     status = models.CharField(
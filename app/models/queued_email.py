@@ -0,0 +1,32 @@
+from django.db import models
+
+
+class QueuedEmail(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    to = models.JSONField(default=list)
+    attachment_name = models.CharField(max_length=255, blank=True, null=True)
+    attachment_content = models.BinaryField(blank=True, null=True)
+    attachment_mimetype = models.CharField(max_length=100, blank=True, null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # when a flush_queue run took the email, see MailService._claim
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"QueuedEmail {self.id} to {', '.join(self.to)} ({self.status})"
@@ -0,0 +1,37 @@
+from django.db import models
+
+from app.models.event import Event
+
+
+class SimilarEvent(models.Model):
+    """Top-K "customers also bought" neighbours of an event, maintained by SimilarEventService"""
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='similar_events')
+    similar = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    rank = models.IntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['event', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"Event {self.event_id} ~ event {self.similar_id} ({self.score:.2f})"
+
+
+class SimilarEventRefresh(models.Model):
+    """
+    A basket change (user ordered or favorited event) whose neighbours are not recomputed yet,
+    applied by `manage.py build_similar_events --queued`
+    """
+    event_id = models.IntegerField()
+    user_id = models.IntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['event_id', 'user_id'], name='unique_similar_event_refresh'),
+        ]
+
+    def __str__(self):
+        return f"Refresh neighbours of event {self.event_id} (user {self.user_id})"
@@ -10,3 +10,8 @@ class Ticket(models.Model):
     quantity = models.IntegerField(default=1)
     is_group = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
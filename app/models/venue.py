@@ -0,0 +1,50 @@
+import re
+import unicodedata
+
+from django.db import models
+
+from app.utils import geohash
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+_FOLD = str.maketrans({'ł': 'l', 'Ł': 'L'})
+
+
+def normalize_venue_name(name):
+    """'  Tauron  Arena, Kraków ' -> 'tauron arena krakow'"""
+    text = unicodedata.normalize('NFKD', (name or '').translate(_FOLD))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(_WORD.findall(text)).lower()
+
+
+class Venue(models.Model):
+    name = models.CharField(max_length=255)
+    normalized_name = models.CharField(max_length=255, unique=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # derived from latitude/longitude on save, prefix scans find venues in nearby cells
+    geohash = models.CharField(max_length=12, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['latitude', 'longitude']),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_venue_name(self.name)
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geohash.encode(self.latitude, self.longitude)
+        else:
+            self.geohash = ''
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def resolve(cls, name):
+        """The venue a free-text name stands for, created when new; None for a blank name"""
+        normalized = normalize_venue_name(name)
+        if not normalized:
+            return None
+        venue, _ = cls.objects.get_or_create(normalized_name=normalized, defaults={'name': name.strip()})
+        return venue
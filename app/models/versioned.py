@@ -0,0 +1,56 @@
+from django.db import models
+from django.db.models import F
+
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a row changed between reading it and writing it back"""
+
+    def __init__(self, instance, expected_version):
+        self.instance = instance
+        self.expected_version = expected_version
+        super().__init__(f"{type(instance).__name__} {instance.pk} is no longer at version {expected_version}")
+
+
+class VersionedModel(models.Model):
+    """
+    Optimistic locking: every update of a saved row bumps `version`. save(expected_version=n) writes with a
+    single `UPDATE ... WHERE id = %s AND version = n` and raises ConcurrentUpdateError when no row matched.
+    A plain save() checks nothing but bumps the stored version (version = version + 1), so that a write
+    made meanwhile by someone else still invalidates the version they read.
+    """
+    version = models.PositiveIntegerField(default=1)
+
+    _expected_version = None
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, expected_version=None, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if self._state.adding or (update_fields is not None and not update_fields):
+            return super().save(*args, **kwargs)
+
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'version'}
+        previous = self.version
+        self.version = F('version') + 1 if expected_version is None else expected_version + 1
+        self._expected_version = expected_version
+        try:
+            super().save(*args, **kwargs)
+        except Exception:
+            self.version = previous
+            raise
+        finally:
+            self._expected_version = None
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        if self._expected_version is None:
+            updated = super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+            if updated and not isinstance(self.version, int):
+                # the version the database computed, read before post_save receivers see the instance
+                self.version = base_qs.filter(pk=pk_val).values_list('version', flat=True).get()
+            return updated
+        base_qs = base_qs.filter(version=self._expected_version)
+        if not super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update):
+            raise ConcurrentUpdateError(self, self._expected_version)
+        return True
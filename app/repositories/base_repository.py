@@ -1,3 +1,9 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from app.models.versioned import ConcurrentUpdateError, VersionedModel
+
+
 class BaseRepository:
     model = None
 
@@ -15,12 +21,50 @@ class BaseRepository:
         instance.save()
         return instance
 
-    def update(self, instance, **kwargs):
+    def update(self, instance, expected_version=None, touch=False, **kwargs):
+        """
+        Set the given non-None values and write only the columns whose value changed.
+        Versioned models are written only if still at expected_version (default: the version read),
+        ConcurrentUpdateError otherwise. With touch the row is written (version bumped) even when no value
+        changed, for edits of related rows only.
+        """
+        changed = []
         for key, value in kwargs.items():
-            if value is not None:
+            if value is not None and self._differs(instance, key, value):
                 setattr(instance, key, value)
-        instance.save()
+                changed.append(key)
+
+        versioned = isinstance(instance, VersionedModel)
+        write = bool(changed) or touch
+        if versioned and expected_version is not None and not write and int(expected_version) != instance.version:
+            raise ConcurrentUpdateError(instance, int(expected_version))
+        if not write:
+            return instance
+
+        update_fields = changed + [field.name for field in self.model._meta.concrete_fields
+                                   if getattr(field, 'auto_now', False)]
+        if versioned:
+            version = instance.version if expected_version is None else int(expected_version)
+            # a savepoint, so that a conflict leaves an enclosing transaction usable
+            with transaction.atomic():
+                instance.save(update_fields=update_fields, expected_version=version)
+        else:
+            instance.save(update_fields=update_fields)
         return instance
 
+    def update_where(self, filters, **values):
+        """Set values on every row matching filters with one UPDATE, returns the number of rows updated"""
+        return self.model.objects.filter(filters).update(**values)
+
     def delete(self, instance):
-        instance.delete()
\ No newline at end of file
+        instance.delete()
+
+    @staticmethod
+    def _differs(instance, key, value):
+        field = instance._meta.get_field(key)
+        current = getattr(instance, field.attname)
+        try:
+            return field.to_python(value) != current
+        except (TypeError, ValidationError):
+            # left for save() to convert or reject
+            return True
\ No newline at end of file
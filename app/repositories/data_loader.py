@@ -0,0 +1,37 @@
+from collections import defaultdict
+
+
+class BatchLoader:
+    """
+    Loads related rows for many keys with a single IN query and maps them back to their keys.
+
+        details = BatchLoader(EventDetails, key_field='event_id').load_many(event_ids)
+        details.get(event.id)
+    """
+
+    def __init__(self, model, key_field='id', queryset=None, many=False, order_by=('pk',)):
+        self.model = model
+        self.key_field = key_field
+        self.queryset = queryset
+        self.many = many
+        self.order_by = order_by
+        self._cache = {}
+
+    def load(self, key):
+        return self.load_many([key]).get(key)
+
+    def load_many(self, keys):
+        """Return {key: row} ({key: [rows]} when many=True); keys without rows are left out"""
+        keys = list(dict.fromkeys(key for key in keys if key is not None))
+        missing = [key for key in keys if key not in self._cache]
+
+        if missing:
+            queryset = self.queryset if self.queryset is not None else self.model.objects.all()
+            found = defaultdict(list)
+            for row in queryset.filter(**{f'{self.key_field}__in': missing}).order_by(*self.order_by):
+                found[getattr(row, self.key_field)].append(row)
+            for key in missing:
+                rows = found.get(key, [])
+                self._cache[key] = rows if self.many else (rows[0] if rows else None)
+
+        return {key: self._cache[key] for key in keys if self._cache[key] not in (None, [])}
@@ -2,6 +2,8 @@ from django.db.models import Q
 from app.models.event import Event
 from app.models.event_details import EventDetails
 from app.repositories.base_repository import BaseRepository
+from app.repositories.data_loader import BatchLoader
+from app.services.event_search_service import EventSearchService
 
 
 class EventRepository(BaseRepository):
@@ -9,52 +11,50 @@ class EventRepository(BaseRepository):
 
     def get_event_with_details(self, event_id):
         """Get an event and its details by ID"""
-        event = self.get_by_id(event_id)
+        event = self.with_relations(self.model.objects.filter(id=event_id)).first()
         if not event:
             return None
 
-        try:
-            details = EventDetails.objects.get(event=event)
-        except EventDetails.DoesNotExist:
-            details = None
-
         return {
             'event': event,
-            'details': details
+            'details': self.load_details([event.id]).get(event.id)
         }
 
     def get_filtered_events(self, query=None, start_date=None, end_date=None):
-        """Get events with optional filtering"""
+        """Get events with optional filtering, ranked by relevance when there is a search query"""
         filters = Q()
 
-        if query:
-            filters &= (Q(title__icontains=query) | Q(description__icontains=query))
-
         if start_date:
             filters &= Q(date__gte=start_date)
 
         if end_date:
             filters &= Q(date__lte=end_date)
 
-        return self.model.objects.filter(filters).order_by('date')
+        events = self.model.objects.filter(filters).order_by('date')
+        if query:
+            events = EventSearchService.search(events, query)
+        return events
 
     def get_events_with_details(self, query=None, start_date=None, end_date=None):
-        """Get filtered events with their details"""
-        events = self.get_filtered_events(query, start_date, end_date)
-
-        result = []
-        for event in events:
-            try:
-                details = EventDetails.objects.get(event=event)
-            except EventDetails.DoesNotExist:
-                details = None
+        """Get filtered events with their details, in a fixed number of queries"""
+        events = list(self.with_relations(self.get_filtered_events(query, start_date, end_date)))
+        details = self.load_details([event.id for event in events])
 
-            result.append({
+        return [
+            {
                 'event': event,
-                'details': details
-            })
-
-        return result
+                'details': details.get(event.id)
+            }
+            for event in events
+        ]
+
+    def with_relations(self, events):
+        """Load what event payloads read besides details: artists and rating summary"""
+        return events.with_serializer_relations()
+
+    def load_details(self, event_ids):
+        """First details row of each event with one query, keyed by event ID"""
+        return BatchLoader(EventDetails, key_field='event_id').load_many(event_ids)
 
     def add_artists_to_event(self, event, artists):
         """Add artists to an event"""
@@ -13,7 +13,7 @@ class VoucherRepository(BaseRepository):
     
     def get_user_vouchers(self, user_id):
         """Get all vouchers owned by a specific user"""
-        return self.model.objects.filter(owner_id=user_id)
+        return self.model.objects.filter(owner_id=user_id).select_related('owner')
     
     def get_active_vouchers(self, user_id):
         """Get all active vouchers owned by a specific user"""
@@ -4,4 +4,5 @@ from app.models import Artist
 class ArtistSerializer(serializers.ModelSerializer):
     class Meta:
         model = Artist
-        fields = ['id', 'name', 'genre', 'bio']
\ No newline at end of file
+        fields = ['id', 'name', 'genre', 'bio', 'version']
+        read_only_fields = ['version']
\ No newline at end of file
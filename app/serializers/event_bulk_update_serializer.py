@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+from rest_framework import serializers
+
+
+class EventBulkFilterSerializer(serializers.Serializer):
+    """Which events a bulk update touches; at least one filter, or all=true"""
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    types = serializers.ListField(child=serializers.CharField(), required=False)
+    place = serializers.CharField(required=False)
+    series = serializers.IntegerField(required=False)
+    title_contains = serializers.CharField(required=False)
+    start_date = serializers.DateTimeField(required=False)
+    end_date = serializers.DateTimeField(required=False)
+    all = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        if not attrs.pop('all') and not attrs:
+            raise serializers.ValidationError("Pass at least one filter, or all=true to update every event")
+        return attrs
+
+
+class EventBulkChangesSerializer(serializers.Serializer):
+    """What a bulk update changes; prices are set, moved by an amount or by a percentage"""
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0'), required=False)
+    price_change = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    price_percent = serializers.DecimalField(max_digits=6, decimal_places=2, min_value=Decimal('-100'),
+                                             required=False)
+    shift_days = serializers.IntegerField(required=False)
+    shift_minutes = serializers.IntegerField(required=False)
+    type = serializers.CharField(max_length=200, required=False)
+    place = serializers.CharField(max_length=200, required=False, allow_blank=True)
+    seats_no = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if len({'price', 'price_change', 'price_percent'} & attrs.keys()) > 1:
+            raise serializers.ValidationError("Use only one of price, price_change and price_percent")
+        if not attrs:
+            raise serializers.ValidationError("Nothing to change")
+        return attrs
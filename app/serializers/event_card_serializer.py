@@ -0,0 +1,17 @@
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+from app.models.event_card import EventCard
+
+
+class EventCardSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='event_id', read_only=True)
+    cover_photo = serializers.SerializerMethodField()
+
+    class Meta:
+        model = EventCard
+        fields = ['id', 'title', 'type', 'date', 'start_hour', 'end_hour', 'place', 'venue', 'price',
+                  'min_price', 'artist_names', 'seats_no', 'tickets_sold', 'seats_left', 'average_rating',
+                  'review_count', 'favorite_count', 'cover_photo']
+
+    def get_cover_photo(self, card):
+        return default_storage.url(card.cover_photo) if card.cover_photo else None
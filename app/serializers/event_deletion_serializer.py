@@ -0,0 +1,10 @@
+from rest_framework import serializers
+from app.models.event_deletion import EventDeletion
+
+
+class EventDeletionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EventDeletion
+        fields = ['id', 'event_id', 'title', 'requested_by', 'status', 'progress', 'attempts', 'last_error',
+                  'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
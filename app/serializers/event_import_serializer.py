@@ -0,0 +1,17 @@
+from decimal import Decimal
+
+from rest_framework import serializers
+
+
+class EventImportRowSerializer(serializers.Serializer):
+    """One row of a bulk event import; artists are names, created when unknown"""
+    title = serializers.CharField(max_length=200)
+    type = serializers.CharField(max_length=200, required=False, default='CONCERT')
+    date = serializers.DateTimeField()
+    start_hour = serializers.TimeField(required=False, allow_null=True, default=None)
+    end_hour = serializers.TimeField(required=False, allow_null=True, default=None)
+    place = serializers.CharField(max_length=200, required=False, allow_null=True, allow_blank=True, default=None)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0'))
+    seats_no = serializers.IntegerField(required=False, allow_null=True, min_value=0, default=None)
+    description = serializers.CharField(required=False, allow_null=True, allow_blank=True, default=None)
+    artists = serializers.ListField(child=serializers.CharField(max_length=100), required=False, default=list)
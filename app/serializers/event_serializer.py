@@ -1,16 +1,28 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from app.models import Event
+from app.models import Event, EventRatingSummary
 from app.serializers.artist_serializer import ArtistSerializer
 
 
 class EventSerializer(serializers.ModelSerializer):
     created_by = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
     artists = ArtistSerializer(many=True, read_only=True)
+    rating = serializers.SerializerMethodField()
 
     class Meta:
         model = Event
         fields = ['id', 'title', 'type', 'date', 'start_hour', 'end_hour',
                   'place', 'price', 'seats_no', 'description', 'created_by',
-                  'created_at', 'artists']
-        read_only_fields = ['created_at']
\ No newline at end of file
+                  'created_at', 'artists', 'rating', 'version']
+        read_only_fields = ['created_at', 'version']
+
+    def get_rating(self, event):
+        try:
+            summary = event.rating_summary
+        except EventRatingSummary.DoesNotExist:
+            summary = EventRatingSummary()
+        return {
+            'count': summary.review_count,
+            'average': summary.average_rating,
+            'histogram': summary.histogram,
+        }
\ No newline at end of file
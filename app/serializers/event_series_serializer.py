@@ -0,0 +1,30 @@
+from rest_framework import serializers
+from app.models.artist import Artist
+from app.models.event_series import EventSeries
+from app.services.event_series_service import RULE_FIELDS, EventSeriesService
+
+
+class EventSeriesSerializer(serializers.ModelSerializer):
+    artists = serializers.PrimaryKeyRelatedField(queryset=Artist.objects.all(), many=True, required=False)
+    occurrences = serializers.SerializerMethodField()
+
+    class Meta:
+        model = EventSeries
+        fields = ['id', 'title', 'type', 'start_hour', 'end_hour', 'place', 'price', 'seats_no', 'description',
+                  'rules', 'artists', 'first_date', 'frequency', 'interval', 'weekdays', 'count', 'until',
+                  'created_by', 'created_at', 'occurrences']
+        read_only_fields = ['created_by', 'created_at']
+
+    def get_occurrences(self, series):
+        return [{'id': event.id, 'date': event.date} for event in series.occurrences.all()]
+
+    def validate(self, attrs):
+        if self.instance is not None:
+            if any(field in attrs for field in RULE_FIELDS):
+                raise serializers.ValidationError("The recurrence rule of an existing series cannot change")
+            return attrs
+        try:
+            EventSeriesService.dates(**{field: attrs[field] for field in RULE_FIELDS if field in attrs})
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return attrs
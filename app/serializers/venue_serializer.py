@@ -0,0 +1,20 @@
+from rest_framework import serializers
+from app.models.venue import Venue, normalize_venue_name
+
+
+class VenueSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Venue
+        fields = ['id', 'name', 'normalized_name', 'latitude', 'longitude', 'geohash']
+        read_only_fields = ['normalized_name', 'geohash']
+
+    def validate_name(self, value):
+        normalized = normalize_venue_name(value)
+        if not normalized:
+            raise serializers.ValidationError("Venue name must contain letters or digits")
+        others = Venue.objects.filter(normalized_name=normalized)
+        if self.instance is not None:
+            others = others.exclude(id=self.instance.id)
+        if others.exists():
+            raise serializers.ValidationError("A venue with this name already exists")
+        return value
@@ -30,8 +30,8 @@ class ArtistService:
             bio=bio
         )
 
-    def update_artist(self, artist_id, name=None, genre=None, bio=None):
-        """Update an existing artist"""
+    def update_artist(self, artist_id, name=None, genre=None, bio=None, version=None):
+        """Update an existing artist, only if still at version when given (ConcurrentUpdateError otherwise)"""
         artist = self.artist_repository.get_by_id(artist_id)
         if not artist:
             return None
@@ -44,7 +44,7 @@ class ArtistService:
         if bio is not None:
             update_data['bio'] = bio
 
-        return self.artist_repository.update(artist, **update_data)
+        return self.artist_repository.update(artist, expected_version=version, **update_data)
 
     def delete_artist(self, artist_id):
         """Delete an artist by ID"""
@@ -0,0 +1,126 @@
+import hashlib
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Q
+
+from app.models.event import Event
+
+FEED_SALT = 'calendar-feed'
+# rendered VEVENT blocks, keyed by event id and last change so edits never serve stale entries
+VEVENT_CACHE_SECONDS = 7 * 24 * 3600
+MAX_CALENDAR_DAYS = 92
+
+
+class CalendarService:
+    @staticmethod
+    def days(start, end):
+        """Compact per-day entries of events dated start..end (inclusive dates), one range query on date"""
+        if (end - start).days >= MAX_CALENDAR_DAYS:
+            raise ValueError(f'At most {MAX_CALENDAR_DAYS} days per request')
+        start_at = datetime.combine(start, time.min, tzinfo=dt_timezone.utc)
+        end_at = datetime.combine(end + timedelta(days=1), time.min, tzinfo=dt_timezone.utc)
+
+        days = {}
+        events = (Event.objects.filter(date__gte=start_at, date__lt=end_at).order_by('date', 'id')
+                  .values('id', 'title', 'type', 'date', 'start_hour', 'end_hour', 'place'))
+        for event in events:
+            day = event.pop('date').astimezone(dt_timezone.utc).date().isoformat()
+            days.setdefault(day, []).append(event)
+        return [{'date': day, 'events': entries} for day, entries in days.items()]
+
+    @staticmethod
+    def feed_token(user_id):
+        """Token embedded in a user's feed URL, calendar apps cannot send our JWT"""
+        return signing.dumps(user_id, salt=FEED_SALT)
+
+    @staticmethod
+    def user_for_token(token):
+        try:
+            return signing.loads(token, salt=FEED_SALT)
+        except signing.BadSignature:
+            return None
+
+    @staticmethod
+    def feed_versions(user_id):
+        """[(event_id, updated_at)] of the events a user favorited or bought, and the feed's ETag"""
+        versions = list(
+            Event.objects.filter(
+                Q(usereventfavorite__user_id=user_id, usereventfavorite__is_favorite=True)
+                | Q(ticket__user_id=user_id)
+                | Q(products__orderproduct__order__user_id=user_id)
+            ).values_list('id', 'updated_at').distinct().order_by('date', 'id')
+        )
+        digest = hashlib.sha1(
+            ';'.join(f'{event_id}:{updated_at.timestamp()}' for event_id, updated_at in versions).encode()
+        ).hexdigest()
+        return versions, f'"{digest}"'
+
+    @classmethod
+    def feed(cls, versions):
+        """iCalendar document of the given event versions, only events changed since last time are rendered"""
+        keys = {f'ics:{event_id}:{updated_at.timestamp()}': event_id for event_id, updated_at in versions}
+        blocks = cache.get_many(list(keys))
+
+        missing = [event_id for key, event_id in keys.items() if key not in blocks]
+        if missing:
+            rendered = {}
+            for event in Event.objects.filter(id__in=missing):
+                rendered[f'ics:{event.id}:{event.updated_at.timestamp()}'] = cls.render_event(event)
+            cache.set_many(rendered, VEVENT_CACHE_SECONDS)
+            blocks.update(rendered)
+
+        lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//TSA//Events//EN', 'CALSCALE:GREGORIAN']
+        body = '\r\n'.join(lines) + '\r\n'
+        body += ''.join(blocks[key] for key in keys if key in blocks)
+        return body + 'END:VCALENDAR\r\n'
+
+    @staticmethod
+    def render_event(event):
+        start = event.date.astimezone(dt_timezone.utc)
+        if event.start_hour:
+            start = datetime.combine(start.date(), event.start_hour, tzinfo=dt_timezone.utc)
+        lines = [
+            'BEGIN:VEVENT',
+            f'UID:event-{event.id}@tsa',
+            f'DTSTAMP:{_stamp(event.updated_at)}',
+            f'DTSTART:{_stamp(start)}',
+        ]
+        if event.end_hour:
+            end = datetime.combine(start.date(), event.end_hour, tzinfo=dt_timezone.utc)
+            if end <= start:
+                end += timedelta(days=1)
+            lines.append(f'DTEND:{_stamp(end)}')
+        lines.append(f'SUMMARY:{_escape(event.title)}')
+        if event.place:
+            lines.append(f'LOCATION:{_escape(event.place)}')
+        if event.description:
+            lines.append(f'DESCRIPTION:{_escape(event.description)}')
+        lines.append('END:VEVENT')
+        return ''.join(_fold(line) + '\r\n' for line in lines)
+
+
+def _stamp(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _escape(text):
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line):
+    """Split lines longer than 75 octets, continuation lines start with a space (RFC 5545 3.1)"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts, current = [], b''
+    for char in line:
+        piece = char.encode()
+        if len(current) + len(piece) > (75 if not parts else 74):
+            parts.append(current.decode())
+            current = b''
+        current += piece
+    parts.append(current.decode())
+    return '\r\n '.join(parts)
@@ -0,0 +1,93 @@
+import datetime
+
+from django.db import transaction
+from django.db.models import DateTimeField, DecimalField, ExpressionWrapper, F, Q, Value
+from django.db.models.functions import Greatest, Round
+from django.utils import timezone
+
+from app.models.event import Event
+from app.models.event_type import EventType
+from app.models.venue import Venue
+from app.repositories.event_repository import EventRepository
+from app.signals import notify_events_changed
+
+NOTIFY_BATCH_SIZE = 500
+
+
+class EventBulkUpdateService:
+    """
+    Admin changes to many events at once, applied with a single UPDATE ... WHERE instead of loading and
+    saving every row. Relative changes (price moves, date shifts) are F() expressions evaluated by the database.
+    """
+
+    @staticmethod
+    def build_filter(ids=None, types=None, place=None, series=None, title_contains=None, start_date=None,
+                     end_date=None):
+        filters = Q()
+        if ids is not None:
+            filters &= Q(id__in=ids)
+        if types:
+            filters &= Q(event_type_id__in=EventType.ids_matching(types))
+        if place:
+            filters &= Q(place__iexact=place.strip())
+        if series is not None:
+            filters &= Q(series_id=series)
+        if title_contains:
+            filters &= Q(title__icontains=title_contains)
+        if start_date:
+            filters &= Q(date__gte=start_date)
+        if end_date:
+            filters &= Q(date__lte=end_date)
+        return filters
+
+    @staticmethod
+    def build_values(changes):
+        """UPDATE values for a dict of requested changes"""
+        money = DecimalField(max_digits=10, decimal_places=2)
+        values = {}
+        if changes.get('price') is not None:
+            values['price'] = changes['price']
+        elif changes.get('price_change') is not None:
+            values['price'] = Greatest(F('price') + Value(changes['price_change'], output_field=money),
+                                       Value(0, output_field=money), output_field=money)
+        elif changes.get('price_percent') is not None:
+            factor = 1 + changes['price_percent'] / 100
+            values['price'] = Round(F('price') * Value(factor, output_field=money), 2, output_field=money)
+
+        if changes.get('shift_days') or changes.get('shift_minutes'):
+            delta = datetime.timedelta(days=changes.get('shift_days') or 0, minutes=changes.get('shift_minutes') or 0)
+            values['date'] = ExpressionWrapper(F('date') + delta, output_field=DateTimeField())
+
+        if changes.get('type') is not None:
+            event_type = EventType.resolve(changes['type'])
+            values['type'] = event_type.code if event_type else changes['type']
+            values['event_type'] = event_type
+        if changes.get('place') is not None:
+            values['place'] = changes['place']
+            values['venue'] = Venue.resolve(changes['place']) if changes['place'].strip() else None
+        if 'seats_no' in changes:
+            values['seats_no'] = changes['seats_no']
+        return values
+
+    @classmethod
+    def update(cls, filters, changes):
+        """
+        Apply changes (see build_values) to the events matching filters (see build_filter).
+        Returns {'matched': ..., 'updated': ...}.
+        """
+        where = cls.build_filter(**filters)
+        with transaction.atomic():
+            event_ids = list(Event.objects.filter(where).select_for_update().values_list('id', flat=True))
+            # only now: a type or place change may create its EventType / Venue row
+            values = cls.build_values(changes) if event_ids else {}
+            if not values:
+                return {'matched': len(event_ids), 'updated': 0}
+            values['updated_at'] = timezone.now()
+            values['version'] = F('version') + 1
+            # the locked rows, not the filter again: a shifted date or new type may no longer match it
+            updated = EventRepository().update_where(Q(id__in=event_ids), **values)
+
+        # queryset.update sends no model signals
+        for start in range(0, len(event_ids), NOTIFY_BATCH_SIZE):
+            notify_events_changed(event_ids[start:start + NOTIFY_BATCH_SIZE])
+        return {'matched': len(event_ids), 'updated': updated}
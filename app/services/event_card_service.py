@@ -0,0 +1,159 @@
+from collections import defaultdict
+
+from django.db.models import Count, Min, Sum
+from django.utils import timezone
+
+from app.models.event import Event
+from app.models.event_card import EventCard
+from app.models.event_details import EventDetails
+from app.models.event_photo import EventPhoto
+from app.models.event_rating_summary import EventRatingSummary
+from app.models.event_type import EventType
+from app.models.orders import Product, Review
+from app.models.ticket import Ticket
+from app.models.user_event_favorite import UserEventFavorite
+
+CARD_FIELDS = [
+    'title', 'type', 'event_type', 'date', 'start_hour', 'end_hour', 'place', 'venue', 'price', 'min_price',
+    'artist_names', 'seats_no', 'tickets_sold', 'seats_left', 'average_rating', 'review_count',
+    'favorite_count', 'cover_photo',
+]
+
+
+class EventCardService:
+    """
+    Keeps the EventCard read model in step with the tables it summarizes.
+
+    Event edits rebuild whole cards; activity (tickets, orders, reviews, favorites, photos, products) only
+    recomputes the fields it affects. Both cost a fixed number of grouped queries however many events they cover.
+    """
+
+    @staticmethod
+    def cards(start_date=None, end_date=None, event_type=None):
+        """Cards ordered by date, read with one query"""
+        cards = EventCard.objects.all()
+        if start_date:
+            cards = cards.filter(date__gte=start_date)
+        if end_date:
+            cards = cards.filter(date__lte=end_date)
+        if event_type:
+            cards = cards.filter(event_type_id__in=EventType.ids_matching([event_type]))
+        return cards.order_by('date', 'event_id')
+
+    @classmethod
+    def refresh(cls, event_ids=None):
+        """Rebuild the cards of the given events (all events when None)"""
+        events = Event.objects.all()
+        if event_ids is not None:
+            event_ids = set(event_ids)
+            if not event_ids:
+                return
+            events = events.filter(id__in=event_ids)
+
+        events = list(events.only('id', 'title', 'type', 'event_type', 'date', 'start_hour', 'end_hour', 'place',
+                                  'price', 'seats_no'))
+        ids = [event.id for event in events]
+        if event_ids is not None:
+            EventCard.objects.filter(event_id__in=event_ids - set(ids)).delete()
+        if not ids:
+            return
+
+        artist_names = defaultdict(list)
+        for event_id, name in (Event.artists.through.objects.filter(event_id__in=ids)
+                               .order_by('artist__name').values_list('event_id', 'artist__name')):
+            artist_names[event_id].append(name)
+
+        venues = dict(EventDetails.objects.filter(event_id__in=ids, venue__isnull=False).exclude(venue='')
+                      .order_by('id').values_list('event_id', 'venue'))
+
+        cards = []
+        for event in events:
+            card = EventCard(
+                event_id=event.id,
+                title=event.title,
+                type=event.type,
+                event_type_id=event.event_type_id,
+                date=event.date,
+                start_hour=event.start_hour,
+                end_hour=event.end_hour,
+                place=event.place,
+                venue=venues.get(event.id) or event.place,
+                price=event.price,
+                artist_names=artist_names[event.id],
+                seats_no=event.seats_no,
+            )
+            cards.append(card)
+
+        for kind in ('tickets', 'products', 'favorites', 'reviews', 'photos'):
+            cls._apply(kind, cards)
+
+        EventCard.objects.bulk_create(
+            cards, batch_size=500,
+            update_conflicts=True, unique_fields=['event'], update_fields=CARD_FIELDS + ['updated_at'],
+        )
+
+    @classmethod
+    def refresh_activity(cls, event_ids, kind):
+        """Recompute only the card fields that depend on one kind of activity"""
+        cards = list(EventCard.objects.filter(event_id__in=set(event_ids)))
+        missing = set(event_ids) - {card.event_id for card in cards}
+        if missing:
+            cls.refresh(missing)
+        if not cards:
+            return
+
+        cls._apply(kind, cards)
+        now = timezone.now()
+        for card in cards:
+            card.updated_at = now
+        EventCard.objects.bulk_update(cards, ACTIVITY_FIELDS[kind] + ['updated_at'], batch_size=500)
+
+    @staticmethod
+    def _apply(kind, cards):
+        ids = [card.event_id for card in cards]
+
+        if kind == 'tickets':
+            sold = dict(Ticket.objects.filter(event_id__in=ids).values('event_id')
+                        .annotate(sold=Sum('quantity')).values_list('event_id', 'sold'))
+            for card in cards:
+                card.tickets_sold = sold.get(card.event_id) or 0
+                card.seats_left = max(card.seats_no - card.tickets_sold, 0) if card.seats_no is not None else None
+
+        elif kind == 'products':
+            min_prices = dict(Product.objects.filter(event_id__in=ids).values('event_id')
+                              .annotate(min_price=Min('price')).values_list('event_id', 'min_price'))
+            for card in cards:
+                card.min_price = min_prices.get(card.event_id, card.price)
+
+        elif kind == 'favorites':
+            favorites = dict(UserEventFavorite.objects.filter(event_id__in=ids, is_favorite=True).values('event_id')
+                             .annotate(count=Count('id')).values_list('event_id', 'count'))
+            for card in cards:
+                card.favorite_count = favorites.get(card.event_id, 0)
+
+        elif kind in ('orders', 'reviews'):
+            # copied from the summaries RatingSummaryService maintains, not joined from the reviews again
+            summaries = {summary.event_id: summary for summary in
+                         EventRatingSummary.objects.filter(event_id__in=ids).only('event_id', 'review_count',
+                                                                                  'stars_sum')}
+            for card in cards:
+                summary = summaries.get(card.event_id)
+                card.average_rating = summary.average_rating if summary else None
+                card.review_count = summary.review_count if summary else 0
+
+        elif kind == 'photos':
+            covers = dict(EventPhoto.objects.filter(event_id__in=ids).order_by('uploaded_at', 'id')
+                          .values_list('event_id', 'image'))
+            for card in cards:
+                card.cover_photo = covers.get(card.event_id, '')
+
+
+# card fields recomputed for each kind of activity, see app.signals.notify_event_activity
+ACTIVITY_FIELDS = {
+    'tickets': ['tickets_sold', 'seats_left'],
+    'products': ['min_price'],
+    'favorites': ['favorite_count'],
+    'orders': ['average_rating', 'review_count'],
+    'reviews': ['average_rating', 'review_count'],
+    'photos': ['cover_photo'],
+}
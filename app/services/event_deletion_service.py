@@ -0,0 +1,140 @@
+import datetime
+import logging
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from app.models.event import Event
+from app.models.event_attachment import EventAttachment
+from app.models.event_deletion import EventDeletion
+from app.models.event_details import EventDetails
+from app.models.event_photo import EventPhoto
+from app.models.event_recommendation import EventRecommendation
+from app.models.orders import OrderProduct, Product
+from app.models.similar_event import SimilarEvent
+from app.models.ticket import Ticket
+from app.models.user_event_favorite import UserEventFavorite
+from app.signals import notify_events_changed, purging_events
+
+logger = logging.getLogger(__name__)
+
+# (progress key, model, filter of the rows of an event, file fields), children before their parents
+STEPS = [
+    ('attachments', EventAttachment, lambda event_id: Q(event_details__event_id=event_id), ['file']),
+    ('details', EventDetails, lambda event_id: Q(event_id=event_id), ['rules_pdf']),
+    ('photos', EventPhoto, lambda event_id: Q(event_id=event_id), ['image']),
+    ('order_products', OrderProduct, lambda event_id: Q(product__event_id=event_id), []),
+    ('products', Product, lambda event_id: Q(event_id=event_id), []),
+    ('tickets', Ticket, lambda event_id: Q(event_id=event_id), []),
+    ('favorites', UserEventFavorite, lambda event_id: Q(event_id=event_id), []),
+    ('similar_events', SimilarEvent, lambda event_id: Q(event_id=event_id) | Q(similar_id=event_id), []),
+    ('recommendations', EventRecommendation, lambda event_id: Q(event_id=event_id), []),
+]
+
+
+class EventDeletionService:
+    """
+    Deleting an event soft-deletes it at once and leaves the rest to a background job, which removes its
+    dependents in bounded chunks (one short transaction each), then their files, then the event row.
+    """
+    MAX_ATTEMPTS = 3
+    CLAIM_TIMEOUT = datetime.timedelta(minutes=15)
+
+    @staticmethod
+    def schedule(event, requested_by=None):
+        """Hide the event from every listing and queue its removal"""
+        now = timezone.now()
+        with transaction.atomic():
+            Event.objects.filter(id=event.id).update(deleted_at=now, updated_at=now)
+            deletion = EventDeletion.objects.create(event_id=event.id, title=event.title, requested_by=requested_by)
+        # drops its card, search and typeahead entries and every cached payload
+        notify_events_changed([event.id])
+        return deletion
+
+    @classmethod
+    def run_pending(cls, limit=10, chunk_size=None):
+        """Run queued deletions, oldest first, and take over those whose worker stopped"""
+        stats = {'done': 0, 'failed': 0, 'remaining': 0}
+        for deletion in cls._claim(limit):
+            cls.run(deletion, chunk_size)
+            if deletion.status in stats:
+                stats[deletion.status] += 1
+        stats['remaining'] = EventDeletion.objects.filter(status='pending').count()
+        return stats
+
+    @classmethod
+    def _claim(cls, limit):
+        """
+        Switch up to limit jobs to 'running' so that concurrent workers never pick the same ones. A 'running'
+        job without progress for CLAIM_TIMEOUT lost its worker and is claimed again, or failed when out of attempts.
+        """
+        now = timezone.now()
+        claimable = Q(status='pending') | Q(status='running', claimed_at__lt=now - cls.CLAIM_TIMEOUT)
+        with transaction.atomic():
+            jobs = list(EventDeletion.objects.filter(claimable).order_by('created_at')
+                        .select_for_update(skip_locked=True).values_list('id', 'attempts')[:limit])
+            exhausted = [job_id for job_id, attempts in jobs if attempts >= cls.MAX_ATTEMPTS]
+            EventDeletion.objects.filter(id__in=exhausted).update(status='failed', last_error='Worker stopped')
+            ids = [job_id for job_id, attempts in jobs if attempts < cls.MAX_ATTEMPTS]
+            EventDeletion.objects.filter(id__in=ids).update(status='running', claimed_at=now)
+        return list(EventDeletion.objects.filter(id__in=ids).order_by('created_at'))
+
+    @classmethod
+    def run(cls, deletion, chunk_size=None):
+        """Remove a soft-deleted event step by step, recording progress after every chunk"""
+        chunk_size = chunk_size or getattr(settings, 'EVENT_DELETION_CHUNK_SIZE', 1000)
+        deletion.status = 'running'
+        deletion.attempts += 1
+        deletion.claimed_at = timezone.now()
+        deletion.started_at = deletion.started_at or deletion.claimed_at
+        deletion.save(update_fields=['status', 'attempts', 'started_at', 'claimed_at'])
+
+        try:
+            with purging_events():
+                for name, model, rows_of, file_fields in STEPS:
+                    cls._purge(deletion, name, model.objects.filter(rows_of(deletion.event_id)), file_fields,
+                               chunk_size)
+                # what is left is a handful of one-row tables (card, popularity, rating summary)
+                Event.all_objects.filter(id=deletion.event_id).delete()
+        except Exception as e:
+            logger.warning("Deletion of event %s failed: %s", deletion.event_id, e, exc_info=True)
+            deletion.last_error = str(e)
+            deletion.status = 'failed' if deletion.attempts >= cls.MAX_ATTEMPTS else 'pending'
+            deletion.save(update_fields=['status', 'last_error', 'progress'])
+            return deletion
+
+        deletion.status = 'done'
+        deletion.finished_at = timezone.now()
+        deletion.save(update_fields=['status', 'finished_at', 'progress'])
+        return deletion
+
+    @classmethod
+    def _purge(cls, deletion, name, queryset, file_fields, chunk_size):
+        step = deletion.progress.setdefault(name, {'total': 0, 'deleted': 0})
+        step['total'] = step['deleted'] + queryset.count()
+        while True:
+            with transaction.atomic():
+                rows = list(queryset.order_by('pk').values_list('pk', *file_fields)[:chunk_size])
+                if not rows:
+                    break
+                queryset.model.objects.filter(pk__in=[row[0] for row in rows]).delete()
+            # only once the rows are gone for good
+            cls._delete_files([path for row in rows for path in row[1:] if path], deletion.progress)
+            step['deleted'] += len(rows)
+            # doubles as the heartbeat that keeps other workers off this job
+            deletion.claimed_at = timezone.now()
+            deletion.save(update_fields=['progress', 'claimed_at'])
+
+    @staticmethod
+    def _delete_files(paths, progress):
+        files = progress.setdefault('files', {'deleted': 0, 'failed': 0})
+        for path in paths:
+            try:
+                default_storage.delete(path)
+                files['deleted'] += 1
+            except Exception as e:
+                logger.warning("Could not delete file %s: %s", path, e)
+                files['failed'] += 1
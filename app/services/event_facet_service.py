@@ -0,0 +1,166 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case, CharField, Count, F, Value, When
+from django.db.models.functions import Cast, Substr
+
+from app.models.artist import Artist
+from app.models.event import Event
+from app.models.event_type import EventType, normalize_type_name
+from app.services.event_search_service import EventSearchService, tokenize
+from app.utils import cache_generations
+
+FACETS = ('type', 'place', 'month', 'price', 'genre')
+
+# (label, lower bound inclusive, upper bound exclusive)
+PRICE_BUCKETS = [
+    ('0-50', None, 50),
+    ('50-100', 50, 100),
+    ('100-200', 100, 200),
+    ('200+', 200, None),
+]
+
+CACHE_NAMESPACE = 'event_facets'
+
+
+class EventFacetService:
+    """
+    Counts of events per type, place, month, price bucket and artist genre over a filtered catalog.
+    PostgreSQL computes every facet in one pass with GROUPING SETS, other databases with one UNION ALL query.
+    Results are cached by the normalized filters until an event changes.
+    """
+
+    @staticmethod
+    def normalize_filters(query=None, start_date=None, end_date=None, types=None, place=None):
+        return {
+            'query': ' '.join(tokenize(query or '')),
+            'start_date': start_date or None,
+            'end_date': end_date or None,
+            'types': sorted({normalize_type_name(event_type) for event_type in types or []} - {''}),
+            'place': (place or '').strip() or None,
+        }
+
+    @classmethod
+    def facets(cls, **filters):
+        """{facet: [{'value': ..., 'count': ...}]} for the filtered events"""
+        filters = cls.normalize_filters(**filters)
+        digest = hashlib.sha1(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+        key = f'{CACHE_NAMESPACE}:{cache_generations.generation(CACHE_NAMESPACE)}:{digest}'
+
+        result = cache.get(key)
+        if result is None:
+            result = cls._compute(cls._filtered(filters))
+            cache.set(key, result, getattr(settings, 'EVENT_FACETS_CACHE_SECONDS', 300))
+        return result
+
+    @staticmethod
+    def invalidate():
+        """Drop every cached facet result"""
+        cache_generations.bump(CACHE_NAMESPACE)
+
+    @staticmethod
+    def _filtered(filters):
+        events = Event.objects.all()
+        if filters['start_date']:
+            events = events.filter(date__gte=filters['start_date'])
+        if filters['end_date']:
+            events = events.filter(date__lte=filters['end_date'])
+        if filters['types']:
+            events = events.filter(event_type_id__in=EventType.ids_matching(filters['types']))
+        if filters['place']:
+            events = events.filter(place=filters['place'])
+        if filters['query']:
+            events = Event.objects.filter(id__in=EventSearchService.search(events, filters['query']).values('id'))
+        return events
+
+    @classmethod
+    def _compute(cls, events):
+        result = {facet: [] for facet in FACETS}
+        rows = cls._grouping_sets(events) if connection.vendor == 'postgresql' else cls._union(events)
+        for facet, value, count in rows:
+            if value is not None and value != '':
+                result[facet].append({'value': value, 'count': count})
+
+        bucket_order = {label: i for i, (label, low, high) in enumerate(PRICE_BUCKETS)}
+        for facet, values in result.items():
+            if facet == 'price':
+                values.sort(key=lambda item: bucket_order[item['value']])
+            elif facet == 'month':
+                values.sort(key=lambda item: item['value'])
+            else:
+                values.sort(key=lambda item: (-item['count'], item['value']))
+        return result
+
+    @staticmethod
+    def _price_bucket():
+        whens = []
+        for label, low, high in PRICE_BUCKETS:
+            bounds = {}
+            if low is not None:
+                bounds['price__gte'] = low
+            if high is not None:
+                bounds['price__lt'] = high
+            whens.append(When(then=Value(label), **bounds))
+        return Case(*whens, output_field=CharField())
+
+    @classmethod
+    def _union(cls, events):
+        events = events.order_by()
+        values = {
+            'type': F('type'),
+            'place': F('place'),
+            'month': Substr(Cast('date', CharField()), 1, 7),
+            'price': cls._price_bucket(),
+            'genre': F('artists__genre'),
+        }
+        branches = [
+            events.annotate(facet=Value(facet, output_field=CharField()),
+                            value=Cast(expression, CharField()))
+            .values('facet', 'value').annotate(count=Count('id', distinct=True)).values_list('facet', 'value', 'count')
+            for facet, expression in values.items()
+        ]
+        return list(branches[0].union(*branches[1:], all=True))
+
+    @staticmethod
+    def _grouping_sets(events):
+        subquery, params = events.order_by().values('id').query.sql_with_params()
+        bucket_sql = ' '.join(
+            'WHEN ' + ' AND '.join(
+                condition for condition in (
+                    'e.price >= %s' if low is not None else None,
+                    'e.price < %s' if high is not None else None,
+                ) if condition
+            ) + ' THEN %s'
+            for label, low, high in PRICE_BUCKETS
+        )
+        bucket_params = []
+        for label, low, high in PRICE_BUCKETS:
+            bucket_params += [bound for bound in (low, high) if bound is not None] + [label]
+
+        sql = f"""
+            SELECT type, place, month, price, genre,
+                   GROUPING(type), GROUPING(place), GROUPING(month), GROUPING(price), GROUPING(genre),
+                   COUNT(DISTINCT id)
+            FROM (
+                SELECT e.id, e.type, e.place, to_char(e.date AT TIME ZONE 'UTC', 'YYYY-MM') AS month,
+                       CASE {bucket_sql} END AS price, a.genre
+                FROM {Event._meta.db_table} e
+                LEFT JOIN {Event.artists.through._meta.db_table} ea ON ea.event_id = e.id
+                LEFT JOIN {Artist._meta.db_table} a ON a.id = ea.artist_id
+                WHERE e.id IN ({subquery})
+            ) facts
+            GROUP BY GROUPING SETS ((type), (place), (month), (price), (genre))
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, bucket_params + list(params))
+            rows = cursor.fetchall()
+
+        result = []
+        for row in rows:
+            values, grouping, count = row[:5], row[5:10], row[10]
+            facet = grouping.index(0)
+            result.append((FACETS[facet], values[facet], count))
+        return result
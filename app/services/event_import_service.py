@@ -0,0 +1,159 @@
+import csv
+import json
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from app.models.artist import Artist
+from app.models.event import Event
+from app.models.event_type import EventType
+from app.models.venue import Venue
+from app.serializers.event_import_serializer import EventImportRowSerializer
+from app.services.typeahead_service import TypeaheadService
+from app.signals import notify_events_changed
+
+# CSV cells holding several artist names separate them with this
+ARTIST_SEPARATOR = '|'
+MAX_REPORTED_ERRORS = 100
+
+
+class EventImportService:
+    """
+    Streaming bulk import of events from CSV or JSON Lines.
+
+    Rows are validated one by one and written in chunks: artists are upserted by name, events and their
+    artist links go in with bulk_create, each chunk in its own transaction. A failing row is reported and
+    skipped; a chunk the database rejects is rolled back and reported as a whole.
+    """
+
+    @staticmethod
+    def read_rows(lines, format):
+        """(line number, raw row dict) pairs from an iterable of text lines in 'csv' or 'jsonl' format"""
+        if format == 'csv':
+            reader = csv.DictReader(lines)
+            for row in reader:
+                row = {key: value for key, value in row.items() if key and value not in ('', None)}
+                if 'artists' in row:
+                    row['artists'] = [name for name in row['artists'].split(ARTIST_SEPARATOR) if name.strip()]
+                yield reader.line_num, row
+        elif format == 'jsonl':
+            for line_no, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError as e:
+                    yield line_no, e
+        else:
+            raise ValueError(f"Unknown import format '{format}', expected 'csv' or 'jsonl'")
+
+    @classmethod
+    def import_rows(cls, rows, created_by, chunk_size=None):
+        """
+        Import (line number, raw row) pairs as events created by created_by.
+        Returns a report: rows read, events and artists created, errors (first 100) and rows per second.
+        """
+        chunk_size = chunk_size or getattr(settings, 'EVENT_IMPORT_CHUNK_SIZE', 500)
+        started = time.monotonic()
+        report = {'rows': 0, 'created': 0, 'artists_created': 0, 'failed': 0, 'errors': []}
+        resolved = {'types': {}, 'venues': {}}
+
+        chunk = []
+        for line_no, raw in rows:
+            report['rows'] += 1
+            data, error = cls._validate(raw)
+            if error is not None:
+                cls._error(report, line_no, error)
+                continue
+            chunk.append((line_no, data))
+            if len(chunk) >= chunk_size:
+                cls._write_chunk(chunk, created_by, resolved, report)
+                chunk = []
+        if chunk:
+            cls._write_chunk(chunk, created_by, resolved, report)
+
+        report['seconds'] = round(time.monotonic() - started, 3)
+        report['rows_per_second'] = round(report['rows'] / report['seconds'], 1) if report['seconds'] else None
+        return report
+
+    @staticmethod
+    def _validate(raw):
+        if isinstance(raw, Exception):
+            return None, f"Invalid JSON: {raw}"
+        if not isinstance(raw, dict):
+            return None, "Row must be an object"
+        serializer = EventImportRowSerializer(data=raw)
+        if not serializer.is_valid():
+            return None, {field: [str(message) for message in messages]
+                          for field, messages in serializer.errors.items()}
+        return serializer.validated_data, None
+
+    @staticmethod
+    def _error(report, line, error):
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'line': line, 'error': error})
+
+    @classmethod
+    def _write_chunk(cls, chunk, created_by, resolved, report):
+        try:
+            with transaction.atomic():
+                artist_ids, new_artist_ids = cls._upsert_artists(
+                    {name.strip() for _, data in chunk for name in data['artists']})
+                events = [cls._event(data, created_by, resolved) for _, data in chunk]
+                Event.objects.bulk_create(events, batch_size=500)
+
+                through = Event.artists.through
+                links = {(event.id, artist_ids[name.strip()])
+                         for event, (_, data) in zip(events, chunk) for name in data['artists']}
+                through.objects.bulk_create([through(event_id=event_id, artist_id=artist_id)
+                                             for event_id, artist_id in links], batch_size=1000)
+        except DatabaseError as e:
+            # types and venues resolved inside the rolled back transaction are gone
+            resolved['types'].clear()
+            resolved['venues'].clear()
+            for line_no, _ in chunk:
+                cls._error(report, line_no, f"Chunk rolled back: {e}")
+            return
+
+        report['created'] += len(events)
+        report['artists_created'] += len(new_artist_ids)
+        # bulk writes send no model signals
+        TypeaheadService.refresh_artists(new_artist_ids)
+        notify_events_changed([event.id for event in events])
+
+    @staticmethod
+    def _upsert_artists(names):
+        """{name: artist id} for the names, creating missing artists; also returns the ids created"""
+        artist_ids = {}
+        for artist_id, name in Artist.objects.filter(name__in=names).order_by('-id').values_list('id', 'name'):
+            artist_ids[name] = artist_id
+        created = Artist.objects.bulk_create([Artist(name=name) for name in sorted(names - artist_ids.keys())])
+        for artist in created:
+            artist_ids[artist.name] = artist.id
+        return artist_ids, [artist.id for artist in created]
+
+    @staticmethod
+    def _event(data, created_by, resolved):
+        type_name, place = data['type'], (data['place'] or '').strip()
+        if type_name not in resolved['types']:
+            resolved['types'][type_name] = EventType.resolve(type_name)
+        event_type = resolved['types'][type_name]
+        if place and place not in resolved['venues']:
+            resolved['venues'][place] = Venue.resolve(place)
+
+        return Event(
+            title=data['title'],
+            type=event_type.code if event_type else type_name,
+            event_type=event_type,
+            date=data['date'],
+            start_hour=data['start_hour'],
+            end_hour=data['end_hour'],
+            place=data['place'],
+            venue=resolved['venues'].get(place),
+            price=data['price'],
+            seats_no=data['seats_no'],
+            description=data['description'],
+            created_by=created_by,
+        )
@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.db.models import Prefetch, Sum
+
+from app.models.event import Event
+from app.models.event_attachment import EventAttachment
+from app.models.event_details import EventDetails
+from app.models.event_photo import EventPhoto
+from app.models.ticket import Ticket
+from app.models.user_event_favorite import UserEventFavorite
+from app.serializers.event_details_serializer import EventDetailsSerializer
+from app.serializers.event_serializer import EventSerializer
+from app.utils.media import media_url
+from app.utils.object_cache import get_object_cache
+
+
+class EventPageService:
+    """
+    Everything the event detail screen shows, assembled in one call.
+
+    The public part (event, details with attachments, photos, rating, availability) is the same for every
+    caller and cached per event and host until the event or its activity changes; only the caller's favorite
+    flag is read on every request.
+    """
+
+    @staticmethod
+    def invalidate(event_ids):
+        get_object_cache('event_page').invalidate(event_ids)
+
+    @classmethod
+    def page(cls, event_id, request):
+        """The page payload of an event, None when it does not exist"""
+        public = get_object_cache('event_page').get_or_build(
+            event_id, lambda: cls.public(event_id, request),
+            getattr(settings, 'EVENT_PAGE_CACHE_SECONDS', 300),
+            variant=f'{request.scheme}://{request.get_host()}',
+        )
+        if public is None:
+            return None
+
+        user = request.user
+        return {
+            **public,
+            'is_favorite': bool(user and user.is_authenticated and UserEventFavorite.objects.filter(
+                user_id=user.id, event_id=event_id, is_favorite=True).exists()),
+        }
+
+    @staticmethod
+    def public(event_id, request=None):
+        """The caller-independent part of the page, read with five queries"""
+        details = EventDetails.objects.order_by('id').prefetch_related(
+            Prefetch('attachments', queryset=EventAttachment.objects.order_by('uploaded_at', 'id')))
+        event = (Event.objects.filter(id=event_id).with_serializer_relations().select_related('card')
+                 .prefetch_related(Prefetch('details', queryset=details),
+                                   Prefetch('photos', queryset=EventPhoto.objects.order_by('-uploaded_at', '-id')))
+                 .first())
+        if event is None:
+            return None
+
+        event_details = next(iter(event.details.all()), None)
+        card = getattr(event, 'card', None)
+        if card is not None:
+            tickets_sold = card.tickets_sold
+        else:
+            tickets_sold = Ticket.objects.filter(event_id=event.id).aggregate(sold=Sum('quantity'))['sold'] or 0
+        seats_left = max(event.seats_no - tickets_sold, 0) if event.seats_no is not None else None
+
+        return {
+            'event': EventSerializer(event).data,
+            'details': (EventDetailsSerializer(event_details, context={'request': request}).data
+                        if event_details else None),
+            'photos': [
+                {
+                    'id': photo.id,
+                    'url': media_url(photo.image.name, request),
+                    'caption': photo.caption,
+                    'uploaded_at': photo.uploaded_at.isoformat() if photo.uploaded_at else None
+                }
+                for photo in event.photos.all()
+            ],
+            'availability': {
+                'seats_no': event.seats_no,
+                'tickets_sold': tickets_sold,
+                'seats_left': seats_left,
+                'sold_out': seats_left == 0,
+            },
+        }
@@ -0,0 +1,262 @@
+import bisect
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Case, F, IntegerField, When
+
+from app.models.event import Event
+
+SEARCH_CONFIG = 'tps_search'
+
+# ts_rank weights D, C, B, A are 0.1, 0.2, 0.4, 1.0 - the local index mirrors them
+FIELD_WEIGHTS = {
+    'title': 1.0,
+    'artists': 0.4,
+    'place': 0.2,
+    'description': 0.1,
+}
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+# letters NFKD does not decompose
+_FOLD = str.maketrans({'ł': 'l', 'Ł': 'L', 'đ': 'd', 'Đ': 'D', 'ø': 'o', 'Ø': 'O', 'ß': 'ss'})
+
+
+def fold(text):
+    """Lowercase and strip accents, the same way the unaccent dictionary does"""
+    text = unicodedata.normalize('NFKD', (text or '').translate(_FOLD))
+    return ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text):
+    return _TOKEN.findall(fold(text))
+
+
+class InvertedIndex:
+    """
+    In-process inverted index over event text, used when the database has no full-text search (SQLite).
+    Matches Postgres semantics: every word of a term must match as a prefix, results ranked by field weight.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(dict)
+        self._tokens_by_event = {}
+        self._sorted_tokens = []
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def add(self, event_id, fields):
+        with self._lock:
+            self._remove(event_id)
+            weights = defaultdict(float)
+            for field, text in fields.items():
+                for token in tokenize(text):
+                    weights[token] += FIELD_WEIGHTS[field]
+            for token, weight in weights.items():
+                self._postings[token][event_id] = weight
+            self._tokens_by_event[event_id] = set(weights)
+            self._dirty = True
+
+    def remove(self, event_id):
+        with self._lock:
+            self._remove(event_id)
+
+    def _remove(self, event_id):
+        for token in self._tokens_by_event.pop(event_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(event_id, None)
+                if not postings:
+                    del self._postings[token]
+                    self._dirty = True
+
+    def search(self, terms, match_any=False):
+        """
+        Rank events for a list of search terms.
+        A term matches when all of its words match; match_any ORs the terms, otherwise they are ANDed.
+        Returns [(event_id, score)] best first.
+        """
+        with self._lock:
+            if self._dirty:
+                self._sorted_tokens = sorted(self._postings)
+                self._dirty = False
+
+            combined = None
+            for term in terms:
+                scores = self._match_term(term)
+                if scores is None:
+                    continue
+                if combined is None:
+                    combined = scores
+                elif match_any:
+                    for event_id, score in scores.items():
+                        combined[event_id] = combined.get(event_id, 0) + score
+                else:
+                    combined = {event_id: score + scores[event_id]
+                                for event_id, score in combined.items() if event_id in scores}
+
+        return sorted((combined or {}).items(), key=lambda item: (-item[1], item[0]))
+
+    def _match_term(self, term):
+        words = tokenize(term)
+        if not words:
+            return None
+
+        result = None
+        for word in words:
+            scores = defaultdict(float)
+            start = bisect.bisect_left(self._sorted_tokens, word)
+            for token in self._sorted_tokens[start:]:
+                if not token.startswith(word):
+                    break
+                for event_id, weight in self._postings[token].items():
+                    scores[event_id] = max(scores[event_id], weight)
+            if result is None:
+                result = dict(scores)
+            else:
+                result = {event_id: score + scores[event_id] for event_id, score in result.items() if event_id in scores}
+        return result
+
+
+_local_index = InvertedIndex()
+_local_index_built = False
+_build_lock = threading.Lock()
+
+
+class EventSearchService:
+    """
+    Full-text event search over title, artist names, place and description.
+    PostgreSQL: a tsvector column with a GIN index, ranked with ts_rank, prefix matching and accent folding
+    through the 'tps_search' configuration. Other databases fall back to the in-process InvertedIndex.
+    """
+
+    @staticmethod
+    def uses_postgres():
+        return connection.vendor == 'postgresql'
+
+    @staticmethod
+    def search(queryset, terms, match_any=False):
+        """Filter an Event queryset to the search terms and order it by relevance"""
+        if isinstance(terms, str):
+            terms = [terms]
+        terms = [term for term in terms if tokenize(term)]
+        if not terms:
+            return queryset
+
+        if EventSearchService.uses_postgres():
+            search_query = SearchQuery(EventSearchService.build_tsquery(terms, match_any),
+                                       search_type='raw', config=SEARCH_CONFIG)
+            return queryset.filter(search_vector=search_query).annotate(
+                rank=SearchRank(F('search_vector'), search_query)
+            ).order_by('-rank', 'date')
+
+        ranked = EventSearchService._local_search(terms, match_any)
+        if not ranked:
+            return queryset.none()
+        ids = [event_id for event_id, score in ranked]
+        position = Case(*[When(id=event_id, then=i) for i, event_id in enumerate(ids)], output_field=IntegerField())
+        return queryset.filter(id__in=ids).annotate(rank_position=position).order_by('rank_position')
+
+    @staticmethod
+    def build_tsquery(terms, match_any=False):
+        """Turn search terms into a raw tsquery where every word is a prefix match"""
+        clauses = ['(' + ' & '.join(f'{word}:*' for word in tokenize(term)) + ')' for term in terms]
+        return (' | ' if match_any else ' & ').join(clauses)
+
+    @staticmethod
+    def refresh(event_ids=None):
+        """Recompute search data for the given events, or for all events when event_ids is None"""
+        if EventSearchService.uses_postgres():
+            EventSearchService._refresh_vectors(event_ids)
+        elif _local_index_built:
+            EventSearchService._index_locally(event_ids)
+
+    @staticmethod
+    def forget(event_id):
+        """Drop a deleted event from the local index"""
+        if not EventSearchService.uses_postgres():
+            _local_index.remove(event_id)
+
+    @staticmethod
+    def ensure_schema():
+        """Create the unaccent text search configuration and the GIN index (PostgreSQL only)"""
+        if not EventSearchService.uses_postgres():
+            return
+        table = Event._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+            cursor.execute("SELECT 1 FROM pg_ts_config WHERE cfgname = %s", [SEARCH_CONFIG])
+            if cursor.fetchone() is None:
+                cursor.execute(f"CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} (COPY = simple)")
+                cursor.execute(
+                    f"ALTER TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} "
+                    f"ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple"
+                )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_search_vector_gin ON {table} USING GIN (search_vector)"
+            )
+
+    @staticmethod
+    def _refresh_vectors(event_ids):
+        event_table = Event._meta.db_table
+        through_table = Event.artists.through._meta.db_table
+        artist_table = Event.artists.field.related_model._meta.db_table
+        where, params = '', []
+        if event_ids is not None:
+            if not event_ids:
+                return
+            where, params = 'WHERE ev.id = ANY(%s)', [list(event_ids)]
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                UPDATE {event_table} e SET search_vector =
+                    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(e.title, '')), 'A') ||
+                    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(a.names, '')), 'B') ||
+                    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(e.place, '')), 'C') ||
+                    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(e.description, '')), 'D')
+                FROM (
+                    SELECT ev.id, string_agg(ar.name, ' ') AS names
+                    FROM {event_table} ev
+                    LEFT JOIN {through_table} ea ON ea.event_id = ev.id
+                    LEFT JOIN {artist_table} ar ON ar.id = ea.artist_id
+                    {where}
+                    GROUP BY ev.id
+                ) a
+                WHERE e.id = a.id
+            """, params)
+
+    @staticmethod
+    def _local_search(terms, match_any):
+        global _local_index_built
+        if not _local_index_built:
+            with _build_lock:
+                if not _local_index_built:
+                    EventSearchService._index_locally(None)
+                    _local_index_built = True
+        return _local_index.search(terms, match_any)
+
+    @staticmethod
+    def _index_locally(event_ids):
+        events = Event.objects.all()
+        if event_ids is not None:
+            events = events.filter(id__in=event_ids)
+
+        artist_names = defaultdict(list)
+        links = Event.artists.through.objects.filter(event__in=events).values_list('event_id', 'artist__name')
+        for event_id, name in links:
+            artist_names[event_id].append(name)
+
+        found = set()
+        for event in events.values('id', 'title', 'place', 'description'):
+            found.add(event['id'])
+            _local_index.add(event['id'], {
+                'title': event['title'],
+                'artists': ' '.join(artist_names[event['id']]),
+                'place': event['place'],
+                'description': event['description'],
+            })
+        for event_id in set(event_ids or ()) - found:
+            _local_index.remove(event_id)
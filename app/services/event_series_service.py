@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from app.models.event import Event
+from app.models.event_details import EventDetails
+from app.models.event_series import EventSeries
+from app.models.event_type import EventType
+from app.models.orders import Product
+from app.models.venue import Venue
+from app.signals import notify_events_changed
+from app.utils import recurrence
+
+# series fields copied onto every occurrence
+SHARED_FIELDS = ['title', 'type', 'start_hour', 'end_hour', 'place', 'price', 'seats_no', 'description']
+RULE_FIELDS = ['first_date', 'frequency', 'interval', 'weekdays', 'count', 'until']
+
+
+class EventSeriesService:
+    """
+    Event series: occurrences, their artist links, ticket products and details are generated with one
+    bulk insert per table; edits reach all upcoming occurrences with one UPDATE per table.
+    """
+
+    @staticmethod
+    def dates(first_date, frequency, interval=1, weekdays=None, count=None, until=None):
+        """Occurrence dates of a rule, ValueError when it is invalid or too long"""
+        return recurrence.occurrences(first_date, frequency, interval, weekdays, count, until,
+                                      limit=getattr(settings, 'EVENT_SERIES_MAX_OCCURRENCES', 500))
+
+    @classmethod
+    def create_series(cls, created_by, artists=(), **fields):
+        """Create a series and all of its occurrences"""
+        dates = cls.dates(**{field: fields[field] for field in RULE_FIELDS if field in fields})
+        with transaction.atomic():
+            series = EventSeries.objects.create(created_by=created_by, **fields)
+            series.artists.set(artists)
+            events = cls._generate(series, dates)
+        notify_events_changed([event.id for event in events])
+        return series
+
+    @staticmethod
+    def _generate(series, dates):
+        event_type = EventType.resolve(series.type)
+        venue = Venue.resolve(series.place) if (series.place or '').strip() else None
+        events = Event.objects.bulk_create([
+            Event(
+                series=series,
+                title=series.title,
+                type=event_type.code if event_type else series.type,
+                event_type=event_type,
+                date=date,
+                start_hour=series.start_hour,
+                end_hour=series.end_hour,
+                place=series.place,
+                venue=venue,
+                price=series.price,
+                seats_no=series.seats_no,
+                description=series.description,
+                created_by_id=series.created_by_id,
+            )
+            for date in dates
+        ], batch_size=500)
+
+        through = Event.artists.through
+        artist_ids = list(series.artists.values_list('id', flat=True))
+        through.objects.bulk_create([through(event_id=event.id, artist_id=artist_id)
+                                     for event in events for artist_id in artist_ids], batch_size=1000)
+        Product.objects.bulk_create([Product(event=event, price=series.price, description=f"Ticket: {series.title}")
+                                     for event in events], batch_size=500)
+        EventDetails.objects.bulk_create([EventDetails(event=event, venue=series.place, rules=series.rules,
+                                                       description=series.description)
+                                          for event in events], batch_size=500)
+        return events
+
+    @staticmethod
+    def update_series(series, changes, artists=None, include_past=False):
+        """
+        Apply changes of shared fields (and rules) to the series and its upcoming occurrences, or all of
+        them with include_past. Ticket products priced and named as the series follow a price or title change.
+        Returns the ids of the occurrences updated.
+        """
+        changes = {field: value for field, value in changes.items() if field in SHARED_FIELDS + ['rules']}
+        old_price, old_title = series.price, series.title
+
+        with transaction.atomic():
+            for field, value in changes.items():
+                setattr(series, field, value)
+            series.save()
+
+            occurrences = Event.objects.filter(series=series)
+            if not include_past:
+                occurrences = occurrences.filter(date__gte=timezone.now())
+            event_ids = list(occurrences.values_list('id', flat=True))
+
+            event_changes = {field: value for field, value in changes.items() if field in SHARED_FIELDS}
+            if 'type' in event_changes:
+                event_type = EventType.resolve(series.type)
+                event_changes['type'] = event_type.code if event_type else series.type
+                event_changes['event_type'] = event_type
+            if 'place' in event_changes:
+                event_changes['venue'] = Venue.resolve(series.place) if (series.place or '').strip() else None
+            if event_changes:
+                Event.objects.filter(id__in=event_ids).update(updated_at=timezone.now(), version=F('version') + 1,
+                                                              **event_changes)
+
+            if 'price' in changes:
+                Product.objects.filter(event_id__in=event_ids, price=old_price).update(price=series.price)
+            if 'title' in changes:
+                Product.objects.filter(event_id__in=event_ids, description=f"Ticket: {old_title}").update(
+                    description=f"Ticket: {series.title}")
+            details_changes = {detail_field: changes[field] for field, detail_field in
+                               (('place', 'venue'), ('description', 'description'), ('rules', 'rules'))
+                               if field in changes}
+            if details_changes:
+                EventDetails.objects.filter(event_id__in=event_ids).update(**details_changes)
+
+            if artists is not None:
+                series.artists.set(artists)
+                through = Event.artists.through
+                through.objects.filter(event_id__in=event_ids).delete()
+                artist_ids = {getattr(artist, 'pk', artist) for artist in artists}
+                through.objects.bulk_create([through(event_id=event_id, artist_id=artist_id)
+                                             for event_id in event_ids for artist_id in artist_ids], batch_size=1000)
+
+        # set-based writes send no model signals
+        notify_events_changed(event_ids)
+        return event_ids
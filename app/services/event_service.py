@@ -1,6 +1,15 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
-from app.models import Event, Review
+from app.models import Event, EventPhoto, Review
+from app.repositories.data_loader import BatchLoader
 from app.repositories.event_repository import EventRepository
+from app.serializers.event_serializer import EventSerializer
+from app.utils import cache_generations
+from app.utils.object_cache import get_object_cache
+
+PAST_EVENTS_CACHE_NAMESPACE = 'past_events_with_reviews'
 
 class EventService:
     def __init__(self):
@@ -30,8 +39,11 @@ class EventService:
 
     def update_event(self, event_id, title=None, type=None, date=None, price=None,
                      description=None, start_hour=None, end_hour=None, place=None,
-                     seats_no=None, artists=None):
-        """Update an existing event"""
+                     seats_no=None, artists=None, version=None):
+        """
+        Update an existing event. With version, only if nobody changed it since that version was read
+        (ConcurrentUpdateError otherwise).
+        """
         event = self.event_repository.get_by_id(event_id)
         if not event:
             return None
@@ -46,15 +58,17 @@ class EventService:
             'end_hour': end_hour,
             'place': place,
             'seats_no': seats_no,
-            'artists': artists
         }
 
         update_data = {k: v for k, v in update_data.items() if v is not None}
 
-        updated_event = self.event_repository.update(event, **update_data)
+        with transaction.atomic():
+            # a change of artists alone is an edit of the event too: checked against and bumping its version
+            updated_event = self.event_repository.update(event, expected_version=version, touch=bool(artists),
+                                                         **update_data)
 
-        if artists:
-            self.event_repository.add_artists_to_event(updated_event, artists)
+            if artists:
+                self.event_repository.add_artists_to_event(updated_event, artists)
 
         return updated_event
 
@@ -62,35 +76,69 @@ class EventService:
         """Get an event by ID with its details"""
         return self.event_repository.get_event_with_details(event_id)
 
+    def get_event_payload(self, event_id):
+        """Serialized event and details as returned by retrieve, cached per event version"""
+        return get_object_cache('event').get_or_build(
+            event_id, lambda: self._event_payload(event_id), getattr(settings, 'EVENT_CACHE_SECONDS', 300))
+
+    @staticmethod
+    def invalidate_event_payloads(event_ids):
+        get_object_cache('event').invalidate(event_ids)
+
+    def _event_payload(self, event_id):
+        event_data = self.get_event(event_id)
+        if not event_data:
+            return None
+
+        event = event_data['event']
+        event_details = event_data['details']
+        return {
+            'event': EventSerializer(event).data,
+            'details': {
+                'location': event_details.venue if event_details else None,
+                'rules': event_details.rules if event_details else None,
+                'max_attendees': event.seats_no,
+                'additional_info': event_details.description if event_details else None
+            }
+        }
+
     def get_events(self, query=None, start_date=None, end_date=None):
         """Get filtered events with their details"""
         return self.event_repository.get_events_with_details(query, start_date, end_date)
 
-    def get_past_events_with_reviews(self, query='', limit=None):
-        """Get past events with all available reviews"""
-        from django.utils import timezone
-
-        current_date = timezone.now().date()
+    @staticmethod
+    def invalidate_past_events():
+        """Drop every cached past_events_with_reviews response"""
+        cache_generations.bump(PAST_EVENTS_CACHE_NAMESPACE)
 
-        past_events = Event.objects.filter(date__lt=current_date)
+    def get_past_events_with_reviews(self, query='', limit=None):
+        """Get past events, newest first, with their reviews and photos in a fixed number of queries"""
+        past_events = Event.objects.filter(date__lt=timezone.now())
 
         if query:
             past_events = past_events.filter(title__icontains=query)
 
-        past_events = past_events.order_by('-date')
+        past_events = past_events.order_by('-date', '-id').with_serializer_relations()
 
         if limit:
             past_events = past_events[:int(limit)]
 
-        events_with_reviews = []
-        for event in past_events:
-            reviews = Review.objects.filter(
-                order__orderproduct__product__event=event
-            ).distinct()
+        past_events = list(past_events)
+        event_ids = [event.id for event in past_events]
 
-            events_with_reviews.append({
-                'event': event,
-                'reviews': list(reviews)
-            })
+        reviews = BatchLoader(
+            Review, key_field='event_id', many=True,
+            queryset=Review.objects.annotate(event_id=F('order__orderproduct__product__event_id')).distinct(),
+            order_by=('date', 'id'),
+        ).load_many(event_ids)
+        photos = BatchLoader(EventPhoto, key_field='event_id', many=True,
+                             order_by=('-uploaded_at', '-id')).load_many(event_ids)
 
-        return events_with_reviews
\ No newline at end of file
+        return [
+            {
+                'event': event,
+                'reviews': reviews.get(event.id, []),
+                'photos': photos.get(event.id, [])
+            }
+            for event in past_events
+        ]
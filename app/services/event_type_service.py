@@ -0,0 +1,70 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from app.models.event import Event
+from app.models.event_type import EventType, EventTypeAlias, normalize_type_name
+
+# canonical types and the spellings that mean them
+DEFAULT_TYPES = {
+    'CONCERT': ('Concert', ['CONCERTS', 'KONCERT', 'GIG']),
+    'FESTIVAL': ('Festival', ['FESTIVALS', 'FESTIWAL', 'FEST']),
+    'SPORTS': ('Sports', ['SPORT', 'MECZ', 'MATCH']),
+    'THEATER': ('Theater', ['THEATRE', 'TEATR', 'PLAY']),
+}
+
+
+class EventTypeService:
+    @staticmethod
+    def ensure_defaults():
+        """
+        Create the default types and point their aliases at them. A type resolve() created earlier from one of
+        those aliases (e.g. 'THEATRE' before the first backfill) is merged into the default: its aliases and
+        events move over and it is deleted. Returns the ids of the events moved.
+        """
+        moved = []
+        for code, (name, aliases) in DEFAULT_TYPES.items():
+            names = {normalize_type_name(alias) for alias in [code] + aliases}
+            with transaction.atomic():
+                event_type, _ = EventType.objects.get_or_create(code=code, defaults={'name': name})
+                strays = list(EventType.objects.filter(aliases__alias__in=names).exclude(id=event_type.id)
+                              .distinct())
+                for stray in strays:
+                    ids = list(Event.all_objects.filter(event_type=stray).values_list('id', flat=True))
+                    Event.all_objects.filter(id__in=ids).update(event_type=event_type, type=event_type.code,
+                                                                updated_at=timezone.now(), version=F('version') + 1)
+                    stray.aliases.update(event_type=event_type)
+                    stray.delete()
+                    moved += ids
+                for alias in names:
+                    EventTypeAlias.objects.get_or_create(alias=alias, defaults={'event_type': event_type})
+        return moved
+
+    @staticmethod
+    def add_alias(code, alias):
+        """Make alias stand for the type with the given code"""
+        event_type = EventType.objects.get(code=normalize_type_name(code))
+        EventTypeAlias.objects.update_or_create(alias=normalize_type_name(alias),
+                                                defaults={'event_type': event_type})
+        return event_type
+
+    @staticmethod
+    def backfill():
+        """
+        Link events without a type id to their type, one UPDATE per distinct raw type name.
+        Returns the ids of the events updated, including those moved onto a default type.
+        """
+        updated = EventTypeService.ensure_defaults()
+        raw_names = (Event.objects.filter(event_type__isnull=True).values_list('type', flat=True)
+                     .distinct().order_by())
+        for raw_name in list(raw_names):
+            event_type = EventType.resolve(raw_name)
+            if event_type is None:
+                continue
+            with transaction.atomic():
+                events = Event.objects.filter(event_type__isnull=True, type=raw_name)
+                ids = list(events.values_list('id', flat=True))
+                Event.objects.filter(id__in=ids).update(event_type=event_type, type=event_type.code,
+                                                        updated_at=timezone.now(), version=F('version') + 1)
+            updated += ids
+        return updated
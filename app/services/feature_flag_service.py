@@ -0,0 +1,71 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from app.models.feature_flag import FeatureFlag
+
+# name -> enabled, replaced as a whole on refresh so readers never need a lock
+_snapshot = {}
+_loaded_at = None
+_refresh_lock = threading.Lock()
+
+
+class FeatureFlagService:
+    """
+    Database-backed feature flags with a per-process snapshot.
+    Reads are dictionary lookups; the snapshot is reloaded after FEATURE_FLAGS_TTL seconds,
+    so a change made by one worker reaches every other worker within that window.
+    """
+
+    @staticmethod
+    def is_enabled(name, default=False):
+        """Check a flag, falling back to default when it was never set"""
+        if _loaded_at is None or time.monotonic() - _loaded_at >= FeatureFlagService._ttl():
+            FeatureFlagService.refresh(blocking=_loaded_at is None)
+        return _snapshot.get(name, default)
+
+    @staticmethod
+    def set_flag(name, enabled):
+        """Persist a flag value and refresh this worker's snapshot"""
+        flag, created = FeatureFlag.objects.update_or_create(name=name, defaults={'enabled': enabled})
+        FeatureFlagService.refresh()
+        return flag
+
+    @staticmethod
+    def toggle(name, default=False):
+        """Flip a flag atomically, creating it from default when missing"""
+        with transaction.atomic():
+            flag, created = FeatureFlag.objects.select_for_update().get_or_create(
+                name=name, defaults={'enabled': default}
+            )
+            flag.enabled = not flag.enabled
+            flag.save(update_fields=['enabled', 'updated_at'])
+        FeatureFlagService.refresh()
+        return flag.enabled
+
+    @staticmethod
+    def refresh(blocking=True):
+        """
+        Reload the snapshot from the database.
+        Non-blocking callers keep serving the stale snapshot while another thread refreshes it.
+        """
+        global _snapshot, _loaded_at
+        if not _refresh_lock.acquire(blocking=blocking):
+            return
+        try:
+            _snapshot = dict(FeatureFlag.objects.values_list('name', 'enabled'))
+            _loaded_at = time.monotonic()
+        finally:
+            _refresh_lock.release()
+
+    @staticmethod
+    def invalidate():
+        """Drop the snapshot so the next read reloads it"""
+        global _loaded_at
+        _loaded_at = None
+
+    @staticmethod
+    def _ttl():
+        return getattr(settings, 'FEATURE_FLAGS_TTL', 5)
@@ -0,0 +1,114 @@
+import datetime
+import logging
+
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from app.models.queued_email import QueuedEmail
+from app.utils.circuit_breaker import get_breaker, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class MailService:
+    MAX_ATTEMPTS = 5
+    CLAIM_TIMEOUT = datetime.timedelta(minutes=10)
+
+    @staticmethod
+    def send(subject, body, to, attachment=None):
+        """
+        Send an email through the SMTP circuit breaker.
+        When the breaker is open or the send fails, the email is queued for a later retry.
+        Returns True when the email was sent right away, False when it was queued.
+        """
+        message = MailService._build_message(subject, body, to, attachment)
+        try:
+            get_breaker('smtp').call(message.send)
+            return True
+        except Exception as e:
+            # CircuitOpenError included: the breaker rejected the send without trying
+            logger.warning("SMTP send failed, queueing email to %s: %s", to, e)
+            MailService.enqueue(subject, body, to, attachment, error=str(e))
+        return False
+
+    @staticmethod
+    def enqueue(subject, body, to, attachment=None, error=None):
+        """Store an email in the outbox for the queue worker"""
+        name, content, mimetype = attachment if attachment else (None, None, None)
+        return QueuedEmail.objects.create(
+            subject=subject,
+            body=body,
+            to=list(to),
+            attachment_name=name,
+            attachment_content=content,
+            attachment_mimetype=mimetype,
+            last_error=error,
+        )
+
+    @staticmethod
+    def flush_queue(limit=100):
+        """
+        Retry pending emails, oldest first.
+        Stops early when the SMTP breaker opens so a dead server is not hammered.
+        """
+        breaker = get_breaker('smtp')
+        stats = {'sent': 0, 'failed': 0, 'remaining': 0}
+
+        claimed = MailService._claim(limit)
+        for position, queued in enumerate(claimed):
+            attachment = None
+            if queued.attachment_name:
+                attachment = (queued.attachment_name, bytes(queued.attachment_content), queued.attachment_mimetype)
+            message = MailService._build_message(queued.subject, queued.body, queued.to, attachment)
+
+            queued.attempts += 1
+            try:
+                breaker.call(message.send)
+            except CircuitOpenError as e:
+                queued.attempts -= 1
+                queued.last_error = str(e)
+                queued.status = 'pending'
+                queued.save(update_fields=['attempts', 'last_error', 'status'])
+                # hand the rest back for the next run
+                QueuedEmail.objects.filter(id__in=[rest.id for rest in claimed[position + 1:]]).update(status='pending')
+                break
+            except Exception as e:
+                queued.last_error = str(e)
+                if queued.attempts >= MailService.MAX_ATTEMPTS:
+                    queued.status = 'failed'
+                    stats['failed'] += 1
+                else:
+                    queued.status = 'pending'
+                queued.save(update_fields=['attempts', 'last_error', 'status'])
+                continue
+
+            queued.status = 'sent'
+            queued.sent_at = timezone.now()
+            queued.save(update_fields=['attempts', 'status', 'sent_at'])
+            stats['sent'] += 1
+
+        stats['remaining'] = QueuedEmail.objects.filter(status='pending').count()
+        return stats
+
+    @staticmethod
+    def _claim(limit):
+        """
+        Switch up to limit pending emails to 'sending' so that concurrent flushers never pick the same ones.
+        Emails left 'sending' by a worker that died are claimed again after CLAIM_TIMEOUT.
+        """
+        now = timezone.now()
+        claimable = Q(status='pending') | Q(status='sending', claimed_at__lt=now - MailService.CLAIM_TIMEOUT)
+        with transaction.atomic():
+            ids = list(QueuedEmail.objects.filter(claimable).order_by('created_at')
+                       .select_for_update(skip_locked=True).values_list('id', flat=True)[:limit])
+            QueuedEmail.objects.filter(id__in=ids).update(status='sending', claimed_at=now)
+        return list(QueuedEmail.objects.filter(id__in=ids).order_by('created_at'))
+
+    @staticmethod
+    def _build_message(subject, body, to, attachment):
+        message = EmailMessage(subject=subject, body=body, from_email=None, to=list(to))
+        if attachment:
+            message.attach(*attachment)
+        return message
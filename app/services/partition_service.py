@@ -0,0 +1,248 @@
+import gzip
+import logging
+import os
+import re
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection, transaction
+
+from app.models.orders import Order, OrderProduct, IssueReport, RefundRequest
+from app.models.ticket import Ticket
+
+logger = logging.getLogger(__name__)
+
+# model -> column the table is range-partitioned on, one partition per month
+PARTITIONED_MODELS = [
+    (Order, 'date'),
+    (OrderProduct, 'order_date'),
+    (Ticket, 'created_at'),
+]
+
+_PARTITION_SUFFIX = re.compile(r'_p(\d{4})(\d{2})$')
+
+
+class PartitionError(Exception):
+    pass
+
+
+def _month_start(year, month):
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=dt_timezone.utc)
+
+
+def _add_months(moment, months):
+    return _month_start(moment.year, moment.month + months)
+
+
+class PartitionService:
+    """
+    Monthly range partitioning of Order, OrderProduct and Ticket on Postgres.
+
+    convert()           one-time switch of the existing tables to partitioned tables
+    create_partitions() keeps partitions ready for the coming months
+    archive()           detaches partitions older than a cutoff, dumps them to .csv.gz and drops them
+    """
+
+    @staticmethod
+    def check_supported():
+        if connection.vendor != 'postgresql':
+            raise PartitionError(f"Partitioning needs PostgreSQL, the database is {connection.vendor}")
+
+    @staticmethod
+    def tables():
+        return [(model._meta.db_table, model._meta.get_field(field).column) for model, field in PARTITIONED_MODELS]
+
+    @staticmethod
+    def is_partitioned(table):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+                           "WHERE c.relname = %s", [table])
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def convert(months_ahead=3):
+        """Rebuild every configured table as a partitioned table, copying the existing rows"""
+        PartitionService.check_supported()
+        converted = []
+        for table, column in PartitionService.tables():
+            if PartitionService.is_partitioned(table):
+                continue
+            with transaction.atomic():
+                PartitionService._convert_table(table, column, months_ahead)
+            converted.append(table)
+        return converted
+
+    @staticmethod
+    def _convert_table(table, column, months_ahead):
+        qn = connection.ops.quote_name
+        legacy = f'{table}_legacy'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname NOT IN "
+                "(SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype IN ('p', 'u'))",
+                [table, table]
+            )
+            index_defs = [row[0] for row in cursor.fetchall()]
+            cursor.execute(
+                "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = %s::regclass AND contype = 'f'",
+                [table]
+            )
+            foreign_keys = cursor.fetchall()
+            cursor.execute(f"SELECT min({qn(column)}) FROM {qn(table)}")
+            oldest = cursor.fetchone()[0] or datetime.now(dt_timezone.utc)
+
+            cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+            cursor.execute(
+                f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS) "
+                f"PARTITION BY RANGE ({qn(column)})"
+            )
+            cursor.execute(f"ALTER TABLE {qn(table)} ADD PRIMARY KEY (id, {qn(column)})")
+            cursor.execute(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+
+            month = _month_start(oldest.year, oldest.month)
+            last = _add_months(datetime.now(dt_timezone.utc), months_ahead)
+            while month <= last:
+                PartitionService._create_partition(cursor, table, column, month)
+                month = _add_months(month, 1)
+
+            cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(legacy)}")
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence(%s, 'id'), coalesce((SELECT max(id) FROM {qn(table)}), 1))",
+                [table]
+            )
+            # indexes and outgoing foreign keys are recreated under their old names once the legacy table is gone;
+            # foreign keys pointing at this table are dropped, the models declare them with db_constraint=False
+            cursor.execute(f"DROP TABLE {qn(legacy)} CASCADE")
+            for index_def in index_defs:
+                cursor.execute(index_def)
+            for name, definition in foreign_keys:
+                cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+
+        logger.info("Converted %s to monthly partitions on %s", table, column)
+
+    @staticmethod
+    def create_partitions(months_ahead=3):
+        """Make sure a partition exists for every month from now to months_ahead"""
+        PartitionService.check_supported()
+        created = []
+        now = datetime.now(dt_timezone.utc)
+        with transaction.atomic(), connection.cursor() as cursor:
+            for table, column in PartitionService.tables():
+                if not PartitionService.is_partitioned(table):
+                    raise PartitionError(f"{table} is not partitioned yet, run the convert step first")
+                existing = {name for name, start in PartitionService.partitions(table)}
+                for offset in range(months_ahead + 1):
+                    month = _add_months(now, offset)
+                    name = PartitionService.partition_name(table, month)
+                    if name not in existing:
+                        PartitionService._create_partition(cursor, table, column, month)
+                        created.append(name)
+        return created
+
+    @staticmethod
+    def _create_partition(cursor, table, column, month):
+        """
+        Create the partition for one month.
+        Rows that already landed in the default partition for that month are moved into it first,
+        otherwise Postgres refuses to attach the new partition.
+        """
+        qn = connection.ops.quote_name
+        name = PartitionService.partition_name(table, month)
+        start, end = month, _add_months(month, 1)
+        default = f'{table}_default'
+
+        cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(default)} WHERE {qn(column)} >= %s AND {qn(column)} < %s "
+            f"RETURNING *) INSERT INTO {qn(name)} SELECT * FROM moved",
+            [start, end]
+        )
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)",
+            [start, end]
+        )
+
+    @staticmethod
+    def partition_name(table, month):
+        return f'{table}_p{month.year:04d}{month.month:02d}'
+
+    @staticmethod
+    def partitions(table):
+        """Monthly partitions of a table as (name, month start), oldest first"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = %s",
+                [table]
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        result = []
+        for name in names:
+            match = _PARTITION_SUFFIX.search(name)
+            if match:
+                result.append((name, _month_start(int(match.group(1)), int(match.group(2)))))
+        return sorted(result, key=lambda item: item[1])
+
+    @staticmethod
+    def archive_cutoff(older_than_months, now=None):
+        """Start of the month older_than_months before now; partitions ending by then are archived"""
+        return _add_months(now or datetime.now(dt_timezone.utc), -older_than_months)
+
+    @staticmethod
+    def months_to_archive(partitions_by_table, cutoff):
+        """{month start: {table: partition}} of the partitions that ended by the cutoff, oldest month first"""
+        months = {}
+        for table, partitions in partitions_by_table.items():
+            for name, start in partitions:
+                if _add_months(start, 1) <= cutoff:
+                    months.setdefault(start, {})[table] = name
+        return dict(sorted(months.items()))
+
+    @staticmethod
+    def archive(older_than_months, archive_dir):
+        """
+        Detach partitions that ended before the cutoff, write them to archive_dir as gzipped CSV and drop them.
+        Months are archived across all tables at once: a month whose orders still have issue reports or
+        refund requests is kept whole, order lines and tickets included.
+        """
+        PartitionService.check_supported()
+        qn = connection.ops.quote_name
+        cutoff = PartitionService.archive_cutoff(older_than_months)
+        os.makedirs(archive_dir, exist_ok=True)
+        archived = []
+
+        partitions_by_table = {table: PartitionService.partitions(table) for table, column in PartitionService.tables()}
+        for month, partitions in PartitionService.months_to_archive(partitions_by_table, cutoff).items():
+            order_partition = partitions.get(Order._meta.db_table)
+            if order_partition and PartitionService._has_order_references(order_partition):
+                logger.warning("Keeping %04d-%02d, orders in it still have issue reports or refunds",
+                               month.year, month.month)
+                continue
+
+            for table, name in partitions.items():
+                path = os.path.join(archive_dir, f'{name}.csv.gz')
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+                    with gzip.open(path, 'wb') as archive_file:
+                        cursor.copy_expert(f"COPY {qn(name)} TO STDOUT WITH CSV HEADER", archive_file)
+                    cursor.execute(f"DROP TABLE {qn(name)}")
+                archived.append(path)
+                logger.info("Archived partition %s to %s", name, path)
+
+        return archived
+
+    @staticmethod
+    def _has_order_references(partition):
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            for model in (IssueReport, RefundRequest):
+                cursor.execute(
+                    f"SELECT 1 FROM {qn(model._meta.db_table)} WHERE order_id IN (SELECT id FROM {qn(partition)}) "
+                    f"LIMIT 1"
+                )
+                if cursor.fetchone():
+                    return True
+        return False
@@ -0,0 +1,105 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from app.models.event import Event
+from app.models.event_popularity import EventPopularity
+from app.models.orders import OrderProduct
+from app.models.ticket import Ticket
+from app.models.user_event_favorite import UserEventFavorite
+
+# forward decay reference point, activity weights are 2 ** (days since EPOCH / half-life)
+EPOCH = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+
+TICKET_WEIGHT = 1.0
+ORDER_WEIGHT = 2.0
+FAVORITE_WEIGHT = 0.5
+
+
+class PopularityService:
+    """
+    Maintains the EventPopularity leaderboard.
+    Writes recompute the rows of the touched events only, reading the top N is one index scan.
+    """
+
+    @staticmethod
+    def top(limit):
+        """Upcoming events, most popular first"""
+        return (Event.objects.filter(popularity__date__gte=timezone.now())
+                .order_by('-popularity__score', 'popularity__date', 'id')[:limit])
+
+    @classmethod
+    def refresh(cls, event_ids=None):
+        """Recompute the leaderboard rows of the given events (all events when None)"""
+        events = Event.objects.all()
+        if event_ids is not None:
+            event_ids = set(event_ids)
+            if not event_ids:
+                return
+            events = events.filter(id__in=event_ids)
+
+        dates = dict(events.values_list('id', 'date'))
+        if not dates:
+            return
+        ids = list(dates)
+
+        exponents = defaultdict(list)
+        totals = defaultdict(lambda: [0, 0, 0])
+
+        tickets = Ticket.objects.all() if event_ids is None else Ticket.objects.filter(event_id__in=ids)
+        for event_id, day, quantity in (tickets.annotate(day=TruncDate('created_at')).values('event_id', 'day')
+                                        .annotate(quantity=Sum('quantity')).values_list('event_id', 'day', 'quantity')):
+            cls._add(exponents[event_id], TICKET_WEIGHT * quantity, day)
+            totals[event_id][0] += quantity
+
+        order_products = (OrderProduct.objects.all() if event_ids is None
+                          else OrderProduct.objects.filter(product__event_id__in=ids))
+        for event_id, day, orders in (order_products.filter(product__event__isnull=False)
+                                      .annotate(day=TruncDate('order_date')).values('product__event_id', 'day')
+                                      .annotate(orders=Count('order_id', distinct=True))
+                                      .values_list('product__event_id', 'day', 'orders')):
+            cls._add(exponents[event_id], ORDER_WEIGHT * orders, day)
+            totals[event_id][1] += orders
+
+        favorites = UserEventFavorite.objects.filter(is_favorite=True)
+        if event_ids is not None:
+            favorites = favorites.filter(event_id__in=ids)
+        for event_id, day, count in (favorites.annotate(day=TruncDate('updated_at')).values('event_id', 'day')
+                                     .annotate(count=Count('id')).values_list('event_id', 'day', 'count')):
+            cls._add(exponents[event_id], FAVORITE_WEIGHT * count, day)
+            totals[event_id][2] += count
+
+        rows = [
+            EventPopularity(
+                event_id=event_id,
+                date=dates[event_id],
+                score=cls._log2_sum(exponents[event_id]),
+                tickets_sold=totals[event_id][0],
+                order_count=totals[event_id][1],
+                favorite_count=totals[event_id][2],
+            )
+            for event_id in ids
+        ]
+        EventPopularity.objects.bulk_create(
+            rows, batch_size=500, update_conflicts=True, unique_fields=['event'],
+            update_fields=['date', 'score', 'tickets_sold', 'order_count', 'favorite_count', 'updated_at'],
+        )
+
+    @staticmethod
+    def _add(exponents, weight, day):
+        if weight > 0 and day is not None:
+            half_life = getattr(settings, 'POPULARITY_HALF_LIFE_DAYS', 14)
+            exponents.append(math.log2(weight) + (day - EPOCH.date()).days / half_life)
+
+    @staticmethod
+    def _log2_sum(exponents):
+        """log2(sum(2 ** e)) without overflowing, 0 for no activity"""
+        if not exponents:
+            return 0.0
+        top = max(exponents)
+        return max(top + math.log2(sum(2 ** (e - top) for e in exponents)), 0.0)
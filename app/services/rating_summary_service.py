@@ -0,0 +1,89 @@
+from collections import defaultdict
+
+from django.db.models import F
+from django.utils import timezone
+
+from app.models.event_rating_summary import STARS, EventRatingSummary
+from app.models.orders import Product, Review
+
+
+class RatingSummaryService:
+    """
+    Keeps EventRatingSummary in step with order reviews.
+
+    A review counts once for every event its order bought tickets for. Review writes apply deltas with F()
+    expressions (two queries, no reads); rebuild() recomputes rows from the reviews and repairs any drift.
+    """
+
+    @staticmethod
+    def order_event_ids(order):
+        return list(Product.objects.filter(id__in=order.lines().values('product_id'), event_id__isnull=False)
+                    .values_list('event_id', flat=True).distinct())
+
+    @staticmethod
+    def stars(review):
+        return int(review.numberOfStars)
+
+    @classmethod
+    def add(cls, event_ids, stars):
+        cls._adjust(event_ids, 1, {stars: 1})
+
+    @classmethod
+    def change(cls, event_ids, old_stars, new_stars):
+        if old_stars != new_stars:
+            cls._adjust(event_ids, 0, {old_stars: -1, new_stars: 1})
+
+    @classmethod
+    def remove(cls, event_ids, stars):
+        cls._adjust(event_ids, -1, {stars: -1})
+
+    @staticmethod
+    def _adjust(event_ids, count, star_deltas):
+        event_ids = set(event_ids)
+        if not event_ids:
+            return
+        EventRatingSummary.objects.bulk_create([EventRatingSummary(event_id=event_id) for event_id in event_ids],
+                                               ignore_conflicts=True)
+        updates = {
+            'review_count': F('review_count') + count,
+            'stars_sum': F('stars_sum') + sum(stars * delta for stars, delta in star_deltas.items()),
+            'updated_at': timezone.now(),
+        }
+        for stars, delta in star_deltas.items():
+            updates[f'stars_{stars}'] = F(f'stars_{stars}') + delta
+        EventRatingSummary.objects.filter(event_id__in=event_ids).update(**updates)
+
+    @staticmethod
+    def rebuild(event_ids=None):
+        """Recompute the summaries of the given events (all events when None) from their reviews"""
+        reviews = Review.objects.filter(order__orderproduct__product__event__isnull=False)
+        summaries = EventRatingSummary.objects.all()
+        if event_ids is not None:
+            event_ids = set(event_ids)
+            if not event_ids:
+                return
+            reviews = reviews.filter(order__orderproduct__product__event_id__in=event_ids)
+            summaries = summaries.filter(event_id__in=event_ids)
+
+        stars = defaultdict(dict)
+        for event_id, review_id, number_of_stars in (
+                reviews.values_list('order__orderproduct__product__event_id', 'id', 'numberOfStars').distinct()):
+            stars[event_id][review_id] = int(number_of_stars)
+
+        rows = []
+        for event_id, by_review in stars.items():
+            counts = defaultdict(int)
+            for value in by_review.values():
+                counts[value] += 1
+            rows.append(EventRatingSummary(
+                event_id=event_id,
+                review_count=len(by_review),
+                stars_sum=sum(by_review.values()),
+                **{f'stars_{value}': counts[value] for value in STARS},
+            ))
+
+        summaries.exclude(event_id__in=list(stars)).delete()
+        EventRatingSummary.objects.bulk_create(
+            rows, batch_size=500, update_conflicts=True, unique_fields=['event'],
+            update_fields=['review_count', 'stars_sum'] + [f'stars_{value}' for value in STARS] + ['updated_at'],
+        )
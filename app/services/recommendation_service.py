@@ -0,0 +1,166 @@
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, IntegerField, When
+from django.utils import timezone
+
+from app.models.event import Event
+from app.models.event_popularity import EventPopularity
+from app.models.event_recommendation import EventRecommendation
+from app.models.orders import OrderProduct
+from app.models.ticket import Ticket
+from app.models.user_event_favorite import UserEventFavorite
+from app.services.popularity_service import PopularityService
+
+# how much each kind of interaction tells about a user's taste
+FAVORITE_WEIGHT = 3.0
+ORDER_WEIGHT = 2.0
+TICKET_WEIGHT = 2.0
+
+# feature weights of an event: a shared artist says more than a shared type
+ARTIST_WEIGHT = 2.0
+TYPE_WEIGHT = 1.0
+
+# share of the score given to overall popularity, orders ties and cold profiles
+POPULARITY_PRIOR = 0.1
+
+
+class RecommendationService:
+    """
+    Content-based recommendations, computed offline and served from cache.
+
+    A user profile is the weighted sum of the artist/type vectors of the events they favorited, ordered or
+    bought tickets for; upcoming events are scored by cosine similarity to that profile plus a small
+    popularity prior, and the top K per user are stored in EventRecommendation.
+    Vectors are kept sparse: memory grows with the non-zero cells, scoring one user touches only the
+    upcoming events sharing a feature with their profile.
+    """
+
+    @staticmethod
+    def cache_key(user_id):
+        # v2: cached as (event_id, date) pairs
+        return f'recommendations:v2:{user_id}'
+
+    @classmethod
+    def recommended_event_ids(cls, user_id):
+        """Stored recommendations of a user that have not happened yet, best first"""
+        key = cls.cache_key(user_id)
+        picks = cache.get(key)
+        if picks is None:
+            picks = list(EventRecommendation.objects.filter(user_id=user_id).order_by('rank')
+                         .values_list('event_id', 'event__date'))
+            cache.set(key, picks, getattr(settings, 'RECOMMENDATIONS_CACHE_SECONDS', 3600))
+        now = timezone.now()
+        return [event_id for event_id, date in picks if date >= now]
+
+    @classmethod
+    def recommend(cls, user, limit):
+        """Upcoming recommended events of a user, most popular events for users without any left"""
+        event_ids = cls.recommended_event_ids(user.id) if user and user.is_authenticated else []
+        if not event_ids:
+            return PopularityService.top(limit)
+
+        position = Case(*[When(id=event_id, then=i) for i, event_id in enumerate(event_ids)],
+                        output_field=IntegerField())
+        return (Event.objects.filter(id__in=event_ids, date__gte=timezone.now())
+                .annotate(rank_position=position).order_by('rank_position')[:limit])
+
+    @classmethod
+    def build(cls, k=None):
+        """Recompute and store the top-k recommendations of every user with any activity, returns the user count"""
+        k = k or getattr(settings, 'RECOMMENDATIONS_PER_USER', 20)
+        interactions = cls._interactions()
+        candidates = list(Event.objects.filter(date__gte=timezone.now()).values_list('id', flat=True))
+        # users recommended to before, whose cached picks go stale too even when they drop out now
+        previous_users = set(EventRecommendation.objects.values_list('user_id', flat=True).distinct())
+
+        by_user = defaultdict(dict)
+        for (user_id, event_id), weight in interactions.items():
+            by_user[user_id][event_id] = weight
+        if not by_user or not candidates:
+            with transaction.atomic():
+                EventRecommendation.objects.all().delete()
+            cache.delete_many([cls.cache_key(user_id) for user_id in previous_users | set(by_user)])
+            return 0
+
+        features = cls._features(set(candidates) | {event_id for _, event_id in interactions})
+        # inverted index of the candidates: feature -> (candidate positions, weights)
+        postings = defaultdict(lambda: ([], []))
+        for position, event_id in enumerate(candidates):
+            for feature, weight in features.get(event_id, {}).items():
+                postings[feature][0].append(position)
+                postings[feature][1].append(weight)
+        postings = {feature: (np.array(positions), np.array(weights, dtype=np.float32))
+                    for feature, (positions, weights) in postings.items()}
+        candidate_position = {event_id: position for position, event_id in enumerate(candidates)}
+
+        popularity = dict(EventPopularity.objects.filter(event_id__in=candidates).values_list('event_id', 'score'))
+        prior = np.array([popularity.get(event_id, 0.0) for event_id in candidates], dtype=np.float32)
+        if prior.max() > 0:
+            prior /= prior.max()
+        prior *= POPULARITY_PRIOR
+
+        recommendations = []
+        k = min(k, len(candidates))
+        for user_id, weights in by_user.items():
+            profile = defaultdict(float)
+            for event_id, weight in weights.items():
+                for feature, value in features.get(event_id, {}).items():
+                    profile[feature] += weight * value
+            norm = sum(value * value for value in profile.values()) ** 0.5 or 1.0
+
+            scores = prior.copy()
+            for feature, value in profile.items():
+                if feature in postings:
+                    positions, feature_weights = postings[feature]
+                    scores[positions] += feature_weights * (value / norm)
+            known = [candidate_position[event_id] for event_id in weights if event_id in candidate_position]
+            scores[known] = -np.inf
+
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            rank = 0
+            for position in top:
+                if not np.isfinite(scores[position]):
+                    break
+                recommendations.append(EventRecommendation(
+                    user_id=user_id, event_id=candidates[position], rank=rank, score=float(scores[position])
+                ))
+                rank += 1
+
+        with transaction.atomic():
+            EventRecommendation.objects.all().delete()
+            EventRecommendation.objects.bulk_create(recommendations, batch_size=1000)
+        cache.delete_many([cls.cache_key(user_id) for user_id in previous_users | set(by_user)])
+        return len(by_user)
+
+    @staticmethod
+    def _interactions():
+        """{(user_id, event_id): weight} over favorites, orders and tickets"""
+        interactions = defaultdict(float)
+        for key in UserEventFavorite.objects.filter(is_favorite=True).values_list('user_id', 'event_id'):
+            interactions[key] += FAVORITE_WEIGHT
+        for key in (OrderProduct.objects.filter(product__event__isnull=False)
+                    .values_list('order__user_id', 'product__event_id').distinct()):
+            interactions[key] += ORDER_WEIGHT
+        for key in Ticket.objects.values_list('user_id', 'event_id').distinct():
+            interactions[key] += TICKET_WEIGHT
+        return interactions
+
+    @staticmethod
+    def _features(event_ids):
+        """{event_id: {feature: weight}} with unit-length (type, artist) vectors, only the non-zero cells"""
+        features = defaultdict(dict)
+        for event_id, event_type_id in Event.objects.filter(id__in=event_ids).values_list('id', 'event_type_id'):
+            features[event_id][('type', event_type_id)] = TYPE_WEIGHT
+        for event_id, artist_id in (Event.artists.through.objects.filter(event_id__in=event_ids)
+                                    .values_list('event_id', 'artist_id')):
+            features[event_id][('artist', artist_id)] = ARTIST_WEIGHT
+        for vector in features.values():
+            norm = sum(weight * weight for weight in vector.values()) ** 0.5
+            for feature in vector:
+                vector[feature] /= norm
+        return features
@@ -0,0 +1,139 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from app.models.event import Event
+from app.models.orders import OrderProduct
+from app.models.similar_event import SimilarEvent, SimilarEventRefresh
+from app.models.user_event_favorite import UserEventFavorite
+
+# events per user taken into account, keeps the pair count of heavy buyers bounded
+MAX_BASKET = 200
+
+
+class SimilarEventService:
+    """
+    Item-to-item "customers also bought" index.
+
+    A user's basket is the set of events they ordered or favorited. Two events co-occur once per basket
+    holding both; the sparse co-occurrence counts are normalized to cosine scores c(a, b) / sqrt(n(a) * n(b))
+    and the best K neighbours of each event are stored in SimilarEvent.
+
+    Orders and favorites only queue the change (queue); a periodic `manage.py build_similar_events --queued`
+    recomputes the affected events in one pass, keeping the co-count work out of checkout.
+    """
+
+    @staticmethod
+    def similar(event_id, limit=10):
+        """Stored upcoming neighbours of an event, best first"""
+        return (SimilarEvent.objects.filter(event_id=event_id, similar__date__gte=timezone.now(),
+                                            similar__deleted_at__isnull=True)
+                .select_related('similar').order_by('rank')[:limit])
+
+    @classmethod
+    def build(cls):
+        """Recompute the neighbours of every event"""
+        return cls.refresh()
+
+    @staticmethod
+    def queue(user_id, event_ids):
+        """Note a basket change for refresh_queued(): a single INSERT, cheap enough for the request path"""
+        SimilarEventRefresh.objects.bulk_create(
+            [SimilarEventRefresh(event_id=event_id, user_id=user_id) for event_id in set(event_ids)],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def refresh_queued(cls, limit=1000):
+        """Apply up to limit queued basket changes at once, returns the number applied"""
+        with transaction.atomic():
+            queued = list(SimilarEventRefresh.objects.order_by('id').select_for_update(skip_locked=True)
+                          .values_list('id', 'user_id', 'event_id')[:limit])
+            if not queued:
+                return 0
+            # deleted before recomputing: a change queued meanwhile waits for this transaction and stays queued
+            SimilarEventRefresh.objects.filter(id__in=[row[0] for row in queued]).delete()
+            cls.refresh_baskets({row[1] for row in queued if row[1] is not None}, {row[2] for row in queued})
+        return len(queued)
+
+    @classmethod
+    def refresh_baskets(cls, user_ids, event_ids):
+        """
+        Recompute after baskets changed: the touched events, the rest of those baskets (their co-counts
+        changed) and the events listing a touched one (its basket count changed)
+        """
+        basket = {event_id for _, event_id in cls._pairs(user_ids=user_ids)} if user_ids else set()
+        listing = set(SimilarEvent.objects.filter(similar_id__in=event_ids).values_list('event_id', flat=True))
+        return cls.refresh(set(event_ids) | basket | listing)
+
+    @classmethod
+    def refresh(cls, event_ids=None):
+        """Recompute the neighbours of the given events (all events when None), returns the rows written"""
+        k = getattr(settings, 'SIMILAR_EVENTS_PER_EVENT', 10)
+        if event_ids is not None:
+            event_ids = set(event_ids)
+            if not event_ids:
+                return 0
+            users = {user_id for user_id, _ in cls._pairs(event_ids=event_ids)}
+            pairs = cls._pairs(user_ids=users) if users else set()
+        else:
+            pairs = cls._pairs()
+
+        baskets = defaultdict(list)
+        for user_id, event_id in sorted(pairs):
+            if len(baskets[user_id]) < MAX_BASKET:
+                baskets[user_id].append(event_id)
+
+        co_counts = defaultdict(Counter)
+        for basket in baskets.values():
+            for event_id in basket:
+                if event_ids is None or event_id in event_ids:
+                    row = co_counts[event_id]
+                    for other in basket:
+                        if other != event_id:
+                            row[other] += 1
+
+        partners = set(co_counts) | {other for row in co_counts.values() for other in row}
+        if event_ids is None:
+            basket_sizes = Counter(event_id for _, event_id in pairs)
+        else:
+            basket_sizes = Counter(event_id for _, event_id in cls._pairs(event_ids=partners)) if partners else {}
+
+        rows = []
+        for event_id, row in co_counts.items():
+            scored = (
+                (count / math.sqrt(basket_sizes[event_id] * basket_sizes[other]), -other)
+                for other, count in row.items()
+            )
+            for rank, (score, other) in enumerate(heapq.nlargest(k, scored)):
+                rows.append(SimilarEvent(event_id=event_id, similar_id=-other, score=score, rank=rank))
+
+        # pairs may still name an event deleted meanwhile
+        events = Event.objects.all() if event_ids is None else Event.objects.filter(id__in=partners)
+        existing = set(events.values_list('id', flat=True)) if partners else set()
+        rows = [row for row in rows if row.event_id in existing and row.similar_id in existing]
+
+        with transaction.atomic():
+            stale = SimilarEvent.objects.all() if event_ids is None else SimilarEvent.objects.filter(
+                event_id__in=event_ids)
+            stale.delete()
+            SimilarEvent.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+    @staticmethod
+    def _pairs(event_ids=None, user_ids=None):
+        """Distinct (user_id, event_id) pairs of orders and favorites"""
+        favorites = UserEventFavorite.objects.filter(is_favorite=True)
+        ordered = OrderProduct.objects.filter(product__event__isnull=False)
+        if event_ids is not None:
+            favorites = favorites.filter(event_id__in=event_ids)
+            ordered = ordered.filter(product__event_id__in=event_ids)
+        if user_ids is not None:
+            favorites = favorites.filter(user_id__in=user_ids)
+            ordered = ordered.filter(order__user_id__in=user_ids)
+        return (set(favorites.values_list('user_id', 'event_id'))
+                | set(ordered.values_list('order__user_id', 'product__event_id').distinct()))
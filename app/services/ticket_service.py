@@ -1,9 +1,12 @@
+import logging
 from app.repositories.ticket_repository import TicketRepository
 
+logger = logging.getLogger(__name__)
+
 class TicketService:
     @staticmethod
     def add_to_basket(user, ticket_data):
-        print("TICKET DATA:", ticket_data)
+        logger.debug("Adding ticket to basket: %s", ticket_data)
         return TicketRepository.create_ticket(user=user, **ticket_data)
 
     @staticmethod
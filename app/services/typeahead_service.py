@@ -0,0 +1,218 @@
+import heapq
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Sum
+
+from app.models.artist import Artist
+from app.models.event import Event
+from app.services.event_search_service import tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class _Node:
+    __slots__ = ('children', 'terminal', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.terminal = set()
+        self.top = None
+
+
+class PrefixIndex:
+    """
+    Trie over normalized labels where every node caches its top-k entries by weight.
+    A label is reachable from the start of each of its words, so "swi" finds "Taylor Swift".
+    Updates drop the caches along the touched paths; they are rebuilt on the next lookup.
+    """
+
+    def __init__(self, k=10):
+        self.k = k
+        self._root = _Node()
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, key, label, weight, payload=None):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (weight, label, payload)
+            for path in self._paths(label):
+                node = self._root
+                node.top = None
+                for char in path:
+                    node = node.children.setdefault(char, _Node())
+                    node.top = None
+                node.terminal.add(key)
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for path in self._paths(entry[1]):
+            trail = [self._root]
+            for char in path:
+                child = trail[-1].children.get(char)
+                if child is None:
+                    break
+                trail.append(child)
+            else:
+                trail[-1].terminal.discard(key)
+            for node in trail:
+                node.top = None
+
+    def lookup(self, prefix, limit=None):
+        """Best entries whose label has a word starting with prefix, as [(key, label, weight, payload)]"""
+        limit = min(limit or self.k, self.k)
+        with self._lock:
+            node = self._root
+            for char in ' '.join(tokenize(prefix)):
+                node = node.children.get(char)
+                if node is None:
+                    return []
+            return [(key, self._entries[key][1], self._entries[key][0], self._entries[key][2])
+                    for key in self._top(node)[:limit]]
+
+    def _top(self, node):
+        if node.top is None:
+            candidates = set(node.terminal)
+            for child in node.children.values():
+                candidates.update(self._top(child))
+            node.top = heapq.nlargest(self.k, candidates, key=lambda key: (self._entries[key][0], key))
+        return node.top
+
+    @staticmethod
+    def _paths(label):
+        words = tokenize(label)
+        return {' '.join(words[i:]) for i in range(len(words))}
+
+
+_index = PrefixIndex(k=10)
+_built_at = None
+# held by the one thread rebuilding, readers keep using the current index meanwhile
+_build_lock = threading.Lock()
+# guards the swap of _index against refreshes made while a rebuild reads the database
+_swap_lock = threading.Lock()
+# ids refreshed while a rebuild runs, re-applied to the new index once it is swapped in
+_pending = None
+
+
+class TypeaheadService:
+    """
+    Autocomplete over event titles and artist names, answered from an in-process PrefixIndex.
+    Titles and names follow writes through the change signals; popularity weights are recomputed on a
+    full rebuild every TYPEAHEAD_REBUILD_SECONDS, in a background thread while the old index keeps serving.
+    """
+
+    @staticmethod
+    def suggest(prefix, limit=8):
+        TypeaheadService._ensure_fresh()
+        return [
+            {'type': key[0], 'id': key[1], 'label': label, **(payload or {})}
+            for key, label, weight, payload in _index.lookup(prefix, limit)
+        ]
+
+    @staticmethod
+    def rebuild():
+        global _index, _built_at, _pending
+        with _swap_lock:
+            _pending = {'event': set(), 'artist': set()}
+        try:
+            index = PrefixIndex(k=_index.k)
+            for event in TypeaheadService._event_rows(Event.objects.all()):
+                index.add(*event)
+            for artist in TypeaheadService._artist_rows(Artist.objects.all()):
+                index.add(*artist)
+        except Exception:
+            with _swap_lock:
+                _pending = None
+            raise
+        with _swap_lock:
+            _index = index
+            _built_at = time.monotonic()
+            touched, _pending = _pending, None
+        # writes that landed while the rows above were read
+        TypeaheadService.refresh_events(touched['event'])
+        TypeaheadService.refresh_artists(touched['artist'])
+
+    @staticmethod
+    def _touched(kind, ids):
+        """Note ids for the rebuild in progress; False when there is no index to update yet"""
+        with _swap_lock:
+            if _pending is not None:
+                _pending[kind].update(ids)
+            return _built_at is not None
+
+    @staticmethod
+    def refresh_events(event_ids):
+        """Re-read the given events into the index, dropping the ones that no longer exist"""
+        if not event_ids or not TypeaheadService._touched('event', event_ids):
+            return
+        found = set()
+        for key, label, weight, payload in TypeaheadService._event_rows(Event.objects.filter(id__in=event_ids)):
+            found.add(key[1])
+            _index.add(key, label, weight, payload)
+        for event_id in set(event_ids) - found:
+            _index.remove(('event', event_id))
+
+    @staticmethod
+    def refresh_artist(artist_id):
+        TypeaheadService.refresh_artists([artist_id])
+
+    @staticmethod
+    def refresh_artists(artist_ids):
+        """Re-read the given artists into the index, dropping the ones that no longer exist"""
+        if not artist_ids or not TypeaheadService._touched('artist', artist_ids):
+            return
+        found = set()
+        for key, label, weight, payload in TypeaheadService._artist_rows(Artist.objects.filter(id__in=artist_ids)):
+            found.add(key[1])
+            _index.add(key, label, weight, payload)
+        for artist_id in set(artist_ids) - found:
+            _index.remove(('artist', artist_id))
+
+    @staticmethod
+    def _ensure_fresh():
+        """Build the index on first use; once stale, rebuild it in the background and answer from the old one"""
+        if _built_at is None:
+            with _build_lock:
+                if _built_at is None:
+                    TypeaheadService.rebuild()
+            return
+        if time.monotonic() - _built_at < getattr(settings, 'TYPEAHEAD_REBUILD_SECONDS', 600):
+            return
+        if _build_lock.acquire(blocking=False):
+            threading.Thread(target=TypeaheadService._rebuild_in_background, daemon=True).start()
+
+    @staticmethod
+    def _rebuild_in_background():
+        try:
+            TypeaheadService.rebuild()
+        except Exception:
+            logger.exception("Typeahead rebuild failed, serving the previous index")
+        finally:
+            connections.close_all()
+            _build_lock.release()
+
+    @staticmethod
+    def _event_rows(events):
+        # weight: tickets put in baskets, so popular shows surface first
+        events = events.annotate(tickets=Sum('ticket__quantity')).values('id', 'title', 'date', 'tickets')
+        for event in events:
+            yield (('event', event['id']), event['title'], float(event['tickets'] or 0),
+                   {'date': event['date'].isoformat() if event['date'] else None})
+
+    @staticmethod
+    def _artist_rows(artists):
+        for artist in artists.annotate(event_count=Count('events')).values('id', 'name', 'event_count'):
+            yield ('artist', artist['id']), artist['name'], float(artist['event_count']), None
@@ -0,0 +1,73 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from app.models.event import Event
+from app.models.event_details import EventDetails
+from app.models.venue import Venue, normalize_venue_name
+from app.utils import geohash
+
+
+class VenueService:
+    @staticmethod
+    def nearby_events(latitude, longitude, radius_km, limit=20):
+        """
+        Upcoming events at venues within radius_km, nearest first, as [(event, distance_km)].
+        Candidates come from one query over the 3x3 geohash cells around the point and its bounding box,
+        exact distances are checked afterwards.
+        """
+        cells = geohash.covering_cells(latitude, longitude, radius_km)
+        in_cells = Q()
+        for cell in cells:
+            in_cells |= Q(venue__geohash__startswith=cell)
+
+        events = (Event.objects.filter(in_cells, date__gte=timezone.now())
+                  .select_related('venue').with_serializer_relations())
+        min_lat, max_lat, min_lon, max_lon = geohash.bounding_box(latitude, longitude, radius_km)
+        events = events.filter(venue__latitude__range=(min_lat, max_lat))
+        if -180 <= min_lon and max_lon <= 180:
+            events = events.filter(venue__longitude__range=(min_lon, max_lon))
+
+        found = []
+        for event in events:
+            distance = geohash.distance_km(latitude, longitude, event.venue.latitude, event.venue.longitude)
+            if distance <= radius_km:
+                found.append((event, distance))
+        found.sort(key=lambda item: (item[1], item[0].date, item[0].id))
+        return found[:limit]
+
+    @staticmethod
+    def backfill():
+        """
+        Register a venue for every distinct place/venue string and link events to them, spellings that
+        normalize to the same name share one venue. Returns the ids of the events linked.
+        """
+        place_spellings, details_spellings = defaultdict(Counter), defaultdict(Counter)
+        for place in Event.objects.exclude(place__isnull=True).values_list('place', flat=True):
+            place_spellings[normalize_venue_name(place)][place] += 1
+        for venue in EventDetails.objects.exclude(venue__isnull=True).values_list('venue', flat=True):
+            details_spellings[normalize_venue_name(venue)][venue] += 1
+        place_spellings.pop('', None)
+        details_spellings.pop('', None)
+
+        normalized_names = set(place_spellings) | set(details_spellings)
+        venues = {venue.normalized_name: venue
+                  for venue in Venue.objects.filter(normalized_name__in=normalized_names)}
+        for normalized in normalized_names - set(venues):
+            # the most common spelling names the venue
+            names = place_spellings[normalized] + details_spellings[normalized]
+            venues[normalized] = Venue.objects.create(name=names.most_common(1)[0][0].strip())
+
+        # an event's own place wins over the venue written in its details
+        linked = []
+        for spellings, lookup in ((place_spellings, 'place__in'), (details_spellings, 'details__venue__in')):
+            for normalized, names in spellings.items():
+                with transaction.atomic():
+                    ids = list(Event.objects.filter(venue__isnull=True, **{lookup: list(names)})
+                               .values_list('id', flat=True).distinct())
+                    Event.objects.filter(id__in=ids).update(venue=venues[normalized], updated_at=timezone.now(),
+                                                            version=F('version') + 1)
+                linked += ids
+        return sorted(linked)
@@ -0,0 +1,273 @@
+"""
+Change notifications for derived event data.
+
+Writes to events and the data shown with them end up as one `events_changed` signal carrying the affected
+event ids. Activity around events (tickets, orders, reviews, photos, favorites) ends up as
+`event_activity_changed` the same way. Code that writes in bulk (queryset.update, bulk_create) bypasses the
+model signals and sends these itself.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from app.models.artist import Artist
+from app.models.event import Event
+from app.models.event_attachment import EventAttachment
+from app.models.event_details import EventDetails
+from app.models.event_photo import EventPhoto
+from app.models.orders import Order, OrderProduct, Product, Review
+from app.models.ticket import Ticket
+from app.models.user_event_favorite import UserEventFavorite
+from app.services.event_card_service import EventCardService
+from app.services.event_facet_service import EventFacetService
+from app.services.event_page_service import EventPageService
+from app.services.event_search_service import EventSearchService
+from app.services.event_service import EventService
+from app.services.popularity_service import PopularityService
+from app.services.similar_event_service import SimilarEventService
+from app.services.typeahead_service import TypeaheadService
+
+# sent with event_ids=[...]
+events_changed = Signal()
+# sent with event_ids=[...], kind and user_id
+event_activity_changed = Signal()
+
+
+def notify_events_changed(event_ids, sender=Event):
+    event_ids = [event_id for event_id in event_ids if event_id is not None]
+    if event_ids:
+        events_changed.send(sender=sender, event_ids=event_ids)
+
+
+def notify_event_activity(event_ids, kind, sender=Event, user_id=None):
+    """
+    kind is one of 'tickets', 'orders', 'reviews', 'favorites', 'photos', 'products';
+    user_id names the user whose activity it was, when known
+    """
+    event_ids = [event_id for event_id in event_ids if event_id is not None]
+    if event_ids:
+        event_activity_changed.send(sender=sender, event_ids=event_ids, kind=kind, user_id=user_id)
+
+
+_purge = threading.local()
+
+
+@contextmanager
+def purging_events():
+    """Dependents deleted inside the block belong to events being deleted: their rows send no notifications"""
+    previous = getattr(_purge, 'active', False)
+    _purge.active = True
+    try:
+        yield
+    finally:
+        _purge.active = previous
+
+
+def _deleting_events(origin):
+    """True while an event delete cascades into its dependents, whose cards go with it"""
+    if getattr(_purge, 'active', False):
+        return True
+    if isinstance(origin, QuerySet):
+        return origin.model is Event
+    return isinstance(origin, Event)
+
+
+@receiver(post_save, sender=Event)
+def event_saved(sender, instance, **kwargs):
+    notify_events_changed([instance.id])
+
+
+@receiver(post_delete, sender=Event)
+def event_deleted(sender, instance, **kwargs):
+    EventFacetService.invalidate()
+    EventService.invalidate_past_events()
+    EventPageService.invalidate([instance.id])
+    EventService.invalidate_event_payloads([instance.id])
+    EventSearchService.forget(instance.id)
+    TypeaheadService.refresh_events([instance.id])
+
+
+@receiver(m2m_changed, sender=Event.artists.through)
+def event_artists_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._cleared_event_ids = list(instance.events.values_list('id', flat=True))
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        notify_events_changed([instance.id])
+    elif action == 'post_clear':
+        notify_events_changed(getattr(instance, '_cleared_event_ids', []))
+    else:
+        notify_events_changed(pk_set or [])
+
+
+@receiver(post_save, sender=Artist)
+def artist_saved(sender, instance, created, **kwargs):
+    TypeaheadService.refresh_artist(instance.id)
+    if not created:
+        notify_events_changed(list(instance.events.values_list('id', flat=True)))
+
+
+@receiver(pre_delete, sender=Artist)
+def artist_deleting(sender, instance, **kwargs):
+    instance._event_ids = list(instance.events.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Artist)
+def artist_deleted(sender, instance, **kwargs):
+    TypeaheadService.refresh_artist(instance.id)
+    notify_events_changed(getattr(instance, '_event_ids', []))
+
+
+@receiver(post_save, sender=EventDetails)
+@receiver(post_delete, sender=EventDetails)
+def event_details_changed(sender, instance, origin=None, **kwargs):
+    if not _deleting_events(origin):
+        notify_events_changed([instance.event_id])
+
+
+@receiver(post_save, sender=EventAttachment)
+@receiver(post_delete, sender=EventAttachment)
+def event_attachment_changed(sender, instance, origin=None, **kwargs):
+    if not _deleting_events(origin):
+        event_ids = list(EventDetails.objects.filter(id=instance.event_details_id).values_list('event_id', flat=True))
+        EventPageService.invalidate(event_ids)
+        EventService.invalidate_event_payloads(event_ids)
+
+
+ACTIVITY_KINDS = {
+    Ticket: 'tickets',
+    Product: 'products',
+    EventPhoto: 'photos',
+    UserEventFavorite: 'favorites',
+}
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=EventPhoto)
+@receiver(post_delete, sender=EventPhoto)
+@receiver(post_save, sender=UserEventFavorite)
+@receiver(post_delete, sender=UserEventFavorite)
+def event_dependent_changed(sender, instance, origin=None, **kwargs):
+    if not _deleting_events(origin):
+        notify_event_activity([instance.event_id], ACTIVITY_KINDS[sender], sender=sender,
+                              user_id=getattr(instance, 'user_id', None))
+
+
+@receiver(post_save, sender=OrderProduct)
+@receiver(post_delete, sender=OrderProduct)
+def order_product_changed(sender, instance, origin=None, **kwargs):
+    if not _deleting_events(origin):
+        # the view creating the line usually has the product and order loaded already
+        if OrderProduct.product.is_cached(instance):
+            event_ids = [instance.product.event_id]
+        else:
+            event_ids = Product.objects.filter(id=instance.product_id).values_list('event_id', flat=True)
+        if OrderProduct.order.is_cached(instance):
+            user_id = instance.order.user_id
+        else:
+            user_id = Order.objects.filter(id=instance.order_id).values_list('user_id', flat=True).first()
+        notify_event_activity(event_ids, 'orders', sender=sender, user_id=user_id)
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, created, **kwargs):
+    # attaching or detaching a review changes the ratings of the ordered events
+    if not created:
+        notify_event_activity(Product.objects.filter(id__in=instance.lines().values('product_id'))
+                              .values_list('event_id', flat=True).distinct(), 'reviews',
+                              sender=sender)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    if not created:
+        notify_event_activity(Product.objects.filter(orderproduct__order__review=instance)
+                              .values_list('event_id', flat=True).distinct(), 'reviews', sender=sender)
+
+
+@receiver(pre_delete, sender=Review)
+def review_deleting(sender, instance, **kwargs):
+    # orders drop the review with a bulk SET NULL, which sends no signal of its own
+    instance._event_ids = list(Product.objects.filter(orderproduct__order__review=instance)
+                               .values_list('event_id', flat=True).distinct())
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    notify_event_activity(getattr(instance, '_event_ids', []), 'reviews', sender=sender)
+
+
+@receiver(events_changed)
+def refresh_cards(sender, event_ids, **kwargs):
+    EventCardService.refresh(event_ids)
+
+
+@receiver(event_activity_changed)
+def refresh_card_activity(sender, event_ids, kind, **kwargs):
+    EventCardService.refresh_activity(event_ids, kind)
+
+
+@receiver(events_changed)
+def refresh_popularity(sender, event_ids, **kwargs):
+    PopularityService.refresh(event_ids)
+
+
+@receiver(event_activity_changed)
+def refresh_popularity_activity(sender, event_ids, kind, **kwargs):
+    if kind in ('tickets', 'orders', 'favorites'):
+        PopularityService.refresh(event_ids)
+
+
+@receiver(event_activity_changed)
+def refresh_similar_events(sender, event_ids, kind, user_id=None, **kwargs):
+    if kind in ('orders', 'favorites'):
+        SimilarEventService.queue(user_id, event_ids)
+
+
+@receiver(events_changed)
+def invalidate_facets(sender, event_ids, **kwargs):
+    EventFacetService.invalidate()
+
+
+@receiver(events_changed)
+def invalidate_past_events(sender, event_ids, **kwargs):
+    EventService.invalidate_past_events()
+
+
+@receiver(event_activity_changed)
+def invalidate_past_event_reviews(sender, event_ids, kind, **kwargs):
+    if kind in ('orders', 'reviews', 'photos'):
+        EventService.invalidate_past_events()
+
+
+@receiver(events_changed)
+def invalidate_event_payloads(sender, event_ids, **kwargs):
+    EventPageService.invalidate(event_ids)
+    EventService.invalidate_event_payloads(event_ids)
+
+
+@receiver(event_activity_changed)
+def invalidate_event_payload_activity(sender, event_ids, kind, **kwargs):
+    # the page shows no favorite counts, and the caller's own flag is never cached
+    if kind != 'favorites':
+        EventPageService.invalidate(event_ids)
+    # retrieve shows the rating, nothing else of the activity
+    if kind in ('orders', 'reviews', 'photos'):
+        EventService.invalidate_event_payloads(event_ids)
+
+
+@receiver(events_changed)
+def refresh_search(sender, event_ids, **kwargs):
+    EventSearchService.refresh(event_ids)
+
+
+@receiver(events_changed)
+def refresh_typeahead(sender, event_ids, **kwargs):
+    TypeaheadService.refresh_events(event_ids)
@@ -0,0 +1,17 @@
+"""
+Namespaced cache invalidation: keys embed the namespace's generation number, bumping it orphans every
+entry at once (they then expire on their own).
+"""
+from django.core.cache import cache
+
+
+def generation(namespace):
+    return cache.get_or_set(f'{namespace}:generation', 0, None)
+
+
+def bump(namespace):
+    key = f'{namespace}:generation'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
@@ -0,0 +1,155 @@
+import threading
+import time
+
+from django.conf import settings
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the breaker is open"""
+
+    def __init__(self, name, retry_after):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_after:.1f}s")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding calls to an outbound dependency.
+
+    closed    - calls go through, consecutive failures are counted
+    open      - calls fail fast with CircuitOpenError until reset_timeout passes
+    half_open - a limited number of probe calls decide whether to close again
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0, half_open_max_calls=1,
+                 expected_exceptions=(Exception,), clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.expected_exceptions = expected_exceptions
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probes_in_flight = 0
+        self._metrics = {
+            'calls': 0,
+            'successes': 0,
+            'failures': 0,
+            'rejections': 0,
+            'opened': 0,
+        }
+
+    @property
+    def state(self):
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def call(self, func, *args, **kwargs):
+        """Run func through the breaker, raising CircuitOpenError when open"""
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except self.expected_exceptions:
+            self._on_failure()
+            raise
+        except BaseException:
+            self._release_probe()
+            raise
+        self._on_success()
+        return result
+
+    def reset(self):
+        """Force the breaker back to closed"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probes_in_flight = 0
+
+    def metrics(self):
+        """Snapshot of the breaker counters and state"""
+        with self._lock:
+            self._maybe_half_open()
+            data = dict(self._metrics)
+            data.update({
+                'name': self.name,
+                'state': self._state,
+                'consecutive_failures': self._failures,
+            })
+            return data
+
+    def _maybe_half_open(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _before_call(self):
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.OPEN:
+                self._metrics['rejections'] += 1
+                retry_after = self.reset_timeout - (self._clock() - self._opened_at)
+                raise CircuitOpenError(self.name, max(retry_after, 0.0))
+            if self._state == self.HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    self._metrics['rejections'] += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self._probes_in_flight += 1
+            self._metrics['calls'] += 1
+
+    def _on_success(self):
+        with self._lock:
+            self._metrics['successes'] += 1
+            self._failures = 0
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._probes_in_flight = 0
+
+    def _on_failure(self):
+        with self._lock:
+            self._metrics['failures'] += 1
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._trip()
+
+    def _release_probe(self):
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight -= 1
+
+    def _trip(self):
+        if self._state != self.OPEN:
+            self._metrics['opened'] += 1
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probes_in_flight = 0
+
+
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Get the process-wide breaker for a dependency, configured from settings.CIRCUIT_BREAKERS"""
+    breaker = _breakers.get(name)
+    if breaker is not None:
+        return breaker
+
+    with _registry_lock:
+        if name not in _breakers:
+            config = getattr(settings, 'CIRCUIT_BREAKERS', {}).get(name, {})
+            _breakers[name] = CircuitBreaker(name, **config)
+        return _breakers[name]
+
+
+def all_breaker_metrics():
+    """Metrics for every breaker created in this process"""
+    return [breaker.metrics() for breaker in list(_breakers.values())]
@@ -0,0 +1,75 @@
+"""
+Geohash encoding and radius helpers for nearby searches without PostGIS.
+
+Points sharing a geohash prefix lie in the same cell, so an index on the geohash column answers
+"cells around a point" with a handful of prefix range scans.
+"""
+import math
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+
+def encode(latitude, longitude, precision=9):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        span, value = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (span[0] + span[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            span[0] = middle
+        else:
+            span[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """(height, width) of a cell in degrees"""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def precision_for_radius(radius_km, latitude, max_precision=9):
+    """Longest geohash whose cells are at least radius_km in both directions, so 3x3 cells cover the circle"""
+    for precision in range(max_precision, 0, -1):
+        height, width = cell_size(precision)
+        width_km = width * KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01)
+        if height * KM_PER_DEGREE >= radius_km and width_km >= radius_km:
+            return precision
+    return 1
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """Geohash prefixes of the cell holding the point and its eight neighbours"""
+    precision = precision_for_radius(radius_km, latitude)
+    height, width = cell_size(precision)
+    cells = set()
+    for d_lat in (-height, 0, height):
+        for d_lon in (-width, 0, width):
+            lat = min(max(latitude + d_lat, -90.0), 90.0 - 1e-9)
+            lon = (longitude + d_lon + 180.0) % 360.0 - 180.0
+            cells.add(encode(lat, lon, precision))
+    return cells
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lon, max_lon) around the circle, longitudes not wrapped"""
+    d_lat = radius_km / KM_PER_DEGREE
+    d_lon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    return latitude - d_lat, latitude + d_lat, longitude - d_lon, longitude + d_lon
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """Great-circle (haversine) distance"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi, d_lambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,105 @@
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+
+# attributes every LogRecord has; anything else came in through `extra=` and is emitted as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record as one JSON line, including fields passed through `extra=`"""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exc_info'] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of low-level records per logger.
+    rates maps a logger name (or a parent, e.g. 'app.views') to a keep ratio between 0 and 1.
+    Warnings and errors are never sampled out.
+    """
+
+    def __init__(self, rates=None, min_level=logging.WARNING):
+        super().__init__()
+        self.rates = rates or {}
+        self.min_level = min_level
+        self._resolved = {}
+
+    def filter(self, record):
+        if record.levelno >= self.min_level:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+    def _rate_for(self, name):
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            parts = name.split('.')
+            for i in range(len(parts), 0, -1):
+                prefix = '.'.join(parts[:i])
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+            self._resolved[name] = rate
+        return rate
+
+
+class QueueingHandler(logging.handlers.QueueHandler):
+    """
+    Non-blocking handler: the request thread renders the message and puts the record on a bounded queue,
+    a background listener formats it as JSON and writes it to the stream.
+    When the queue is full the record is dropped and counted instead of blocking.
+    """
+
+    def __init__(self, maxsize=10000, stream=None):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.dropped = 0
+        target = logging.StreamHandler(stream or sys.stdout)
+        target.setFormatter(JsonFormatter())
+        self.listener = logging.handlers.QueueListener(self.queue, target, respect_handler_level=False)
+        self.listener.start()
+        self._stopped = False
+
+    def prepare(self, record):
+        # like the stock QueueHandler, render the message here: args may reference objects the request
+        # keeps changing, and tracebacks do not survive the trip to another thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.listener.handlers[0].formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        # logging.shutdown() closes the handler at exit, which flushes what is still queued
+        if not self._stopped:
+            self._stopped = True
+            self.listener.stop()
+        super().close()
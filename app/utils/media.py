@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+
+def media_url(name, request=None):
+    """
+    Absolute URL of a stored file: under MEDIA_BASE_URL when configured (CDN), otherwise on the host the
+    request came in on. Storages that already return absolute URLs are left alone.
+    """
+    if not name:
+        return None
+    url = default_storage.url(name)
+    if url.startswith(('http://', 'https://')):
+        return url
+    base_url = getattr(settings, 'MEDIA_BASE_URL', None)
+    if base_url:
+        return base_url.rstrip('/') + url
+    return request.build_absolute_uri(url) if request is not None else url
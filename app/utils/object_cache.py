@@ -0,0 +1,83 @@
+"""
+Read-through caches of serialized per-object payloads.
+
+Entries are keyed by object id and the object's version, a per-object generation number (see
+cache_generations): invalidating an object bumps its version, so stale payloads are never read again and
+expire on their own. Each cache counts hits and misses in this worker.
+"""
+import threading
+
+from django.core.cache import cache
+
+from app.utils import cache_generations
+
+
+class ObjectCache:
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def version(self, object_id):
+        return cache_generations.generation(f'{self.name}:{object_id}')
+
+    def key(self, object_id, variant=''):
+        return f'{self.name}:{object_id}:v{self.version(object_id)}:{variant}'
+
+    def get_or_build(self, object_id, build, timeout, variant=''):
+        """
+        The cached payload of an object, built with build() on a miss.
+        variant separates payloads of the same object version (e.g. per host); None results are not cached.
+        """
+        key = self.key(object_id, variant)
+        payload = cache.get(key)
+        if payload is not None:
+            self._count('hits')
+            return payload
+
+        self._count('misses')
+        payload = build()
+        if payload is not None:
+            cache.set(key, payload, timeout)
+        return payload
+
+    def invalidate(self, object_ids):
+        object_ids = set(object_ids)
+        for object_id in object_ids:
+            cache_generations.bump(f'{self.name}:{object_id}')
+        self._count('invalidations', len(object_ids))
+
+    def metrics(self):
+        with self._lock:
+            data = dict(self._metrics)
+        lookups = data['hits'] + data['misses']
+        data.update({
+            'name': self.name,
+            'hit_ratio': round(data['hits'] / lookups, 4) if lookups else None,
+        })
+        return data
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            self._metrics[counter] += amount
+
+
+_caches = {}
+_registry_lock = threading.Lock()
+
+
+def get_object_cache(name):
+    """Get the process-wide object cache of a name"""
+    object_cache = _caches.get(name)
+    if object_cache is not None:
+        return object_cache
+
+    with _registry_lock:
+        if name not in _caches:
+            _caches[name] = ObjectCache(name)
+        return _caches[name]
+
+
+def all_object_cache_metrics():
+    """Metrics for every object cache used in this process"""
+    return [object_cache.metrics() for object_cache in list(_caches.values())]
@@ -0,0 +1,69 @@
+"""
+Recurrence rules for event series: daily, weekly (on chosen weekdays) or monthly, every `interval` periods,
+ending after `count` occurrences or on the `until` date. Occurrences keep the local time of day of the
+first one across DST changes.
+"""
+import calendar
+import datetime
+
+from django.utils import timezone
+
+FREQUENCIES = ('daily', 'weekly', 'monthly')
+
+
+def occurrences(start, frequency, interval=1, weekdays=None, count=None, until=None, limit=500):
+    """
+    Datetimes of the rule from start, in order. Raises ValueError for an unbounded rule or one with more than
+    limit occurrences.
+    """
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency '{frequency}', expected one of {', '.join(FREQUENCIES)}")
+    if interval < 1:
+        raise ValueError("interval must be at least 1")
+    if count is None and until is None:
+        raise ValueError("A recurrence needs a count or an until date")
+
+    aware = timezone.is_aware(start)
+    local = timezone.localtime(start) if aware else start
+    time_of_day = local.time().replace(tzinfo=None)
+
+    found = []
+    for day in _days(local.date(), frequency, interval, weekdays):
+        if (until is not None and day > until) or (count is not None and len(found) >= count):
+            break
+        if len(found) >= limit:
+            raise ValueError(f"A series can have at most {limit} occurrences")
+        moment = datetime.datetime.combine(day, time_of_day)
+        found.append(timezone.make_aware(moment, local.tzinfo) if aware else moment)
+    return found
+
+
+def _days(start, frequency, interval, weekdays):
+    if frequency == 'daily':
+        step = datetime.timedelta(days=interval)
+        day = start
+        while True:
+            yield day
+            day += step
+
+    elif frequency == 'weekly':
+        weekdays = sorted(set(weekdays or [start.weekday()]))
+        if any(not 0 <= weekday <= 6 for weekday in weekdays):
+            raise ValueError("weekdays are 0 (Monday) to 6 (Sunday)")
+        week = start - datetime.timedelta(days=start.weekday())
+        while True:
+            for weekday in weekdays:
+                day = week + datetime.timedelta(days=weekday)
+                if day >= start:
+                    yield day
+            week += datetime.timedelta(weeks=interval)
+
+    else:
+        # months without the start's day of month are skipped
+        months = 0
+        while True:
+            year, month = divmod(start.month - 1 + months, 12)
+            year += start.year
+            if start.day <= calendar.monthrange(year, month + 1)[1]:
+                yield datetime.date(year, month + 1, start.day)
+            months += interval
@@ -2,6 +2,7 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from app.models.artist import Artist
+from app.models.versioned import ConcurrentUpdateError
 from app.serializers.artist_serializer import ArtistSerializer
 from app.services.artist_service import ArtistService
 
@@ -49,13 +50,21 @@ class ArtistViewSet(viewsets.ModelViewSet):
         pk = kwargs.get('pk')
         serializer = self.get_serializer(data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-
-        artist = self.artist_service.update_artist(
-            artist_id=pk,
-            name=serializer.validated_data.get('name'),
-            genre=serializer.validated_data.get('genre'),
-            bio=serializer.validated_data.get('bio')
-        )
+        version = request.data.get('version')
+        if version is not None and not str(version).isdigit():
+            return Response({"version": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            artist = self.artist_service.update_artist(
+                artist_id=pk,
+                name=serializer.validated_data.get('name'),
+                genre=serializer.validated_data.get('genre'),
+                bio=serializer.validated_data.get('bio'),
+                version=version
+            )
+        except ConcurrentUpdateError:
+            return Response({"detail": "Artist was changed by someone else, reload it and retry"},
+                            status=status.HTTP_409_CONFLICT)
 
         if not artist:
             return Response({"detail": "Artist not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,30 @@
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from app.services.calendar_service import CalendarService
+
+
+@api_view(['GET'])
+def calendar_feed_url(request):
+    """Get the private iCalendar feed URL of the current user's favorited and purchased events"""
+    token = CalendarService.feed_token(request.user.id)
+    return Response({'url': request.build_absolute_uri(f'/api/calendar/{request.user.id}.ics?token={token}')})
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def calendar_feed(request, user_id):
+    """iCalendar feed of a user's events, authorized by the signed token of its URL; supports If-None-Match"""
+    if CalendarService.user_for_token(request.GET.get('token', '')) != user_id:
+        return HttpResponse(status=404)
+
+    versions, etag = CalendarService.feed_versions(user_id)
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(CalendarService.feed(versions), content_type='text/calendar; charset=utf-8')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
@@ -0,0 +1,9 @@
+from rest_framework import viewsets
+from app.models.event_deletion import EventDeletion
+from app.serializers.event_deletion_serializer import EventDeletionSerializer
+
+
+class EventDeletionViewSet(viewsets.ReadOnlyModelViewSet):
+    """Progress of background event deletions, started by DELETE /api/events/<id>/"""
+    queryset = EventDeletion.objects.all().order_by('-created_at')
+    serializer_class = EventDeletionSerializer
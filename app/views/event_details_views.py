@@ -48,9 +48,8 @@ class EventDetailsViewSet(viewsets.ModelViewSet):
         """Override update to properly handle file uploads"""
         instance = self.get_object()
 
-        # Debug information
-        print(f"Update request content type: {request.content_type}")
-        print(f"Request data keys: {request.data.keys() if hasattr(request.data, 'keys') else 'Not a dict'}")
+        logger.debug("Update request content type: %s, keys: %s", request.content_type,
+                     list(request.data.keys()) if hasattr(request.data, 'keys') else None)
 
         # Handle partial updates correctly
         partial = kwargs.pop('partial', False)
@@ -70,8 +69,7 @@ class EventDetailsViewSet(viewsets.ModelViewSet):
 
     def partial_update(self, request, *args, **kwargs):
         """Handle PATCH requests with files"""
-        logger.info(f"PATCH request content type: {request.content_type}")
-        logger.info(f"PATCH data: {request.data if hasattr(request.data, 'dict') else 'Not a dict'}")
+        logger.debug("PATCH request content type: %s", request.content_type)
 
         # Special handling for file uploads via PATCH
         if request.content_type and 'multipart/form-data' in request.content_type:
@@ -103,27 +101,19 @@ class EventDetailsViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_404_NOT_FOUND
                 )
 
-            # Debug information - print important paths
-            print(f"MEDIA_ROOT: {settings.MEDIA_ROOT}")
-            print(f"PDF relative path: {event_details.rules_pdf.name}")
-
             # Try to access the file using absolute paths
             file_path = os.path.join(settings.MEDIA_ROOT, event_details.rules_pdf.name)
-            print(f"Full file path: {file_path}")
 
             if not os.path.exists(file_path):
-                print(f"File does not exist at: {file_path}")
-
                 # Try alternate path (in case upload_to is causing issues)
                 alt_path = os.path.join(settings.BASE_DIR, 'app', 'event_rules',
                                         os.path.basename(event_details.rules_pdf.name))
-                print(f"Trying alternate path: {alt_path}")
 
                 if os.path.exists(alt_path):
                     file_path = alt_path
-                    print(f"Found file at alternate path: {alt_path}")
+                    logger.info("Rules PDF served from alternate path", extra={'path': alt_path})
                 else:
-                    print(f"File not found at alternate path either: {alt_path}")
+                    logger.warning("Rules PDF missing on disk", extra={'path': file_path, 'alt_path': alt_path})
                     return Response(
                         {"detail": "PDF file not found on disk"},
                         status=status.HTTP_404_NOT_FOUND
@@ -138,16 +128,14 @@ class EventDetailsViewSet(viewsets.ModelViewSet):
                 response['Content-Disposition'] = f'attachment; filename="{event_details.event.title}_rules.pdf"'
                 return response
             except Exception as file_error:
-                print(f"Error reading file: {file_error}")
+                logger.error("Error reading rules PDF %s: %s", file_path, file_error)
                 return Response(
                     {"detail": f"Error reading file: {str(file_error)}"},
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
 
         except Exception as e:
-            import traceback
-            print(f"Error in download_rules: {e}")
-            print(traceback.format_exc())
+            logger.error("Error in download_rules: %s", e, exc_info=True)
             return Response(
                 {"detail": f"Error downloading PDF: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
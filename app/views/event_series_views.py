@@ -0,0 +1,46 @@
+from django.db.models import Prefetch
+from rest_framework import viewsets
+from rest_framework.response import Response
+
+from app.models.event import Event
+from app.models.event_series import EventSeries
+from app.models.user import AppUser
+from app.serializers.event_series_serializer import EventSeriesSerializer
+from app.services.event_series_service import EventSeriesService
+
+
+class EventSeriesViewSet(viewsets.ModelViewSet):
+    """
+    Recurring events. Creating a series generates its occurrences; updates go to the upcoming occurrences,
+    or to all of them with ?include_past=true. Deleting a series keeps its events.
+    Only the creator of a series or an admin may change or delete it.
+    """
+    queryset = EventSeries.objects.prefetch_related(
+        'artists', Prefetch('occurrences', queryset=Event.objects.only('id', 'date', 'series').order_by('date', 'id')),
+    ).order_by('first_date', 'id')
+    serializer_class = EventSeriesSerializer
+
+    def _may_edit(self, request, series):
+        if series.created_by_id == request.user.id:
+            return True
+        app_user = AppUser.objects.filter(user=request.user).first()
+        return app_user is not None and app_user.role == 'admin'
+
+    def update(self, request, *args, **kwargs):
+        if not self._may_edit(request, self.get_object()):
+            return Response({'detail': 'Not authorized'}, status=403)
+        return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        if not self._may_edit(request, self.get_object()):
+            return Response({'detail': 'Not authorized'}, status=403)
+        return super().destroy(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        serializer.instance = EventSeriesService.create_series(self.request.user, **serializer.validated_data)
+
+    def perform_update(self, serializer):
+        changes = dict(serializer.validated_data)
+        artists = changes.pop('artists', None)
+        include_past = self.request.query_params.get('include_past', '').lower() in ('1', 'true')
+        EventSeriesService.update_series(serializer.instance, changes, artists=artists, include_past=include_past)
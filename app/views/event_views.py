@@ -1,5 +1,10 @@
+import codecs
+import datetime
+import hashlib
 import os
 import uuid
+from django.conf import settings
+from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from rest_framework import viewsets
@@ -8,20 +13,45 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from urllib3 import request
 from app.models import Review
-from django.db.models import Count
 from django.utils import timezone
 
+from app.serializers.event_bulk_update_serializer import EventBulkChangesSerializer, EventBulkFilterSerializer
+from app.serializers.event_card_serializer import EventCardSerializer
+from app.serializers.event_deletion_serializer import EventDeletionSerializer
 from app.serializers.event_serializer import EventSerializer
-from app.services.event_service import EventService
+from app.services.calendar_service import CalendarService
+from app.services.event_bulk_update_service import EventBulkUpdateService
+from app.services.event_card_service import EventCardService
+from app.services.event_deletion_service import EventDeletionService
+from app.services.event_service import EventService, PAST_EVENTS_CACHE_NAMESPACE
+from app.services.event_facet_service import EventFacetService
+from app.services.event_import_service import EventImportService
+from app.services.event_page_service import EventPageService
+from app.services.event_search_service import EventSearchService
+from app.services.popularity_service import PopularityService
+from app.services.recommendation_service import RecommendationService
+from app.services.similar_event_service import SimilarEventService
+from app.services.venue_service import VenueService
 from app.models.event import Event
 from app.models.artist import Artist
+from app.models.event_type import EventType
 from app.models.user import AppUser
-from django.utils import timezone
+from app.models.versioned import ConcurrentUpdateError
+from django.db import transaction
 from app.models.ticket import Ticket
+from app.utils import cache_generations
+from app.utils.circuit_breaker import get_breaker, CircuitOpenError
+from app.utils.media import media_url
+import logging
+
+logger = logging.getLogger(__name__)
+
+# largest page of /api/events/cards/
+MAX_CARDS_PAGE = 100
 
 
 class EventViewSet(viewsets.ModelViewSet):
-    queryset = Event.objects.all()
+    queryset = Event.objects.with_serializer_relations()
     serializer_class = EventSerializer
     event_service = EventService()
 
@@ -46,7 +76,7 @@ class EventViewSet(viewsets.ModelViewSet):
         if artist_ids:
             artists = Artist.objects.filter(id__in=artist_ids)
 
-        print(request.data)
+        logger.debug("Create event request: %s", request.data)
         try:
             created_by = AppUser.objects.get(id=user_id)
             event = self.event_service.create_event(
@@ -56,11 +86,11 @@ class EventViewSet(viewsets.ModelViewSet):
             serializer = self.get_serializer(event)
             return Response(serializer.data, status=201)
         except AppUser.DoesNotExist:
-            print("User not found!")
+            logger.info("Create event with unknown user %s", user_id)
             return Response({'error': 'User not found'}, status=400)
 
         except Exception as e:
-            print("Unexpected error:", e)
+            logger.warning("Create event failed: %s", e, exc_info=True)
             return Response({'error': str(e)}, status=400)
 
     @action(detail=True, methods=['put'])
@@ -78,15 +108,22 @@ class EventViewSet(viewsets.ModelViewSet):
         place = request.data.get('place')
         seats_no = request.data.get('seats_no')
         artist_ids = request.data.get('artists')
+        # version the client read, the update is refused with 409 when the event changed since
+        version = request.data.get('version')
+        if version is not None and not str(version).isdigit():
+            return Response({'error': 'version must be an integer'}, status=400)
 
         artists = None
         if artist_ids:
             artists = Artist.objects.filter(id__in=artist_ids)
 
-        event = self.event_service.update_event(
-            pk, title, type, date, price, description,
-            start_hour, end_hour, place, seats_no, artists
-        )
+        try:
+            event = self.event_service.update_event(
+                pk, title, type, date, price, description,
+                start_hour, end_hour, place, seats_no, artists, version
+            )
+        except ConcurrentUpdateError:
+            return Response({'error': 'Event was changed by someone else, reload it and retry'}, status=409)
 
         if event:
             serializer = self.get_serializer(event)
@@ -111,34 +148,94 @@ class EventViewSet(viewsets.ModelViewSet):
 
         return Response(events)
 
+    @action(detail=False, methods=['get'])
+    def cards(self, request):
+        """Catalog cards of events, optionally filtered by date range and type"""
+        try:
+            limit = int(request.query_params.get('limit', 100))
+            offset = int(request.query_params.get('offset', 0))
+        except ValueError:
+            return Response({'error': 'Invalid limit or offset parameter'}, status=400)
+        if limit < 1 or offset < 0:
+            return Response({'error': 'limit must be positive and offset not negative'}, status=400)
+        limit = min(limit, MAX_CARDS_PAGE)
+
+        cards = EventCardService.cards(
+            start_date=request.query_params.get('start_date'),
+            end_date=request.query_params.get('end_date'),
+            event_type=request.query_params.get('type'),
+        )[offset:offset + limit]
+
+        return Response(EventCardSerializer(cards, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """Compact per-day event entries between start and end (YYYY-MM-DD, at most 92 days)"""
+        try:
+            start = datetime.date.fromisoformat(request.query_params['start'])
+            end = datetime.date.fromisoformat(request.query_params['end'])
+            if end < start:
+                raise ValueError('end before start')
+            return Response(CalendarService.days(start, end))
+        except (KeyError, ValueError) as e:
+            return Response({'error': f'Invalid start/end: {e}'}, status=400)
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Event counts per type, place, month, price bucket and artist genre for the given filters"""
+        return Response(EventFacetService.facets(
+            query=request.query_params.get('query', ''),
+            start_date=request.query_params.get('start_date'),
+            end_date=request.query_params.get('end_date'),
+            types=request.query_params.getlist('types'),
+            place=request.query_params.get('place'),
+        ))
+
     def retrieve(self, request, *args, **kwargs):
         """Retrieve a single event by ID with details"""
         pk = kwargs['pk']
-        event_data = self.event_service.get_event(pk)
+        payload = self.event_service.get_event_payload(int(pk)) if str(pk).isdigit() else None
 
-        if event_data:
-            event_serializer = EventSerializer(event_data['event'])
-            event_details = event_data['details']
-
-            return Response({
-                'event': event_serializer.data,
-                'details': {
-                    'location': event_details.location if event_details else None,
-                    'rules': event_details.rules if event_details else None,
-                    'max_attendees': event_details.max_attendees if event_details else None,
-                    'additional_info': event_details.additional_info if event_details else None
-                }
-            })
+        if payload:
+            return Response(payload)
         return Response({"detail": "Event not found"}, status=404)
 
+    def update(self, request, *args, **kwargs):
+        """PUT/PATCH, refused with 409 when the event changed since the version sent (or since it was read)"""
+        version = request.data.get('version')
+        if version is not None and not str(version).isdigit():
+            return Response({'error': 'version must be an integer'}, status=400)
+        try:
+            return super().update(request, *args, **kwargs)
+        except ConcurrentUpdateError:
+            return Response({'error': 'Event was changed by someone else, reload it and retry'}, status=409)
+
+    def perform_update(self, serializer):
+        event = serializer.instance
+        version = int(self.request.data.get('version') or event.version)
+        with transaction.atomic():
+            # the row stays locked until the serializer's save() bumped the version
+            current = Event.objects.select_for_update().filter(id=event.id).values_list('version', flat=True).first()
+            if current != version:
+                raise ConcurrentUpdateError(event, version)
+            serializer.save()
+
+    def destroy(self, request, *args, **kwargs):
+        """Hide the event now and remove it with its tickets, orders and files in the background"""
+        deletion = EventDeletionService.schedule(self.get_object(), request.user)
+        return Response(EventDeletionSerializer(deletion).data, status=202)
+
+    @action(detail=True, methods=['get'])
+    def page(self, request, pk=None):
+        """Everything the event screen shows: event, details, attachments, photos, rating, availability, favorite"""
+        page = EventPageService.page(int(pk), request) if str(pk).isdigit() else None
+        if page is None:
+            return Response({"detail": "Event not found"}, status=404)
+        return Response(page)
+
     @action(detail=False, methods=['get'])
     def past_events_with_reviews(self, request):
         """Endpoint to fetch past events with all available reviews and photos"""
-        from django.utils import timezone
-        import logging
-
-        logger = logging.getLogger(__name__)
-
         query = request.query_params.get('query', '')
         limit = request.query_params.get('limit', None)
 
@@ -148,135 +245,88 @@ class EventViewSet(viewsets.ModelViewSet):
         except ValueError:
             return Response({'error': 'Invalid limit parameter'}, status=400)
 
-        try:
-            current_datetime = timezone.now()
-            logger.info(f"Current datetime: {current_datetime}")
-
-            past_events = Event.objects.filter(date__lt=current_datetime)
-            logger.info(f"Found {past_events.count()} past events")
-
-            if query:
-                past_events = past_events.filter(title__icontains=query)
-                logger.info(f"After query filter: {past_events.count()} events")
-
-            past_events = past_events.order_by('-date')
-
-            if limit:
-                past_events = past_events[:limit]
-
-            events_with_reviews = []
-
-            for event in past_events:
-                logger.info(f"Processing event: {event.id} - {event.title}")
+        # photo URLs are absolute, so responses differ per host
+        key = (f"{PAST_EVENTS_CACHE_NAMESPACE}:{cache_generations.generation(PAST_EVENTS_CACHE_NAMESPACE)}:"
+               f"{request.scheme}://{request.get_host()}:{limit}:{hashlib.sha1(query.encode()).hexdigest()}")
+        payload = cache.get(key)
+        if payload is not None:
+            return Response(payload)
 
-                try:
-                    reviews = Review.objects.filter(
-                        order__orderproduct__product__event=event
-                    ).distinct()
-
-                    logger.info(f"Found {reviews.count()} reviews for event {event.id}")
-
-                    review_data = []
-                    for review in reviews:
-                        review_data.append({
+        try:
+            events_with_reviews = [
+                {
+                    'event': EventSerializer(item['event']).data,
+                    'reviews': [
+                        {
                             'id': review.id,
                             'numberOfStars': review.numberOfStars,
                             'comment': review.comment,
                             'date': review.date,
                             'rating': review.rating
-                        })
-
-                    photos = []
-                    try:
-                        try:
-                            from app.models.event_photo import EventPhoto
-                            event_photos = EventPhoto.objects.filter(event=event).order_by('-uploaded_at')
-                            for photo in event_photos:
-                                photo_url = photo.url
-                                if photo_url and not photo_url.startswith('http'):
-                                    photo_url = f"http://localhost:8000{photo_url}"
-                                elif photo_url and photo_url.startswith('/'):
-                                    photo_url = f"http://localhost:8000{photo_url}"
-
-                                photos.append({
-                                    'id': photo.id,
-                                    'url': photo_url,
-                                    'caption': photo.caption,
-                                    'uploaded_at': photo.uploaded_at.isoformat() if photo.uploaded_at else None
-                                })
-                            logger.info(f"Found {len(photos)} photos for event {event.id} using EventPhoto model")
-
-                        except ImportError:
-                            if hasattr(event, 'photos') and event.photos:
-                                if isinstance(event.photos, str):
-                                    import json
-                                    photos_data = json.loads(event.photos)
-                                elif isinstance(event.photos, list):
-                                    photos_data = event.photos
-                                elif hasattr(event.photos, 'all'):
-                                    photos_data = []
-                                    for photo in event.photos.all():
-                                        photo_url = photo.url if hasattr(photo,
-                                                                         'url') and photo.url else photo.image.url if hasattr(
-                                            photo, 'image') and photo.image else None
-
-                                        if photo_url and not photo_url.startswith('http'):
-                                            photo_url = f"http://localhost:8000{photo_url}"
-                                        elif photo_url and photo_url.startswith('/'):
-                                            photo_url = f"http://localhost:8000{photo_url}"
-
-                                        photos_data.append({
-                                            'id': photo.id,
-                                            'url': photo_url,
-                                            'caption': getattr(photo, 'caption', ''),
-                                            'uploaded_at': getattr(photo, 'uploaded_at', None)
-                                        })
-
-                                for photo_data in photos_data:
-                                    if isinstance(photo_data, dict):
-                                        photo_url = photo_data.get('url', '')
-                                        if photo_url and not photo_url.startswith('http'):
-                                            photo_data['url'] = f"http://localhost:8000{photo_url}"
-                                        elif photo_url and photo_url.startswith('/'):
-                                            photo_data['url'] = f"http://localhost:8000{photo_url}"
-                                        photos.append(photo_data)
-
-                            logger.info(f"Found {len(photos)} photos for event {event.id} using JSON field")
-
-                    except Exception as photo_error:
-                        logger.warning(f"Error loading photos for event {event.id}: {str(photo_error)}")
-                        photos = []
-                    event_serializer = EventSerializer(event)
-
-                    events_with_reviews.append({
-                        'event': event_serializer.data,
-                        'reviews': review_data,
-                        'photos': photos,
-                        'review_count': len(review_data),
-                        'photo_count': len(photos)
-                    })
-
-                except Exception as e:
-                    logger.error(f"Error processing event {event.id}: {str(e)}")
-                    continue
-
-            logger.info(f"Returning {len(events_with_reviews)} events with reviews")
-
-            return Response({
-                'past_events_with_reviews': events_with_reviews,
-                'count': len(events_with_reviews)
-            })
-
+                        }
+                        for review in item['reviews']
+                    ],
+                    'photos': [
+                        {
+                            'id': photo.id,
+                            'url': media_url(photo.image.name, request),
+                            'caption': photo.caption,
+                            'uploaded_at': photo.uploaded_at.isoformat() if photo.uploaded_at else None
+                        }
+                        for photo in item['photos']
+                    ],
+                    'review_count': len(item['reviews']),
+                    'photo_count': len(item['photos'])
+                }
+                for item in self.event_service.get_past_events_with_reviews(query, limit)
+            ]
         except Exception as e:
             logger.error(f"Error in past_events_with_reviews: {str(e)}")
             return Response({'error': f'Internal server error: {str(e)}'}, status=500)
 
+        payload = {
+            'past_events_with_reviews': events_with_reviews,
+            'count': len(events_with_reviews)
+        }
+        cache.set(key, payload, getattr(settings, 'PAST_EVENTS_CACHE_SECONDS', 60))
+        return Response(payload)
+
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        """Change price, date, type, place or seats of every event matching a filter at once (admin only)"""
+        app_user = AppUser.objects.filter(user=request.user).first()
+        if app_user is None or app_user.role != 'admin':
+            return Response({'detail': 'Not authorized'}, status=403)
+
+        filters = EventBulkFilterSerializer(data=request.data.get('filter') or {})
+        changes = EventBulkChangesSerializer(data=request.data.get('changes') or {})
+        if not (filters.is_valid() & changes.is_valid()):
+            return Response({'filter': filters.errors, 'changes': changes.errors}, status=400)
+
+        return Response(EventBulkUpdateService.update(filters.validated_data, changes.validated_data))
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, FormParser])
+    def import_events(self, request):
+        """Bulk import events from an uploaded CSV or JSON Lines file (admin only)"""
+        app_user = AppUser.objects.filter(user=request.user).first()
+        if app_user is None or app_user.role != 'admin':
+            return Response({'detail': 'Not authorized'}, status=403)
+
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'No file provided'}, status=400)
+        format = request.data.get('format') or os.path.splitext(upload.name)[1].lstrip('.').lower()
+        if format not in ('csv', 'jsonl'):
+            return Response({'error': "Unknown file format, pass format=csv or format=jsonl"}, status=400)
+
+        # the upload is decoded and parsed line by line, never read into memory whole
+        lines = codecs.iterdecode(upload, 'utf-8-sig')
+        report = EventImportService.import_rows(EventImportService.read_rows(lines, format), request.user)
+        return Response(report, status=201 if report['created'] else 400)
+
     @action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser])
     def upload_photo(self, request, pk=None):
         """Upload a single photo for a specific event."""
-        import logging
-        logger = logging.getLogger(__name__)
-
         try:
             event = Event.objects.get(id=pk)
             logger.info(f"Found event: {event.id}")
@@ -314,8 +364,13 @@ class EventViewSet(viewsets.ModelViewSet):
             logger.info(f"Saving file to: {file_path}")
 
             try:
-                saved_path = default_storage.save(file_path, ContentFile(photo_file.read()))
+                saved_path = get_breaker('storage').call(
+                    default_storage.save, file_path, ContentFile(photo_file.read())
+                )
                 logger.info(f"File saved successfully to: {saved_path}")
+            except CircuitOpenError as storage_error:
+                logger.warning(f"Storage unavailable: {str(storage_error)}")
+                return Response({'error': 'File storage is temporarily unavailable'}, status=503)
             except Exception as storage_error:
                 logger.error(f"Storage error: {str(storage_error)}")
                 return Response({'error': f'Failed to save file: {str(storage_error)}'}, status=500)
@@ -436,15 +491,11 @@ class EventViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def popular(self, request):
-        """Get most popular events based on ticket sales"""
+        """Get most popular upcoming events based on recent ticket sales, orders and favorites"""
         limit = int(request.query_params.get('limit', 7))
 
-        # Get future events with ticket counts
-        popular_events = Event.objects.filter(
-            date__gte=timezone.now()
-        ).annotate(
-            ticket_count=Count('ticket')
-        ).order_by('-ticket_count', 'date')[:limit]
+        # Read the top of the maintained leaderboard instead of counting tickets per event
+        popular_events = PopularityService.top(limit).with_serializer_relations()
 
         events = [
             {
@@ -455,38 +506,82 @@ class EventViewSet(viewsets.ModelViewSet):
 
         return Response(events)
 
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """Upcoming events bought or favorited by the same customers as this one"""
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            return Response({'error': 'Invalid limit parameter'}, status=400)
+        if limit < 1:
+            return Response({'error': 'limit must be positive'}, status=400)
+        # no more neighbours are stored per event
+        limit = min(limit, getattr(settings, 'SIMILAR_EVENTS_PER_EVENT', 10))
+        neighbours = (SimilarEventService.similar(pk, limit).select_related('similar__rating_summary')
+                      .prefetch_related('similar__artists'))
+
+        return Response([
+            {
+                'event': EventSerializer(neighbour.similar).data,
+                'score': neighbour.score
+            }
+            for neighbour in neighbours
+        ])
+
+    @action(detail=False, methods=['get'])
+    def nearby(self, request):
+        """Upcoming events within radius_km (default 10) of lat/lon, nearest first"""
+        try:
+            latitude = float(request.query_params['lat'])
+            longitude = float(request.query_params['lon'])
+            radius_km = float(request.query_params.get('radius_km', 10))
+            limit = int(request.query_params.get('limit', 20))
+        except (KeyError, ValueError):
+            return Response({'error': 'lat and lon are required numbers'}, status=400)
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or not 0 < radius_km <= 500:
+            return Response({'error': 'Coordinates or radius out of range'}, status=400)
+
+        found = VenueService.nearby_events(latitude, longitude, radius_km, limit)
+        return Response([
+            {
+                'event': EventSerializer(event).data,
+                'venue': {'id': event.venue.id, 'name': event.venue.name,
+                          'latitude': event.venue.latitude, 'longitude': event.venue.longitude},
+                'distance_km': round(distance, 2)
+            }
+            for event, distance in found
+        ])
+
     @action(detail=False, methods=['get'])
     def personalized(self, request):
-        """Get personalized event recommendations based on filters"""
+        """
+        Get personalized event recommendations: events matching the given filters, or without filters the
+        caller's precomputed recommendations (most popular events for new users)
+        """
         limit = int(request.query_params.get('limit', 10))
         event_types = request.query_params.getlist('types')  # e.g., ?types=FESTIVAL&types=CONCERT
         keywords = request.query_params.getlist('keywords')  # e.g., ?keywords=gaga&keywords=bieber
 
+        if not event_types and not keywords:
+            recommended = RecommendationService.recommend(request.user, limit).with_serializer_relations()
+            return Response([{'event': EventSerializer(event).data} for event in recommended])
+
         from django.db.models import Q
 
         # Start with future events
         filters = Q(date__gte=timezone.now())
 
-        # Filter by event types if provided
+        # Filter by event types (names or aliases) if provided, an indexed match on the type id
         if event_types:
-            type_filter = Q()
-            for event_type in event_types:
-                type_filter |= Q(type__icontains=event_type)
-            filters &= type_filter
+            filters &= Q(event_type_id__in=EventType.ids_matching(event_types))
+
+        personalized_events = Event.objects.filter(filters).order_by('date')
 
-        # Filter by keywords in title, description, or artist names
+        # Match any keyword in title, description, place or artist names, best matches first
         if keywords:
-            keyword_filter = Q()
-            for keyword in keywords:
-                keyword_filter |= (
-                    Q(title__icontains=keyword) |
-                    Q(description__icontains=keyword) |
-                    Q(artists__name__icontains=keyword)
-                )
-            filters &= keyword_filter
+            personalized_events = EventSearchService.search(personalized_events, keywords, match_any=True)
 
-        # Get events matching the filters
-        personalized_events = Event.objects.filter(filters).distinct().order_by('date')[:limit]
+        personalized_events = personalized_events.with_serializer_relations()[:limit]
 
         events = [
             {
@@ -0,0 +1,16 @@
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from app.utils.circuit_breaker import all_breaker_metrics
+from app.utils.object_cache import all_object_cache_metrics
+
+
+@api_view(['GET'])
+def circuit_breaker_status(request):
+    """Get state and counters of every circuit breaker in this worker"""
+    return Response(all_breaker_metrics())
+
+
+@api_view(['GET'])
+def object_cache_status(request):
+    """Get hit and miss counters of every object cache in this worker"""
+    return Response(all_object_cache_metrics())
@@ -21,7 +21,7 @@ class LoyaltyProgramViewSet(viewsets.ViewSet):
             if app_user.role != 'admin':
                 return Response({"detail": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
                 
-            members = LoyaltyProgram.objects.all()
+            members = LoyaltyProgram.objects.select_related('user__user')
             serializer = LoyaltyProgramSerializer(members, many=True)
             return Response(serializer.data)
         except AppUser.DoesNotExist:
@@ -2,10 +2,10 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.core.mail import EmailMessage
 from django.shortcuts import get_object_or_404
 from app.views.orders_views import generate_order_pdf
 from app.models import Order
+from app.services.mail_service import MailService
 
 
 @api_view(['POST'])
@@ -20,15 +20,16 @@ def send_ticket_email(request, pk):
     try:
         pdf_buffer = generate_order_pdf(order)
 
-        message = EmailMessage(
+        sent = MailService.send(
             subject=f"Bilet dla zamówienia #{order.id}",
             body="W załączniku znajdziesz swój bilet w formacie PDF.",
-            from_email=None,
-            to=[email]
+            to=[email],
+            attachment=(f"bilet_zamowienie_{order.id}.pdf", pdf_buffer.read(), "application/pdf")
         )
-        message.attach(f"bilet_zamowienie_{order.id}.pdf", pdf_buffer.read(), "application/pdf")
-        message.send()
 
+        if not sent:
+            return Response({'message': 'Email został dodany do kolejki i zostanie wysłany wkrótce'},
+                            status=status.HTTP_202_ACCEPTED)
         return Response({'message': 'Email z załącznikiem został wysłany'})
     except Exception as e:
-        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
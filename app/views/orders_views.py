@@ -6,6 +6,7 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 import logging
 from app.models.orders import OrderProduct
@@ -20,6 +21,7 @@ from app.serializers.orders_serializer import (
 )
 from app.models.ticket import Ticket
 from app.serializers.ticket_serializer import TicketSerializer
+from app.services.rating_summary_service import RatingSummaryService
 
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
@@ -67,7 +69,7 @@ def generate_order_pdf(order):
     y -= 20
 
     p.setFont("Lato", 12)
-    for op in order.orderproduct_set.all():
+    for op in order.lines().select_related('product'):
         product_info = f"{op.quantity} x {op.product.description}: {op.product.price} $"
         if y < 50:
             p.showPage()
@@ -99,7 +101,7 @@ class OrderViewSet(viewsets.ViewSet):
         if app_user.role != 'admin':
             return Response({"detail": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
 
-        orders = Order.objects.all()
+        orders = Order.objects.with_serializer_relations()
         serializer = OrderSerializer(orders, many=True)
         return Response(serializer.data)
 
@@ -144,7 +146,15 @@ class OrderViewSet(viewsets.ViewSet):
         if order.user_id != app_user.id and app_user.role != 'admin':
             return Response({"detail": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
 
-        order.delete()
+        review = order.review
+        with transaction.atomic():
+            # read the rated events while the order lines still exist
+            if review is not None:
+                RatingSummaryService.remove(RatingSummaryService.order_event_ids(order),
+                                            RatingSummaryService.stars(review))
+            order.delete()
+            if review is not None:
+                review.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=False, methods=['get'], url_path='user/(?P<user_id>[^/.]+)')
@@ -155,7 +165,7 @@ class OrderViewSet(viewsets.ViewSet):
             return Response({"detail": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
 
         target_app_user = get_object_or_404(AppUser, pk=user_id)
-        orders = Order.objects.filter(user=target_app_user.user)
+        orders = Order.objects.with_serializer_relations().filter(user=target_app_user.user)
         serializer = OrderSerializer(orders, many=True)
         return Response(serializer.data)
 
@@ -165,8 +175,16 @@ class OrderViewSet(viewsets.ViewSet):
         product_id = request.data.get('product_id')
         quantity = request.data.get('quantity', 1)
 
-        product = get_object_or_404(Product, pk=product_id)
-        order_product = OrderProduct.objects.create(order=order, product=product, quantity=quantity)
+        product = get_object_or_404(Product.objects.select_related('event'), pk=product_id)
+        if product.event is not None and product.event.deleted_at is not None:
+            return Response({"detail": "The event of this product was deleted"}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            # an existing review now also rates the event of the new product
+            # before the line is written: its signal refreshes the event card from the summary
+            reviewed = RatingSummaryService.order_event_ids(order) if order.review is not None else None
+            if reviewed is not None and product.event_id is not None and product.event_id not in reviewed:
+                RatingSummaryService.add([product.event_id], RatingSummaryService.stars(order.review))
+            order_product = OrderProduct.objects.create(order=order, product=product, quantity=quantity)
 
         return Response({
             "message": "Product added to order",
@@ -179,7 +197,7 @@ class OrderViewSet(viewsets.ViewSet):
     def me(self, request):
         """GET /orders/me/ — lista zamówień zalogowanego użytkownika"""
         app_user = get_object_or_404(AppUser, user=request.user)
-        orders = Order.objects.filter(user_id=app_user.id)
+        orders = Order.objects.with_serializer_relations().filter(user_id=app_user.id)
         serializer = OrderSerializer(orders, many=True)
         return Response(serializer.data)
 
@@ -201,10 +219,14 @@ class OrderViewSet(viewsets.ViewSet):
             review_serializer = ReviewSerializer(data=review_data)
 
             if review_serializer.is_valid():
-                review = review_serializer.save()
+                with transaction.atomic():
+                    review = review_serializer.save()
+                    # before the order is saved: its signal refreshes the event cards from the summaries
+                    RatingSummaryService.add(RatingSummaryService.order_event_ids(order),
+                                             RatingSummaryService.stars(review))
 
-                order.review = review
-                order.save()
+                    order.review = review
+                    order.save()
 
                 return Response(ReviewSerializer(review).data, status=status.HTTP_201_CREATED)
             else:
@@ -228,10 +250,15 @@ class OrderViewSet(viewsets.ViewSet):
             return Response({"detail": "Order has no review to update"}, status=status.HTTP_400_BAD_REQUEST)
 
         review_data = request.data
+        old_stars = RatingSummaryService.stars(order.review)
         review_serializer = ReviewSerializer(order.review, data=review_data, partial=True)
 
         if review_serializer.is_valid():
-            review = review_serializer.save()
+            new_stars = int(review_serializer.validated_data.get('numberOfStars', order.review.numberOfStars))
+            with transaction.atomic():
+                # before the review is saved: its signal refreshes the event cards from the summaries
+                RatingSummaryService.change(RatingSummaryService.order_event_ids(order), old_stars, new_stars)
+                review = review_serializer.save()
             return Response(ReviewSerializer(review).data)
 
         return Response(review_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -249,9 +276,12 @@ class OrderViewSet(viewsets.ViewSet):
             return Response({"detail": "Order has no review to delete"}, status=status.HTTP_400_BAD_REQUEST)
 
         review = order.review
-        order.review = None
-        order.save()
-        review.delete()
+        with transaction.atomic():
+            RatingSummaryService.remove(RatingSummaryService.order_event_ids(order),
+                                        RatingSummaryService.stars(review))
+            order.review = None
+            order.save()
+            review.delete()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -7,9 +7,16 @@ from datetime import datetime, timedelta
 import random
 from decimal import Decimal
 from app.models.event import Event
+from app.models.event_type import EventType
 from app.models.orders import Order, OrderProduct
+from app.services.feature_flag_service import FeatureFlagService
 
-USE_SYNTHETIC_DATA = True
+SYNTHETIC_DATA_FLAG = 'use_synthetic_data'
+
+
+def use_synthetic_data():
+    """Whether statistics endpoints serve synthetic data, shared by all workers"""
+    return FeatureFlagService.is_enabled(SYNTHETIC_DATA_FLAG, default=True)
 
 
 @api_view(['GET'])
@@ -23,7 +30,7 @@ def event_statistics(request):
     timeframe = request.GET.get('timeframe', 'all')
     event_type = request.GET.get('event_type', 'all')
 
-    if USE_SYNTHETIC_DATA:
+    if use_synthetic_data():
         return Response(generate_synthetic_statistics(timeframe, event_type))
 
     try:
@@ -46,7 +53,7 @@ def event_statistics(request):
                 events_queryset = events_queryset.filter(date__gte=start_date)
 
         if event_type != 'all':
-            events_queryset = events_queryset.filter(type=event_type)
+            events_queryset = events_queryset.filter(event_type_id__in=EventType.ids_matching([event_type]))
 
         total_events = events_queryset.count()
 
@@ -88,7 +95,7 @@ def top_selling_events(request):
     """Get top selling events"""
     limit = int(request.GET.get('limit', 10))
 
-    if USE_SYNTHETIC_DATA:
+    if use_synthetic_data():
         return Response(generate_synthetic_top_selling_events(limit))
 
     events = Event.objects.annotate(
@@ -117,7 +124,7 @@ def monthly_trends(request):
     """Get monthly trends for the current year"""
     year = request.GET.get('year', timezone.now().year)
 
-    if USE_SYNTHETIC_DATA:
+    if use_synthetic_data():
         return Response(generate_synthetic_monthly_trends())
 
     return Response(generate_synthetic_monthly_trends())  # Fallback for now
@@ -126,10 +133,10 @@ def monthly_trends(request):
 @api_view(['GET'])
 def event_type_distribution(request):
     """Get distribution of events by type"""
-    if USE_SYNTHETIC_DATA:
+    if use_synthetic_data():
         return Response(generate_synthetic_event_type_distribution())
 
-    distribution = Event.objects.values('type').annotate(
+    distribution = Event.objects.values('event_type_id', 'event_type__code').annotate(
         count=Count('id'),
         tickets=Sum('products__orderproduct__quantity')
     ).order_by('-count')
@@ -143,7 +150,7 @@ def event_type_distribution(request):
         tickets = item['tickets'] or 0
         percentage = (tickets / total_tickets * 100) if total_tickets > 0 else 0
         result.append({
-            'type': item['type'],
+            'type': item['event_type__code'],
             'tickets': tickets,
             'percentage': round(percentage, 1),
             'color': colors[i % len(colors)]
@@ -155,21 +162,21 @@ def event_type_distribution(request):
 @api_view(['POST'])
 def toggle_data_source(request):
     """Toggle between synthetic and real data"""
-    global USE_SYNTHETIC_DATA
-    USE_SYNTHETIC_DATA = not USE_SYNTHETIC_DATA
+    enabled = FeatureFlagService.toggle(SYNTHETIC_DATA_FLAG, default=True)
 
     return Response({
-        'use_synthetic_data': USE_SYNTHETIC_DATA,
-        'message': f'Switched to {"synthetic" if USE_SYNTHETIC_DATA else "real"} data'
+        'use_synthetic_data': enabled,
+        'message': f'Switched to {"synthetic" if enabled else "real"} data'
     })
 
 
 @api_view(['GET'])
 def data_source_status(request):
     """Get current data source status"""
+    enabled = use_synthetic_data()
     return Response({
-        'use_synthetic_data': USE_SYNTHETIC_DATA,
-        'message': f'Currently using {"synthetic" if USE_SYNTHETIC_DATA else "real"} data'
+        'use_synthetic_data': enabled,
+        'message': f'Currently using {"synthetic" if enabled else "real"} data'
     })
 
 
@@ -0,0 +1,23 @@
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from app.services.typeahead_service import TypeaheadService
+
+
+@api_view(['GET'])
+def suggest(request):
+    """
+    Autocomplete for the search box
+    Query params:
+    - q: typed prefix
+    - limit: number of suggestions, at most 10
+    """
+    prefix = request.GET.get('q', '')
+    try:
+        limit = int(request.GET.get('limit', 8))
+    except ValueError:
+        return Response({'error': 'Invalid limit parameter'}, status=400)
+    limit = max(1, min(limit, 10))
+
+    if not prefix.strip():
+        return Response([])
+    return Response(TypeaheadService.suggest(prefix, limit))
@@ -0,0 +1,166 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from app.models import (
+    AppUser, Artist, Event, EventPhoto, LoyaltyProgram, Order, OrderProduct, Product, Review, Ticket, Venue, Voucher,
+)
+from app.models.user_event_favorite import UserEventFavorite
+from app.services.feature_flag_service import FeatureFlagService
+from app.utils import geohash
+
+
+class QueryBudgetTestCase(APITestCase):
+    """
+    Every endpoint must run the same, bounded number of queries whether the tables hold N or 10 x N rows.
+    Runs against the local test database: python manage.py test --settings=tsa_backend.test_settings
+    """
+    N = 3
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='budget', password='pass')
+        self.app_user = AppUser.objects.create(user=self.user, role='admin', first_name='B', last_name='Q')
+        self.client.force_authenticate(self.user)
+        self.seeded = 0
+        FeatureFlagService.invalidate()
+
+    def tearDown(self):
+        FeatureFlagService.invalidate()
+
+    def seed(self, n):
+        now = timezone.now()
+        for i in range(self.seeded, self.seeded + n):
+            artist = Artist.objects.create(name=f'Artist {i}', genre='Rock')
+            past = Event.objects.create(title=f'Past {i}', type='CONCERT', date=now - timedelta(days=i + 1),
+                                        price=50, place='Hall', created_by=self.user)
+            future = Event.objects.create(title=f'Future {i}', type='CONCERT', date=now + timedelta(days=i + 1),
+                                          price=50, place='Hall', created_by=self.user)
+            past.artists.add(artist)
+            future.artists.add(artist)
+
+            product = Product.objects.create(price=50, description='Ticket', event=past)
+            review = Review.objects.create(numberOfStars='5', comment='Great', rating=5)
+            order = Order.objects.create(user=self.user, price=100, review=review, phoneNumber='123',
+                                         email='b@example.com', city='Warsaw', address='Main St')
+            OrderProduct.objects.create(order=order, product=product, quantity=2)
+            EventPhoto.objects.create(event=past, image=f'event_photos/photo_{i}.png')
+
+            Ticket.objects.create(user=self.user, event=future, seat=f'A{i}', quantity=1)
+            UserEventFavorite.objects.create(user=self.user, event=future, is_favorite=True)
+            Voucher.objects.create(code=f'GIFT-{i:08d}', amount=10, initial_amount=10,
+                                   expires_at=now + timedelta(days=30), owner=self.app_user)
+
+            member = User.objects.create(username=f'member{i}')
+            LoyaltyProgram.objects.create(user=AppUser.objects.create(user=member, first_name='M', last_name=str(i)))
+        self.seeded += n
+
+    def count_queries(self, url):
+        # warm up in-process caches and indexes, the budget is about steady-state requests
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', response))
+        return len(context.captured_queries)
+
+    def assertQueryBudget(self, url, budget):
+        url = url.format(self=self)
+        self.seed(self.N)
+        small = self.count_queries(url)
+        self.seed(9 * self.N)
+        large = self.count_queries(url)
+
+        self.assertEqual(small, large, f"{url} query count grows with data: {small} -> {large}")
+        self.assertLessEqual(large, budget, f"{url} runs {large} queries, budget is {budget}")
+
+
+class EventQueryBudgetTest(QueryBudgetTestCase):
+    def test_events_list(self):
+        self.assertQueryBudget('/api/events/', 3)
+
+    @override_settings(EVENT_CACHE_SECONDS=0)
+    def test_events_retrieve(self):
+        self.seed(1)
+        self.assertQueryBudget(f'/api/events/{Event.objects.first().id}/', 3)
+
+    def test_events_retrieve_cached(self):
+        self.seed(1)
+        self.assertQueryBudget(f'/api/events/{Event.objects.first().id}/', 0)
+
+    @override_settings(EVENT_PAGE_CACHE_SECONDS=0)
+    def test_event_page(self):
+        self.seed(1)
+        self.assertQueryBudget(f'/api/events/{Event.objects.first().id}/page/', 6)
+
+    def test_event_page_cached(self):
+        self.seed(1)
+        self.assertQueryBudget(f'/api/events/{Event.objects.first().id}/page/', 1)
+
+    def test_event_cards(self):
+        self.assertQueryBudget('/api/events/cards/?limit=1000', 1)
+
+    def test_similar_events(self):
+        self.seed(1)
+        event = Event.objects.filter(title__startswith='Future').first()
+        self.assertQueryBudget(f'/api/events/{event.id}/similar/?limit=1000', 2)
+
+    def test_nearby_events(self):
+        self.seed(1)
+        Venue.objects.filter(normalized_name='hall').update(latitude=50.06, longitude=19.94,
+                                                            geohash=geohash.encode(50.06, 19.94))
+        self.assertQueryBudget('/api/events/nearby/?lat=50.07&lon=19.95&radius_km=5&limit=1000', 2)
+
+    def test_events_calendar(self):
+        start, end = timezone.now().date(), timezone.now().date() + timedelta(days=60)
+        self.assertQueryBudget(f'/api/events/calendar/?start={start}&end={end}', 1)
+
+    def test_events_popular(self):
+        self.assertQueryBudget('/api/events/popular/?limit=1000', 2)
+
+    def test_events_personalized(self):
+        self.assertQueryBudget('/api/events/personalized/?limit=1000&types=CONCERT&keywords=Future', 2)
+
+    def test_events_recommended(self):
+        self.assertQueryBudget('/api/events/personalized/?limit=1000', 2)
+
+    @override_settings(PAST_EVENTS_CACHE_SECONDS=0)
+    def test_past_events_with_reviews(self):
+        self.assertQueryBudget('/api/events/past_events_with_reviews/', 4)
+
+    def test_user_favorites(self):
+        self.assertQueryBudget('/api/events/favorites/user/{self.app_user.id}/', 3)
+
+
+class OrderQueryBudgetTest(QueryBudgetTestCase):
+    def test_orders_list(self):
+        self.assertQueryBudget('/api/orders/', 5)
+
+    def test_user_orders(self):
+        self.assertQueryBudget('/api/orders/user/{self.app_user.id}/', 7)
+
+
+class AccountQueryBudgetTest(QueryBudgetTestCase):
+    def test_user_vouchers(self):
+        self.assertQueryBudget('/api/vouchers/user/', 3)
+
+    def test_loyalty_program_list(self):
+        self.assertQueryBudget('/api/loyalty-program/', 2)
+
+
+class StatisticsQueryBudgetTest(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        FeatureFlagService.set_flag('use_synthetic_data', False)
+
+    def test_event_statistics(self):
+        self.assertQueryBudget('/api/events/statistics/', 6)
+
+    def test_top_selling_events(self):
+        self.assertQueryBudget('/api/events/statistics/top-selling/', 2)
+
+    def test_event_type_distribution(self):
+        self.assertQueryBudget('/api/events/statistics/type-distribution/', 2)
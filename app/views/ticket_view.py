@@ -6,7 +6,9 @@ from app.services.ticket_service import TicketService
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from app.models import Ticket
-import traceback
+import logging
+
+logger = logging.getLogger(__name__)
 
 class BasketView(APIView):
     permission_classes = [IsAuthenticated]
@@ -18,18 +20,18 @@ class BasketView(APIView):
 
             return Response(serializer.data)
         except Exception as e:
-            print("BASKET GET ERROR:", e)
+            logger.error("Basket get failed for user %s", request.user.id, exc_info=True)
             return Response({"error": str(e)}, status=500)
 
     def post(self, request):
-        print("DANE Z REQUESTU:", request.data)
+        logger.debug("Basket add request: %s", request.data, extra={'user_id': request.user.id})
         serializer = TicketSerializer(data=request.data)
         if serializer.is_valid():
-            print("SERIALIZER OK, dodajemy do koszyka")
             ticket = serializer.save(user=request.user)
+            logger.info("Ticket added to basket", extra={'user_id': request.user.id, 'ticket_id': ticket.id})
             return Response(TicketSerializer(ticket).data)
 
-        print("SERIALIZER ERRORS:", serializer.errors)
+        logger.info("Invalid basket add: %s", serializer.errors, extra={'user_id': request.user.id})
         return Response(serializer.errors, status=400)
 
     def delete(self, request, pk):
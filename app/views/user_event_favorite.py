@@ -79,8 +79,7 @@ class UserEventFavoriteViewSet(viewsets.ViewSet):
         try:
             appUser = AppUser.objects.get(pk=user_id)
             user = appUser.user
-            favorites = UserEventFavorite.objects.filter(user=user)
-            event_ids = [favorite.event.id for favorite in favorites]
+            event_ids = list(UserEventFavorite.objects.filter(user=user).values_list('event_id', flat=True))
             return Response(event_ids, status=200)
         except User.DoesNotExist:
             return Response({"detail": "User not found."}, status=400)
\ No newline at end of file
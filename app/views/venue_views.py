@@ -0,0 +1,33 @@
+from rest_framework import viewsets
+from rest_framework.response import Response
+from app.models.user import AppUser
+from app.models.venue import Venue
+from app.serializers.venue_serializer import VenueSerializer
+
+
+class VenueViewSet(viewsets.ModelViewSet):
+    """
+    Venue registry, coordinates set here make a venue's events show up in nearby searches.
+    Anyone signed in can read it; only admins create, edit or delete venues.
+    """
+    queryset = Venue.objects.all().order_by('name')
+    serializer_class = VenueSerializer
+
+    def _is_admin(self, request):
+        app_user = AppUser.objects.filter(user=request.user).first()
+        return app_user is not None and app_user.role == 'admin'
+
+    def create(self, request, *args, **kwargs):
+        if not self._is_admin(request):
+            return Response({'detail': 'Not authorized'}, status=403)
+        return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        if not self._is_admin(request):
+            return Response({'detail': 'Not authorized'}, status=403)
+        return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        if not self._is_admin(request):
+            return Response({'detail': 'Not authorized'}, status=403)
+        return super().destroy(request, *args, **kwargs)
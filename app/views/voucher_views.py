@@ -13,6 +13,9 @@ from app.serializers.voucher_serializer import (
     VoucherApplySerializer
 )
 from app.services.voucher_service import VoucherService
+import logging
+
+logger = logging.getLogger(__name__)
 
 class VoucherViewSet(viewsets.ModelViewSet):
     queryset = Voucher.objects.all()
@@ -36,32 +39,24 @@ class VoucherViewSet(viewsets.ModelViewSet):
         try:
             # Get user_id from the associated AppUser model
             user = request.user
-            print(f"Getting vouchers for user {user.username} (ID: {user.id})")
             
             try:
                 appuser = user.appuser
-                print(f"AppUser found: {appuser.id} ({appuser.first_name} {appuser.last_name})")
             except Exception as e:
-                print(f"Error getting AppUser: {e}")
+                logger.warning("AppUser not found for user %s: %s", user.id, e)
                 return Response({'error': 'User profile not found'}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Get all vouchers to debug
-            all_vouchers = Voucher.objects.all()
-            print(f"Total vouchers in system: {all_vouchers.count()}")
-            for v in all_vouchers:
-                print(f"Voucher ID: {v.id}, Code: {v.code}, Owner: {v.owner_id}")
-            
             user_id = appuser.id
             vouchers = self.voucher_service.get_user_vouchers(user_id)
-            print(f"Found {len(vouchers)} vouchers for user {user_id}")
+            logger.debug("Listing vouchers", extra={'user_id': user_id})
             
             serializer = self.get_serializer(vouchers, many=True)
             return Response(serializer.data)
         except ValidationError as e:
-            print(f"Validation error: {e}")
+            logger.info("Validation error listing vouchers: %s", e)
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            print(f"Unexpected error: {e}")
+            logger.error("Unexpected error listing vouchers: %s", e, exc_info=True)
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=False, methods=['post'])
@@ -69,42 +64,39 @@ class VoucherViewSet(viewsets.ModelViewSet):
         """Purchase a new voucher"""
         serializer = VoucherPurchaseSerializer(data=request.data)
         if not serializer.is_valid():
-            print(f"Invalid purchase data: {serializer.errors}")
+            logger.info("Invalid purchase data: %s", serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
             
         try:
             # Get user_id from the associated AppUser model
             user = request.user
-            print(f"Purchasing voucher for user {user.username} (ID: {user.id})")
             
             try:
                 appuser = user.appuser
-                print(f"AppUser found: {appuser.id} ({appuser.first_name} {appuser.last_name})")
             except Exception as e:
-                print(f"Error getting AppUser: {e}")
+                logger.warning("AppUser not found for user %s: %s", user.id, e)
                 return Response({'error': 'User profile not found'}, status=status.HTTP_400_BAD_REQUEST)
             
             user_id = appuser.id
             amount = serializer.validated_data['amount']
             currency_code = serializer.validated_data.get('currency_code', 'USD')
             
-            print(f"Creating voucher: amount={amount}, currency={currency_code}")
-            
             voucher = self.voucher_service.purchase_voucher(
                 user_id=user_id,
                 amount=amount,
                 currency_code=currency_code
             )
             
-            print(f"Voucher created successfully: ID={voucher.id}, Code={voucher.code}")
+            logger.info("Voucher purchased", extra={'user_id': user_id, 'voucher_id': voucher.id,
+                                                    'amount': amount, 'currency': currency_code})
             
             result_serializer = self.get_serializer(voucher)
             return Response(result_serializer.data, status=status.HTTP_201_CREATED)
         except ValidationError as e:
-            print(f"Validation error: {e}")
+            logger.info("Validation error purchasing voucher: %s", e)
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            print(f"Unexpected error: {e}")
+            logger.error("Unexpected error purchasing voucher: %s", e, exc_info=True)
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=False, methods=['get'])
@@ -139,7 +131,7 @@ class VoucherViewSet(viewsets.ModelViewSet):
                 appuser = request.user.appuser
                 user_id = appuser.id
             except Exception as e:
-                print(f"Error getting AppUser: {e}")
+                logger.warning("AppUser not found for user %s: %s", request.user.id, e)
                 return Response({'error': 'User profile not found'}, status=status.HTTP_400_BAD_REQUEST)
             
             # Check if the user already has this voucher code
@@ -164,7 +156,7 @@ class VoucherViewSet(viewsets.ModelViewSet):
         except ValidationError as e:
             return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            print(f"Unexpected error in redeem endpoint: {e}")
+            logger.error("Unexpected error in redeem endpoint: %s", e, exc_info=True)
             return Response({'success': False, 'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=True, methods=['post'])
@@ -192,22 +184,22 @@ class VoucherViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def apply(self, request):
         """Apply a voucher to a purchase"""
-        print(f"Apply voucher request data: {request.data}")
+        logger.debug("Apply voucher request data: %s", request.data)
         
         serializer = VoucherApplySerializer(data=request.data)
         if not serializer.is_valid():
-            print(f"Invalid apply data: {serializer.errors}")
+            logger.info("Invalid apply data: %s", serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
             
         try:
-            print(f"Applying voucher ID: {serializer.validated_data['voucher_id']}, Amount: {serializer.validated_data['amount']}")
-            
             result = self.voucher_service.apply_voucher_to_purchase(
                 voucher_id=serializer.validated_data['voucher_id'],
                 purchase_amount=serializer.validated_data['amount']
             )
             
-            print(f"Voucher application result: {result}")
+            logger.info("Voucher applied", extra={'voucher_id': serializer.validated_data['voucher_id'],
+                                                  'amount_used': result['amount_used'],
+                                                  'remaining': result['remaining']})
             
             voucher_serializer = self.get_serializer(result['voucher'])
             return Response({
@@ -217,10 +209,8 @@ class VoucherViewSet(viewsets.ModelViewSet):
                 'voucher': voucher_serializer.data
             })
         except ValidationError as e:
-            print(f"Validation error in apply voucher: {e}")
+            logger.info("Validation error in apply voucher: %s", e)
             return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            print(f"Unexpected error in apply voucher: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Unexpected error in apply voucher: %s", e, exc_info=True)
             return Response({'success': False, 'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR) 
\ No newline at end of file
@@ -5,9 +5,14 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
 django.setup()
 
 import unittest
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 from app.services.artist_service import ArtistService
 from app.models.artist import Artist
+from app.models.versioned import ConcurrentUpdateError
 
 class ArtistServiceTest(TestCase):
     def setUp(self):
@@ -74,6 +79,29 @@ class ArtistServiceTest(TestCase):
         self.assertEqual(updated_artist.genre, "New Genre")
         self.assertEqual(updated_artist.bio, "New bio.")
 
+    def test_update_checks_version_and_writes_changed_columns(self):
+        artist = self.service.create_artist(name="Quartet", genre="Jazz", bio="A long biography.")
+
+        with CaptureQueriesContext(connection) as context:
+            updated = self.service.update_artist(artist_id=artist.id, name="Quintet", genre="Jazz", version=1)
+        updates = [q['sql'] for q in context.captured_queries if q['sql'].startswith('UPDATE "app_artist"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"bio"', updates[0])
+        self.assertNotIn('"genre"', updates[0])
+        self.assertEqual(updated.version, 2)
+
+        with self.assertRaises(ConcurrentUpdateError):
+            self.service.update_artist(artist_id=artist.id, name="Trio", version=1)
+        self.assertEqual(Artist.objects.get(id=artist.id).name, "Quintet")
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='editor', password='123'))
+        response = client.put(f'/api/artists/{artist.id}/', {'name': 'Trio', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, 409)
+        response = client.put(f'/api/artists/{artist.id}/', {'name': 'Trio', 'version': 2}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['version'], 3)
+
     def test_update_nonexistent_artist(self):
         result = self.service.update_artist(artist_id=9999, name="Ghost Artist")
         self.assertIsNone(result)
@@ -0,0 +1,64 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from datetime import date, datetime, time, timezone as dt_timezone
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from app.models.event import Event
+from app.models.user_event_favorite import UserEventFavorite
+from app.services.calendar_service import CalendarService
+
+
+class CalendarServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='planner', password='123')
+
+        def event(title, day, **extra):
+            return Event.objects.create(title=title, type='CONCERT', price=10, created_by=self.user,
+                                        date=datetime(2030, 3, day, 18, tzinfo=dt_timezone.utc), **extra)
+
+        self.first = event('Opening, Night; Live', 1, place='Hall', start_hour=time(19), end_hour=time(1))
+        self.second = event('Encore', 1)
+        self.later = event('Later', 20)
+        UserEventFavorite.objects.create(user=self.user, event=self.first, is_favorite=True)
+
+    def test_days_in_one_query(self):
+        with self.assertNumQueries(1):
+            days = CalendarService.days(date(2030, 3, 1), date(2030, 3, 10))
+        self.assertEqual([day['date'] for day in days], ['2030-03-01'])
+        self.assertEqual([entry['title'] for entry in days[0]['events']], ['Opening, Night; Live', 'Encore'])
+
+    def test_feed_renders_escaped_events_and_caches_blocks(self):
+        versions, etag = CalendarService.feed_versions(self.user.id)
+        body = CalendarService.feed(versions)
+        self.assertIn('SUMMARY:Opening\\, Night\\; Live\r\n', body)
+        self.assertIn('DTSTART:20300301T190000Z\r\nDTEND:20300302T010000Z\r\n', body)
+        self.assertNotIn('Encore', body)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(CalendarService.feed(versions), body)
+
+        self.first.title = 'Renamed'
+        self.first.save()
+        new_versions, new_etag = CalendarService.feed_versions(self.user.id)
+        self.assertNotEqual(new_etag, etag)
+        self.assertIn('SUMMARY:Renamed', CalendarService.feed(new_versions))
+
+    def test_feed_view_uses_token_and_etag(self):
+        url = f'/api/calendar/{self.user.id}.ics?token={CalendarService.feed_token(self.user.id)}'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(self.client.get(f'/api/calendar/{self.user.id}.ics?token=forged').status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
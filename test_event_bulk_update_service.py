@@ -0,0 +1,85 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from app.models.event import Event
+from app.models.event_type import EventType
+from app.models.venue import Venue
+from app.models.event_card import EventCard
+from app.models.user import AppUser
+from app.services.event_bulk_update_service import EventBulkUpdateService
+
+
+class EventBulkUpdateServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ops', password='123')
+        self.date = datetime(2030, 7, 1, 20, tzinfo=dt_timezone.utc)
+
+        def event(title, type, price):
+            return Event.objects.create(title=title, type=type, date=self.date, price=price, created_by=self.user)
+
+        self.rock = event('Rock A', 'CONCERT', Decimal('100.00'))
+        self.rock_cheap = event('Rock B', 'concert', Decimal('5.00'))
+        self.play = event('Play', 'THEATRE', Decimal('40.00'))
+
+    def prices(self):
+        return dict(Event.objects.values_list('title', 'price'))
+
+    def test_relative_price_change_in_one_update(self):
+        with CaptureQueriesContext(connection) as context:
+            result = EventBulkUpdateService.update({'types': ['Concert']}, {'price_change': Decimal('-10')})
+        self.assertEqual(result, {'matched': 2, 'updated': 2})
+        updates = [q['sql'] for q in context.captured_queries if q['sql'].startswith('UPDATE "app_event" ')]
+        self.assertEqual(len(updates), 1)
+
+        self.assertEqual(self.prices(), {'Rock A': Decimal('90.00'), 'Rock B': Decimal('0.00'),
+                                         'Play': Decimal('40.00')})
+        # caches and read models hear about the change
+        self.assertEqual(EventCard.objects.get(event=self.rock).price, Decimal('90.00'))
+
+    def test_percent_date_shift_and_type(self):
+        EventBulkUpdateService.update({'ids': [self.rock.id, self.play.id]},
+                                      {'price_percent': Decimal('12.5'), 'shift_days': 2, 'shift_minutes': 30,
+                                       'type': 'festival'})
+        self.rock.refresh_from_db()
+        self.assertEqual(self.rock.price, Decimal('112.50'))
+        self.assertEqual(self.rock.date, self.date + timedelta(days=2, minutes=30))
+        self.assertEqual((self.rock.type, self.rock.event_type.code), ('FESTIVAL', 'FESTIVAL'))
+        self.rock_cheap.refresh_from_db()
+        self.assertEqual(self.rock_cheap.date, self.date)
+
+    def test_no_match_creates_no_type_or_venue(self):
+        result = EventBulkUpdateService.update({'title_contains': 'Opera'}, {'type': 'Opera', 'place': 'Opera House'})
+        self.assertEqual(result, {'matched': 0, 'updated': 0})
+        self.assertFalse(EventType.objects.filter(code='OPERA').exists())
+        self.assertFalse(Venue.objects.exists())
+
+    def test_admin_endpoint_validates(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        AppUser.objects.create(user=self.user, role='admin', first_name='O', last_name='P')
+
+        self.assertEqual(client.post('/api/events/bulk_update/', {'filter': {}, 'changes': {'price': '1'}},
+                                     format='json').status_code, 400)
+        self.assertEqual(client.post('/api/events/bulk_update/', {
+            'filter': {'all': True}, 'changes': {'price': '1', 'price_change': '2'}}, format='json').status_code, 400)
+
+        response = client.post('/api/events/bulk_update/', {'filter': {'title_contains': 'rock'},
+                                                            'changes': {'seats_no': 300}}, format='json')
+        self.assertEqual(response.data, {'matched': 2, 'updated': 2})
+        self.assertEqual(set(Event.objects.filter(seats_no=300).values_list('title', flat=True)),
+                         {'Rock A', 'Rock B'})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from datetime import timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APIClient
+from app.models.artist import Artist
+from app.models.event import Event
+from app.models.event_card import EventCard
+from app.models.event_details import EventDetails
+from app.models.event_photo import EventPhoto
+from app.models.orders import Order, OrderProduct, Product, Review
+from app.models.ticket import Ticket
+from app.models.user_event_favorite import UserEventFavorite
+from app.services.event_card_service import EventCardService
+from app.services.rating_summary_service import RatingSummaryService
+
+
+class EventCardServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='carder', password='123')
+        self.event = Event.objects.create(title='Open Air', type='FESTIVAL', date=timezone.now() + timedelta(days=3),
+                                          price=120, place='Park', seats_no=10, created_by=self.user)
+
+    def card(self):
+        return EventCard.objects.get(event=self.event)
+
+    def test_card_follows_write_paths(self):
+        self.assertEqual(self.card().title, 'Open Air')
+        self.assertEqual(self.card().seats_left, 10)
+
+        self.event.artists.add(Artist.objects.create(name='Zebra'), Artist.objects.create(name='Alpha'))
+        EventDetails.objects.create(event=self.event, venue='Main Stage')
+        Ticket.objects.create(user=self.user, event=self.event, quantity=3)
+        UserEventFavorite.objects.create(user=self.user, event=self.event, is_favorite=True)
+        EventPhoto.objects.create(event=self.event, image='event_photos/cover.png')
+        product = Product.objects.create(price=80, description='Early bird', event=self.event)
+        order = Order.objects.create(user=self.user, price=80, phoneNumber='1', email='a@example.com',
+                                     city='Krakow', address='Main St')
+        OrderProduct.objects.create(order=order, product=product)
+        # the way the review endpoints do it: summary first, then the write whose signal refreshes the card
+        RatingSummaryService.add([self.event.id], 4)
+        order.review = Review.objects.create(numberOfStars='4', comment='Good', rating=4)
+        order.save()
+
+        card = self.card()
+        self.assertEqual(card.artist_names, ['Alpha', 'Zebra'])
+        self.assertEqual(card.venue, 'Main Stage')
+        self.assertEqual(card.min_price, 80)
+        self.assertEqual((card.tickets_sold, card.seats_left, card.favorite_count), (3, 7, 1))
+        self.assertEqual((card.average_rating, card.review_count), (4.0, 1))
+        self.assertEqual(card.cover_photo, 'event_photos/cover.png')
+
+        RatingSummaryService.remove([self.event.id], 4)
+        order.review.delete()
+        self.assertEqual((self.card().average_rating, self.card().review_count), (None, 0))
+
+    def test_deleting_event_drops_card(self):
+        Ticket.objects.create(user=self.user, event=self.event, quantity=1)
+        self.event.delete()
+        self.assertFalse(EventCard.objects.exists())
+
+    def test_refresh_rebuilds_missing_cards(self):
+        EventCard.objects.all().delete()
+        EventCardService.refresh()
+        self.assertEqual(list(EventCardService.cards(event_type='FESTIVAL').values_list('event_id', flat=True)),
+                         [self.event.id])
+
+    def test_cards_endpoint_validates_paging(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/api/events/cards/', {'offset': -1}).status_code, 400)
+        self.assertEqual(client.get('/api/events/cards/', {'limit': -5}).status_code, 400)
+        response = client.get('/api/events/cards/', {'limit': 10 ** 6})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
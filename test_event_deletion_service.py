@@ -0,0 +1,138 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from datetime import timedelta
+from unittest import mock
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from rest_framework.test import APIClient
+from app.models.event import Event
+from app.models.event_attachment import EventAttachment
+from app.models.event_card import EventCard
+from app.models.event_deletion import EventDeletion
+from app.models.event_details import EventDetails
+from app.models.event_photo import EventPhoto
+from app.models.orders import Order, OrderProduct, Product
+from app.models.ticket import Ticket
+from app.models.user import AppUser
+from app.models.user_event_favorite import UserEventFavorite
+from app.services.event_deletion_service import EventDeletionService
+
+
+class EventDeletionServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='organizer', password='123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.event = Event.objects.create(title='Farewell Tour', type='CONCERT', date=timezone.now(), price=50,
+                                          created_by=self.user)
+        self.other = Event.objects.create(title='Opening Night', type='CONCERT', date=timezone.now(), price=40,
+                                          created_by=self.user)
+
+        details = EventDetails.objects.create(event=self.event, venue='Arena')
+        self.attachment = EventAttachment(event_details=details, title='Map')
+        self.attachment.file.save('map.pdf', ContentFile(b'%PDF'), save=True)
+        self.photo = EventPhoto(event=self.event)
+        self.photo.image.save('stage.png', ContentFile(b'png'), save=True)
+
+        product = Product.objects.create(price=50, description='Ticket', event=self.event)
+        self.order = Order.objects.create(user=self.user, price=250, phoneNumber='1', email='a@example.com',
+                                          city='Krakow', address='Main St')
+        for _ in range(5):
+            OrderProduct.objects.create(order=self.order, product=product)
+            Ticket.objects.create(user=self.user, event=self.event)
+        UserEventFavorite.objects.create(user=self.user, event=self.event, is_favorite=True)
+        Ticket.objects.create(user=self.user, event=self.other)
+
+    def tearDown(self):
+        for name in (self.attachment.file.name, self.photo.image.name):
+            if default_storage.exists(name):
+                default_storage.delete(name)
+
+    def test_delete_hides_event_at_once(self):
+        response = self.client.delete(f'/api/events/{self.event.id}/')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'pending')
+
+        self.assertEqual(self.client.get(f'/api/events/{self.event.id}/').status_code, 404)
+        self.assertFalse(Event.objects.filter(id=self.event.id).exists())
+        self.assertFalse(EventCard.objects.filter(event_id=self.event.id).exists())
+        # nothing removed yet
+        self.assertTrue(Event.all_objects.filter(id=self.event.id).exists())
+        self.assertEqual(Ticket.objects.filter(event_id=self.event.id).count(), 5)
+
+    def test_job_removes_dependents_in_chunks_and_files(self):
+        deletion = EventDeletionService.schedule(self.event, self.user)
+        with CaptureQueriesContext(connection) as context:
+            EventDeletionService.run_pending(chunk_size=2)
+        deletion.refresh_from_db()
+
+        self.assertEqual(deletion.status, 'done')
+        self.assertEqual(deletion.progress['tickets'], {'total': 5, 'deleted': 5})
+        self.assertEqual(deletion.progress['order_products'], {'total': 5, 'deleted': 5})
+        self.assertEqual(deletion.progress['files'], {'deleted': 2, 'failed': 0})
+        # one transaction per chunk of 2
+        ticket_deletes = [q for q in context.captured_queries if q['sql'].startswith('DELETE FROM "app_ticket"')]
+        self.assertEqual(len(ticket_deletes), 3)
+
+        self.assertFalse(Event.all_objects.filter(id=self.event.id).exists())
+        self.assertFalse(default_storage.exists(self.attachment.file.name))
+        self.assertFalse(default_storage.exists(self.photo.image.name))
+        self.assertTrue(Order.objects.filter(id=self.order.id).exists())
+        self.assertEqual(Ticket.objects.filter(event=self.other).count(), 1)
+
+        response = self.client.get(f'/api/event-deletions/{deletion.id}/')
+        self.assertEqual(response.data['status'], 'done')
+
+    def test_failed_run_is_retried(self):
+        deletion = EventDeletionService.schedule(self.event, self.user)
+        with mock.patch.object(Ticket.objects, 'filter', side_effect=RuntimeError('lock timeout')):
+            EventDeletionService.run(deletion)
+        self.assertEqual((deletion.status, deletion.last_error), ('pending', 'lock timeout'))
+        self.assertEqual(deletion.progress['photos']['deleted'], 1)
+
+        EventDeletionService.run(deletion)
+        self.assertEqual(deletion.status, 'done')
+        self.assertEqual(deletion.progress['photos'], {'total': 1, 'deleted': 1})
+        self.assertFalse(Event.all_objects.filter(id=self.event.id).exists())
+
+    def test_stale_running_job_is_taken_over(self):
+        deletion = EventDeletionService.schedule(self.event, self.user)
+        busy = EventDeletionService.schedule(self.other, self.user)
+        stale = timezone.now() - EventDeletionService.CLAIM_TIMEOUT - timedelta(minutes=1)
+        EventDeletion.objects.filter(id=deletion.id).update(status='running', attempts=1, claimed_at=stale)
+        EventDeletion.objects.filter(id=busy.id).update(status='running', attempts=1, claimed_at=timezone.now())
+
+        self.assertEqual(EventDeletionService.run_pending(), {'done': 1, 'failed': 0, 'remaining': 0})
+        deletion.refresh_from_db()
+        busy.refresh_from_db()
+        self.assertEqual((deletion.status, deletion.attempts), ('done', 2))
+        self.assertEqual(busy.status, 'running')
+
+        EventDeletion.objects.filter(id=busy.id).update(attempts=EventDeletionService.MAX_ATTEMPTS, claimed_at=stale)
+        EventDeletionService.run_pending()
+        busy.refresh_from_db()
+        self.assertEqual(busy.status, 'failed')
+
+    def test_products_of_deleted_events_cannot_be_ordered(self):
+        AppUser.objects.create(user=self.user, first_name='O', last_name='R')
+        product = Product.objects.get(event=self.event)
+        EventDeletionService.schedule(self.event, self.user)
+        response = self.client.post(f'/api/orders/{self.order.id}/add-product/', {'product_id': product.id})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(OrderProduct.objects.filter(order=self.order).count(), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from datetime import datetime, timezone as dt_timezone
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from app.models.artist import Artist
+from app.models.event import Event
+from app.services.event_facet_service import EventFacetService
+
+
+class EventFacetServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='facets', password='123')
+        rock = Artist.objects.create(name='Rockers', genre='Rock')
+        jazz = Artist.objects.create(name='Jazzers', genre='Jazz')
+
+        def event(title, event_type, month, price, place, *artists):
+            created = Event.objects.create(title=title, type=event_type, price=price, place=place, created_by=user,
+                                           date=datetime(2030, month, 10, tzinfo=dt_timezone.utc))
+            created.artists.add(*artists)
+
+        event('Rock Night', 'CONCERT', 5, 40, 'Hall', rock)
+        event('Double Bill', 'CONCERT', 5, 120, 'Hall', rock, jazz)
+        event('Jazz Fest', 'FESTIVAL', 6, 250, 'Park', jazz)
+
+    def counts(self, result, facet):
+        return {item['value']: item['count'] for item in result[facet]}
+
+    def test_counts_every_facet_in_one_query(self):
+        with self.assertNumQueries(1):
+            result = EventFacetService.facets()
+
+        self.assertEqual(self.counts(result, 'type'), {'CONCERT': 2, 'FESTIVAL': 1})
+        self.assertEqual(self.counts(result, 'place'), {'Hall': 2, 'Park': 1})
+        self.assertEqual(self.counts(result, 'month'), {'2030-05': 2, '2030-06': 1})
+        self.assertEqual([item['value'] for item in result['price']], ['0-50', '100-200', '200+'])
+        self.assertEqual(self.counts(result, 'genre'), {'Rock': 2, 'Jazz': 2})
+
+    def test_filters_and_cache(self):
+        result = EventFacetService.facets(types=['concert '], query='night')
+        self.assertEqual(self.counts(result, 'type'), {'CONCERT': 1})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(EventFacetService.facets(types=['CONCERT'], query='Night'), result)
+
+        Event.objects.filter(title='Rock Night').first().delete()
+        self.assertEqual(self.counts(EventFacetService.facets(types=['CONCERT'], query='night'), 'type'), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import io
+import json
+import unittest
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIClient
+from app.models.artist import Artist
+from app.models.event import Event
+from app.models.event_card import EventCard
+from app.models.user import AppUser
+from app.services.event_import_service import EventImportService
+
+CSV = """title,type,date,price,place,seats_no,artists
+Spring Gig,concert,2030-04-01T20:00:00Z,45.50,Blue Hall,200,Known Band|New Band
+Broken Row,concert,not a date,10,,,
+Summer Gig,Koncert,2030-06-01T20:00:00Z,60,Blue Hall,,New Band
+"""
+
+
+class EventImportServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='promoter', password='123')
+        self.known = Artist.objects.create(name='Known Band')
+
+    def test_csv_import_upserts_artists_in_chunks(self):
+        rows = EventImportService.read_rows(io.StringIO(CSV), 'csv')
+        report = EventImportService.import_rows(rows, self.user, chunk_size=1)
+
+        self.assertEqual((report['rows'], report['created'], report['failed'], report['artists_created']),
+                         (3, 2, 1, 1))
+        self.assertEqual(report['errors'][0]['line'], 3)
+        self.assertIn('date', report['errors'][0]['error'])
+
+        spring = Event.objects.get(title='Spring Gig')
+        self.assertEqual(spring.type, 'CONCERT')
+        self.assertEqual(spring.venue.name, 'Blue Hall')
+        self.assertEqual(sorted(spring.artists.values_list('name', flat=True)), ['Known Band', 'New Band'])
+        self.assertEqual(Artist.objects.filter(name='New Band').count(), 1)
+        self.assertIn(self.known, Event.objects.get(title='Spring Gig').artists.all())
+        # bulk writes still reach the read models
+        self.assertEqual(EventCard.objects.get(event=spring).artist_names, ['Known Band', 'New Band'])
+
+    def test_jsonl_reports_bad_lines(self):
+        lines = [json.dumps({'title': 'Jazz', 'date': '2030-05-01T19:00:00Z', 'price': 20, 'artists': ['Trio']}),
+                 '{not json', '', json.dumps(['not', 'an', 'object'])]
+        report = EventImportService.import_rows(EventImportService.read_rows(lines, 'jsonl'), self.user)
+        self.assertEqual(report['created'], 1)
+        self.assertEqual([error['line'] for error in report['errors']], [2, 4])
+
+    def test_admin_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        upload = SimpleUploadedFile('season.csv', CSV.encode())
+
+        self.assertEqual(client.post('/api/events/import/', {'file': upload}).status_code, 403)
+
+        AppUser.objects.create(user=self.user, role='admin', first_name='P', last_name='R')
+        upload.seek(0)
+        response = client.post('/api/events/import/', {'file': upload})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2)
+        self.assertIsNotNone(response.data['rows_per_second'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from rest_framework.test import APIClient
+from app.models.event import Event
+from app.models.event_attachment import EventAttachment
+from app.models.event_details import EventDetails
+from app.models.event_photo import EventPhoto
+from app.models.ticket import Ticket
+from app.models.user_event_favorite import UserEventFavorite
+
+
+class EventPageServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='visitor', password='123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.event = Event.objects.create(title='Festival', type='FESTIVAL', date=timezone.now(), price=80,
+                                          seats_no=3, created_by=self.user)
+        self.details = EventDetails.objects.create(event=self.event, venue='Park', rules='No glass')
+        EventPhoto.objects.create(event=self.event, image='event_photos/stage.png', caption='Stage')
+        Ticket.objects.create(user=self.user, event=self.event, quantity=2)
+
+    def page(self):
+        response = self.client.get(f'/api/events/{self.event.id}/page/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_page_assembles_event_screen(self):
+        page = self.page()
+        self.assertEqual(page['event']['title'], 'Festival')
+        self.assertEqual(page['details']['id'], self.details.id)
+        self.assertEqual(page['photos'][0]['url'], 'http://testserver/media/event_photos/stage.png')
+        self.assertEqual(page['availability'], {'seats_no': 3, 'tickets_sold': 2, 'seats_left': 1,
+                                                'sold_out': False})
+        self.assertEqual(page['event']['rating']['count'], 0)
+        self.assertFalse(page['is_favorite'])
+
+    def test_cached_public_part_follows_changes(self):
+        self.page()
+        UserEventFavorite.objects.create(user=self.user, event=self.event, is_favorite=True)
+        Ticket.objects.create(user=self.user, event=self.event, quantity=1)
+        attachment = EventAttachment(event_details=self.details, title='Map')
+        attachment.file.save('map.pdf', ContentFile(b'%PDF'), save=True)
+
+        page = self.page()
+        self.assertTrue(page['is_favorite'])
+        self.assertTrue(page['availability']['sold_out'])
+        self.assertEqual([a['title'] for a in page['details']['attachments']], ['Map'])
+        attachment.file.delete(save=False)
+
+    def test_missing_event(self):
+        self.assertEqual(self.client.get('/api/events/0/page/').status_code, 404)
+
+    def test_retrieve_reads_existing_detail_fields(self):
+        response = self.client.get(f'/api/events/{self.event.id}/')
+        self.assertEqual(response.data['details']['location'], 'Park')
+        self.assertEqual(response.data['details']['max_attendees'], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
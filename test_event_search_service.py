@@ -0,0 +1,72 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from app.models.artist import Artist
+from app.models.event import Event
+from app.services.event_search_service import EventSearchService, InvertedIndex
+
+
+class InvertedIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = InvertedIndex()
+        self.index.add(1, {'title': 'Jazz w Łodzi', 'artists': '', 'place': 'Łódź', 'description': ''})
+        self.index.add(2, {'title': 'Rock night', 'artists': 'Jazzmen', 'place': '', 'description': 'jazz too'})
+
+    def test_prefix_and_accent_folding(self):
+        self.assertEqual([event_id for event_id, score in self.index.search(['lodz'])], [1])
+        self.assertEqual([event_id for event_id, score in self.index.search(['ŁÓD'])], [1])
+
+    def test_title_match_ranks_above_other_fields(self):
+        self.assertEqual([event_id for event_id, score in self.index.search(['jazz'])], [1, 2])
+
+    def test_all_words_must_match(self):
+        self.assertEqual(self.index.search(['rock lodz']), [])
+        self.assertEqual([event_id for event_id, score in self.index.search(['rock', 'lodz'], match_any=True)],
+                         [1, 2])
+
+    def test_remove(self):
+        self.index.remove(1)
+        self.assertEqual(self.index.search(['lodz']), [])
+
+
+class EventSearchServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='searcher', password='123')
+
+    def create_event(self, title, description='', place=None):
+        return Event.objects.create(title=title, type='CONCERT', date=timezone.now(), price=10,
+                                    description=description, place=place, created_by=self.user)
+
+    def test_build_tsquery(self):
+        self.assertEqual(EventSearchService.build_tsquery(['Café Noir']), '(cafe:* & noir:*)')
+        self.assertEqual(EventSearchService.build_tsquery(['a', 'b'], match_any=True), '(a:*) | (b:*)')
+
+    def test_search_follows_event_and_artist_changes(self):
+        event = self.create_event('Summer Festival')
+        other = self.create_event('Winter Gala', description='A summer memory')
+        artist = Artist.objects.create(name='Dawid Podsiadło')
+
+        found = EventSearchService.search(Event.objects.all(), 'summ')
+        self.assertEqual(list(found), [event, other])
+
+        event.artists.add(artist)
+        self.assertEqual(list(EventSearchService.search(Event.objects.all(), 'podsiadlo')), [event])
+
+        artist.name = 'Sanah'
+        artist.save()
+        self.assertEqual(list(EventSearchService.search(Event.objects.all(), 'podsiadlo')), [])
+        self.assertEqual(list(EventSearchService.search(Event.objects.all(), 'sanah')), [event])
+
+        event.delete()
+        self.assertEqual(list(EventSearchService.search(Event.objects.all(), 'summer')), [other])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import datetime
+import unittest
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APIClient
+from app.models.artist import Artist
+from app.models.event import Event
+from app.models.event_series import EventSeries
+from app.models.event_card import EventCard
+from app.models.event_details import EventDetails
+from app.models.orders import Product
+from app.services.event_series_service import EventSeriesService
+from app.utils import recurrence
+
+
+class RecurrenceTest(unittest.TestCase):
+    def test_weekly_on_weekdays(self):
+        start = datetime.datetime(2030, 1, 1, 19, 30)  # a Tuesday
+        dates = recurrence.occurrences(start, 'weekly', weekdays=[1, 4], count=4)
+        self.assertEqual([d.day for d in dates], [1, 4, 8, 11])
+        self.assertTrue(all(d.time() == datetime.time(19, 30) for d in dates))
+
+    def test_monthly_skips_short_months_and_stops_at_until(self):
+        dates = recurrence.occurrences(datetime.datetime(2030, 1, 31, 20), 'monthly',
+                                       until=datetime.date(2030, 5, 31))
+        self.assertEqual([d.month for d in dates], [1, 3, 5])
+
+    def test_rejects_unbounded_and_oversized_rules(self):
+        with self.assertRaises(ValueError):
+            recurrence.occurrences(datetime.datetime(2030, 1, 1), 'daily')
+        with self.assertRaises(ValueError):
+            recurrence.occurrences(datetime.datetime(2030, 1, 1), 'daily', count=20, limit=10)
+
+
+class EventSeriesServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='producer', password='123')
+        self.lead = Artist.objects.create(name='Lead')
+        self.understudy = Artist.objects.create(name='Understudy')
+        self.series = EventSeriesService.create_series(
+            self.user, artists=[self.lead], title='Hamlet', type='theatre', place='Old Stage', price=Decimal('80'),
+            rules='No photos', first_date=timezone.now() - datetime.timedelta(days=2), frequency='daily', count=6,
+        )
+
+    def test_occurrences_generated_with_relations(self):
+        events = Event.objects.filter(series=self.series)
+        self.assertEqual(events.count(), 6)
+        self.assertEqual(Event.artists.through.objects.filter(event__series=self.series, artist=self.lead).count(), 6)
+        self.assertEqual(Product.objects.filter(event__series=self.series, price=80).count(), 6)
+        self.assertEqual(EventDetails.objects.filter(event__series=self.series, rules='No photos').count(), 6)
+        self.assertEqual(EventCard.objects.filter(event__series=self.series).count(), 6)
+        self.assertEqual(events.first().venue.name, 'Old Stage')
+
+    def test_edit_reaches_upcoming_occurrences_only(self):
+        with CaptureQueriesContext(connection) as context:
+            updated = EventSeriesService.update_series(self.series, {'title': 'Hamlet (revival)', 'price': 90},
+                                                       artists=[self.understudy])
+        self.assertEqual(len(updated), 3)
+        event_updates = [q['sql'] for q in context.captured_queries if q['sql'].startswith('UPDATE "app_event" ')]
+        self.assertEqual(len(event_updates), 1)
+
+        upcoming = Event.objects.filter(id__in=updated)
+        self.assertEqual(set(upcoming.values_list('title', flat=True)), {'Hamlet (revival)'})
+        self.assertEqual(Product.objects.filter(event__in=upcoming, price=90).count(), 3)
+        self.assertEqual(set(Product.objects.filter(event__in=upcoming).values_list('description', flat=True)),
+                         {'Ticket: Hamlet (revival)'})
+        self.assertEqual(set(Event.artists.through.objects.filter(event__in=upcoming)
+                             .values_list('artist_id', flat=True)), {self.understudy.id})
+        self.assertEqual(Event.objects.filter(series=self.series, title='Hamlet').count(), 3)
+        self.assertEqual(set(EventCard.objects.filter(event__in=upcoming).values_list('title', flat=True)),
+                         {'Hamlet (revival)'})
+
+    def test_api(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post('/api/event-series/', {
+            'title': 'Residency', 'type': 'CONCERT', 'price': '30', 'artists': [self.lead.id],
+            'first_date': '2030-02-01T21:00:00Z', 'frequency': 'weekly', 'count': 4,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(len(response.data['occurrences']), 4)
+
+        series_id = response.data['id']
+        self.assertEqual(client.patch(f'/api/event-series/{series_id}/', {'count': 10},
+                                      format='json').status_code, 400)
+        response = client.patch(f'/api/event-series/{series_id}/', {'place': 'Jazz Club'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(Event.objects.filter(series_id=series_id).values_list('place', flat=True)),
+                         {'Jazz Club'})
+
+        client.force_authenticate(User.objects.create_user(username='stranger', password='123'))
+        self.assertEqual(client.patch(f'/api/event-series/{series_id}/', {'place': 'Garage'},
+                                      format='json').status_code, 403)
+        self.assertEqual(client.delete(f'/api/event-series/{series_id}/').status_code, 403)
+        self.assertTrue(EventSeries.objects.filter(id=series_id).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
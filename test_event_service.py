@@ -5,12 +5,22 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
 django.setup()
 
 import unittest
-from django.test import TestCase
+from datetime import timedelta
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.utils import timezone
+from rest_framework.test import APIClient
 from app.services.event_service import EventService
 from app.models.event import Event
 from app.models.artist import Artist
+from app.models.event_photo import EventPhoto
+from app.models.orders import Order, OrderProduct, Product, Review
+from app.models.event_details import EventDetails
+from app.models.versioned import ConcurrentUpdateError
+from app.utils.media import media_url
+from app.utils.object_cache import get_object_cache
 
 
 class EventServiceTest(TestCase):
@@ -110,6 +120,95 @@ class EventServiceTest(TestCase):
         result = self.service.update_event(event_id=999, title="Ghost")
         self.assertIsNone(result)
 
+    def test_update_event_refuses_stale_version(self):
+        event = Event.objects.create(title='Gig', type='Concert', date=timezone.now(), price=20,
+                                     description='Long description', created_by=self.user)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.put(f'/api/events/{event.id}/update_event/', {'title': 'Gig II', 'price': '20',
+                                                                             'version': 1}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['version'], 2)
+        update = [q['sql'] for q in context.captured_queries if q['sql'].startswith('UPDATE "app_event" ')][0]
+        self.assertNotIn('"description"', update)
+        self.assertNotIn('"price"', update)
+
+        response = client.put(f'/api/events/{event.id}/update_event/', {'title': 'Gig III', 'version': 1},
+                              format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Event.objects.get(id=event.id).title, 'Gig II')
+
+        # a change of artists alone is checked and bumps the version too
+        with self.assertRaises(ConcurrentUpdateError):
+            self.service.update_event(event.id, artists=[self.artist], version=1)
+        self.assertEqual(self.service.update_event(event.id, artists=[self.artist], version=2).version, 3)
+
+    def test_plain_save_and_patch_bump_the_stored_version(self):
+        event = Event.objects.create(title='Gig', type='Concert', date=timezone.now(), price=20,
+                                     created_by=self.user)
+        stale = Event.objects.get(id=event.id)
+        event.title = 'Gig II'
+        event.save()
+        self.assertEqual(event.version, 2)
+        stale.price = 25
+        stale.save()
+        self.assertEqual(stale.version, 3)
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.patch(f'/api/events/{event.id}/', {'title': 'Gig III', 'version': 2}, format='json')
+        self.assertEqual(response.status_code, 409)
+        response = client.patch(f'/api/events/{event.id}/', {'title': 'Gig III', 'version': 3}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['version'], 4)
+        self.assertEqual(client.patch(f'/api/events/{event.id}/', {'title': 'Gig IV'},
+                                      format='json').data['version'], 5)
+
+    def test_past_events_with_reviews(self):
+        past = Event.objects.create(title='Old Gig', type='Concert', date=timezone.now() - timedelta(days=3),
+                                    price=20, created_by=self.user)
+        Event.objects.create(title='New Gig', type='Concert', date=timezone.now() + timedelta(days=3),
+                             price=20, created_by=self.user)
+        product = Product.objects.create(price=20, description='Ticket', event=past)
+        review = Review.objects.create(numberOfStars='4', comment='Nice', rating=4)
+        order = Order.objects.create(user=self.user, price=20, review=review, phoneNumber='1',
+                                     email='a@example.com', city='Krakow', address='Main St')
+        OrderProduct.objects.create(order=order, product=product, quantity=1)
+        OrderProduct.objects.create(order=order, product=product, quantity=1)
+        photo = EventPhoto.objects.create(event=past, image='event_photos/old.png')
+
+        [item] = self.service.get_past_events_with_reviews()
+        self.assertEqual(item['event'], past)
+        self.assertEqual(item['reviews'], [review])
+        self.assertEqual(item['photos'], [photo])
+        self.assertEqual(self.service.get_past_events_with_reviews(query='new'), [])
+
+    def test_event_payload_cached_until_event_changes(self):
+        event = Event.objects.create(title='Cached', type='Concert', date=timezone.now(), price=20,
+                                     created_by=self.user)
+        metrics = get_object_cache('event').metrics()
+
+        self.assertEqual(self.service.get_event_payload(event.id)['event']['title'], 'Cached')
+        with self.assertNumQueries(0):
+            self.service.get_event_payload(event.id)
+
+        event.artists.add(self.artist)
+        self.assertEqual(len(self.service.get_event_payload(event.id)['event']['artists']), 1)
+        EventDetails.objects.create(event=event, venue='Club')
+        self.assertEqual(self.service.get_event_payload(event.id)['details']['location'], 'Club')
+
+        after = get_object_cache('event').metrics()
+        self.assertEqual(after['hits'] - metrics['hits'], 1)
+        self.assertEqual(after['misses'] - metrics['misses'], 3)
+        self.assertIsNone(self.service.get_event_payload(0))
+
+    @override_settings(MEDIA_BASE_URL='https://cdn.example.com/')
+    def test_media_url_uses_configured_base(self):
+        self.assertEqual(media_url('event_photos/old.png'), 'https://cdn.example.com/media/event_photos/old.png')
+        self.assertIsNone(media_url(''))
+
 
 if __name__ == "__main__":
     suite = unittest.TestLoader().loadTestsFromTestCase(EventServiceTest)
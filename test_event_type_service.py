@@ -0,0 +1,77 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from datetime import timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from app.models.event import Event
+from app.models.event_card import EventCard
+from app.models.event_type import EventType, EventTypeAlias, normalize_type_name
+from app.services.event_card_service import EventCardService
+from app.services.event_type_service import EventTypeService
+
+
+class EventTypeServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='typist', password='123')
+        EventTypeService.ensure_defaults()
+
+    def event(self, event_type):
+        return Event.objects.create(title='Show', type=event_type, date=timezone.now() + timedelta(days=1),
+                                    price=10, created_by=self.user)
+
+    def test_normalize(self):
+        self.assertEqual(normalize_type_name('  stand-up  comédie '), 'STAND UP COMEDIE')
+
+    def test_aliases_resolve_to_one_type(self):
+        gig = self.event('gig')
+        theatre = self.event('Théâtre')
+        self.assertEqual((gig.type, gig.event_type.code), ('CONCERT', 'CONCERT'))
+        self.assertEqual(theatre.event_type.code, 'THEATER')
+
+        custom = self.event('Stand-up')
+        self.assertEqual(custom.event_type.code, 'STAND UP')
+        EventTypeService.add_alias('stand up', 'comedy')
+        self.assertEqual(self.event('Comedy').event_type, custom.event_type)
+
+        concerts = Event.objects.filter(event_type_id__in=EventType.ids_matching(['Koncert']))
+        self.assertEqual(list(concerts), [gig])
+
+    def test_backfill_links_untyped_rows(self):
+        event = self.event('festiwal')
+        Event.objects.filter(id=event.id).update(event_type=None, type='Festiwal')
+
+        self.assertEqual(EventTypeService.backfill(), [event.id])
+        updated_at = event.updated_at
+        event.refresh_from_db()
+        self.assertEqual((event.type, event.event_type.code), ('FESTIVAL', 'FESTIVAL'))
+        self.assertEqual(event.version, 2)
+        self.assertGreater(event.updated_at, updated_at)
+
+    def test_defaults_absorb_type_resolved_before_them(self):
+        EventTypeAlias.objects.all().delete()
+        EventType.objects.all().delete()
+        early = self.event('Theatre')
+        self.assertEqual(early.event_type.code, 'THEATRE')
+
+        self.assertEqual(EventTypeService.backfill(), [early.id])
+        early.refresh_from_db()
+        self.assertEqual((early.type, early.event_type.code, early.version), ('THEATER', 'THEATER', 2))
+        self.assertFalse(EventType.objects.filter(code='THEATRE').exists())
+        self.assertEqual(self.event('theatre').event_type, early.event_type)
+
+    def test_cards_filter_by_type_id(self):
+        gig = self.event('gig')
+        self.event('festival')
+        EventCardService.refresh()
+        self.assertEqual(EventCard.objects.get(event=gig).event_type.code, 'CONCERT')
+        self.assertEqual([card.event_id for card in EventCardService.cards(event_type='Koncert')], [gig.id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from django.test import TestCase, override_settings
+from app.models import FeatureFlag
+from app.services.feature_flag_service import FeatureFlagService
+
+
+class FeatureFlagServiceTest(TestCase):
+    def setUp(self):
+        FeatureFlagService.invalidate()
+
+    def tearDown(self):
+        FeatureFlagService.invalidate()
+
+    def test_default_when_flag_missing(self):
+        self.assertTrue(FeatureFlagService.is_enabled('missing', default=True))
+        self.assertFalse(FeatureFlagService.is_enabled('missing'))
+
+    def test_set_flag_is_visible_immediately(self):
+        FeatureFlagService.set_flag('new_checkout', True)
+        self.assertTrue(FeatureFlagService.is_enabled('new_checkout'))
+
+    @override_settings(FEATURE_FLAGS_TTL=60)
+    def test_snapshot_is_served_until_ttl_expires(self):
+        FeatureFlagService.set_flag('new_checkout', True)
+
+        # another worker flips the flag directly in the database
+        FeatureFlag.objects.filter(name='new_checkout').update(enabled=False)
+        self.assertTrue(FeatureFlagService.is_enabled('new_checkout'))
+
+        with self.settings(FEATURE_FLAGS_TTL=0):
+            self.assertFalse(FeatureFlagService.is_enabled('new_checkout'))
+
+    def test_toggle_creates_from_default_and_flips(self):
+        self.assertFalse(FeatureFlagService.toggle('use_synthetic_data', default=True))
+        self.assertTrue(FeatureFlagService.toggle('use_synthetic_data', default=True))
+        self.assertEqual(FeatureFlag.objects.filter(name='use_synthetic_data').count(), 1)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestLoader().loadTestsFromTestCase(FeatureFlagServiceTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,66 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import io
+import json
+import logging
+import unittest
+from app.utils.log_pipeline import QueueingHandler, SamplingFilter
+
+
+class LogPipelineTest(unittest.TestCase):
+    def make_record(self, name, level=logging.INFO, msg='hello %s', args=('world',), **extra):
+        record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+        record.__dict__.update(extra)
+        return record
+
+    def test_sampling_uses_closest_configured_parent(self):
+        sampler = SamplingFilter(rates={'app.views': 0, 'app.views.event_views': 1})
+
+        self.assertFalse(sampler.filter(self.make_record('app.views.ticket_view')))
+        self.assertTrue(sampler.filter(self.make_record('app.views.event_views')))
+        self.assertTrue(sampler.filter(self.make_record('app.services.mail_service')))
+
+    def test_sampling_never_drops_warnings(self):
+        sampler = SamplingFilter(rates={'app': 0})
+        self.assertTrue(sampler.filter(self.make_record('app.views', level=logging.WARNING)))
+
+    def test_handler_writes_structured_json_off_thread(self):
+        stream = io.StringIO()
+        handler = QueueingHandler(stream=stream)
+        handler.handle(self.make_record('app.test', order_id=7))
+        handler.close()
+
+        payload = json.loads(stream.getvalue())
+        self.assertEqual(payload['message'], 'hello world')
+        self.assertEqual(payload['order_id'], 7)
+        self.assertEqual(payload['logger'], 'app.test')
+
+    def test_message_rendered_when_logged(self):
+        stream = io.StringIO()
+        handler = QueueingHandler(stream=stream)
+        data = {'seat': 'A1'}
+        handler.listener.stop()  # hold the record in the queue
+        handler.handle(self.make_record('app.test', msg='booking %s', args=(data,)))
+        data['seat'] = 'B2'
+        handler.listener.start()
+        handler.close()
+
+        self.assertEqual(json.loads(stream.getvalue())['message'], "booking {'seat': 'A1'}")
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = QueueingHandler(maxsize=1, stream=io.StringIO())
+        handler.listener.stop()
+        handler._stopped = True
+
+        handler.handle(self.make_record('app.test'))
+        handler.handle(self.make_record('app.test'))
+
+        self.assertEqual(handler.dropped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
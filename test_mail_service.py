@@ -0,0 +1,207 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import socket
+import socketserver
+import threading
+import unittest
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from app.models import QueuedEmail
+from app.services.mail_service import MailService
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for Django's backend; hangs instead when the server is in slow mode"""
+
+    def handle(self):
+        if self.server.slow:
+            self.server.release.wait(5)
+            return
+        self.wfile.write(b"220 fake ESMTP\r\n")
+        in_data = False
+        for line in self.rfile:
+            if in_data:
+                if line == b".\r\n":
+                    in_data = False
+                    self.server.messages += 1
+                    self.wfile.write(b"250 queued\r\n")
+                continue
+            command = line[:4].upper()
+            if command == b"DATA":
+                in_data = True
+                self.wfile.write(b"354 go ahead\r\n")
+            elif command == b"QUIT":
+                self.wfile.write(b"221 bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 ok\r\n")
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, slow=False):
+        super().__init__(('127.0.0.1', 0), FakeSMTPHandler)
+        self.slow = slow
+        self.release = threading.Event()
+        self.messages = 0
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def stop(self):
+        self.release.set()
+        self.shutdown()
+        self.server_close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=10, clock=self.clock)
+
+    def _boom(self):
+        raise OSError("boom")
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                self.breaker.call(self._boom)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(lambda: 'never called')
+        self.assertEqual(self.breaker.metrics()['rejections'], 1)
+
+    def test_half_open_probe_closes_on_success(self):
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                self.breaker.call(self._boom)
+
+        self.clock.now = 11
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe_reopens_on_failure(self):
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                self.breaker.call(self._boom)
+
+        self.clock.now = 11
+        with self.assertRaises(OSError):
+            self.breaker.call(self._boom)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.metrics()['opened'], 2)
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+    EMAIL_HOST='127.0.0.1',
+    EMAIL_USE_TLS=False,
+    EMAIL_HOST_USER='',
+    EMAIL_HOST_PASSWORD='',
+    EMAIL_TIMEOUT=0.5,
+)
+class MailServiceTest(TestCase):
+    def setUp(self):
+        get_breaker('smtp').reset()
+
+    def tearDown(self):
+        get_breaker('smtp').reset()
+
+    def test_send_through_fake_server(self):
+        server = FakeSMTPServer()
+        try:
+            with self.settings(EMAIL_PORT=server.port):
+                sent = MailService.send('Subject', 'Body', ['buyer@example.com'],
+                                        attachment=('ticket.pdf', b'%PDF', 'application/pdf'))
+        finally:
+            server.stop()
+
+        self.assertTrue(sent)
+        self.assertEqual(server.messages, 1)
+        self.assertEqual(QueuedEmail.objects.count(), 0)
+
+    def test_slow_server_times_out_opens_circuit_and_queues(self):
+        rejections = get_breaker('smtp').metrics()['rejections']
+        server = FakeSMTPServer(slow=True)
+        try:
+            with self.settings(EMAIL_PORT=server.port):
+                for _ in range(get_breaker('smtp').failure_threshold):
+                    self.assertFalse(MailService.send('Subject', 'Body', ['buyer@example.com']))
+
+                self.assertEqual(get_breaker('smtp').state, CircuitBreaker.OPEN)
+                self.assertFalse(MailService.send('Subject', 'Body', ['buyer@example.com']))
+        finally:
+            server.stop()
+
+        self.assertEqual(get_breaker('smtp').metrics()['rejections'], rejections + 1)
+        self.assertEqual(QueuedEmail.objects.filter(status='pending').count(), 4)
+
+    def test_flush_queue_sends_pending_emails(self):
+        MailService.enqueue('Subject', 'Body', ['buyer@example.com'],
+                            attachment=('ticket.pdf', b'%PDF', 'application/pdf'))
+        server = FakeSMTPServer()
+        try:
+            with self.settings(EMAIL_PORT=server.port):
+                stats = MailService.flush_queue()
+        finally:
+            server.stop()
+
+        self.assertEqual(stats['sent'], 1)
+        self.assertEqual(stats['remaining'], 0)
+        self.assertEqual(QueuedEmail.objects.get().status, 'sent')
+
+    def test_flush_queue_stops_when_circuit_open(self):
+        breaker = get_breaker('smtp')
+        for _ in range(breaker.failure_threshold):
+            with self.assertRaises(OSError):
+                breaker.call(socket.create_connection, ('127.0.0.1', 1), 0.1)
+        MailService.enqueue('Subject', 'Body', ['buyer@example.com'])
+
+        stats = MailService.flush_queue()
+
+        self.assertEqual(stats['sent'], 0)
+        self.assertEqual(stats['remaining'], 1)
+        self.assertEqual(QueuedEmail.objects.get().attempts, 0)
+
+    def test_claimed_emails_are_not_flushed_twice(self):
+        taken = MailService.enqueue('Taken', 'Body', ['buyer@example.com'])
+        abandoned = MailService.enqueue('Abandoned', 'Body', ['buyer@example.com'])
+        now = timezone.now()
+        QueuedEmail.objects.filter(id=taken.id).update(status='sending', claimed_at=now)
+        QueuedEmail.objects.filter(id=abandoned.id).update(status='sending',
+                                                           claimed_at=now - MailService.CLAIM_TIMEOUT * 2)
+
+        server = FakeSMTPServer()
+        try:
+            with self.settings(EMAIL_PORT=server.port):
+                stats = MailService.flush_queue()
+        finally:
+            server.stop()
+
+        self.assertEqual(stats['sent'], 1)
+        self.assertEqual(QueuedEmail.objects.get(id=abandoned.id).status, 'sent')
+        self.assertEqual(QueuedEmail.objects.get(id=taken.id).status, 'sending')
+
+
+if __name__ == "__main__":
+    unittest.main()
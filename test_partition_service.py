@@ -0,0 +1,66 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.contrib.auth.models import User
+from django.test import TestCase
+from app.models.orders import Order, OrderProduct, Product
+from app.services.partition_service import PartitionService, _add_months
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class PartitionNamingTest(unittest.TestCase):
+    def test_add_months_crosses_years_and_returns_month_start(self):
+        self.assertEqual(_add_months(utc(2030, 11, 17, 9), 3), utc(2031, 2, 1))
+        self.assertEqual(_add_months(utc(2030, 1, 31), -1), utc(2029, 12, 1))
+        self.assertEqual(_add_months(utc(2030, 5, 2), -24), utc(2028, 5, 1))
+
+    def test_partition_name(self):
+        self.assertEqual(PartitionService.partition_name('app_order', utc(2030, 3, 1)), 'app_order_p203003')
+
+    def test_archive_cutoff_keeps_recent_and_current_months(self):
+        cutoff = PartitionService.archive_cutoff(2, now=utc(2030, 5, 20))
+        self.assertEqual(cutoff, utc(2030, 3, 1))
+
+        months = PartitionService.months_to_archive({
+            'app_order': [('app_order_p203001', utc(2030, 1, 1)), ('app_order_p203002', utc(2030, 2, 1)),
+                          ('app_order_p203003', utc(2030, 3, 1))],
+            'app_ticket': [('app_ticket_p203002', utc(2030, 2, 1)), ('app_ticket_p203003', utc(2030, 3, 1))],
+        }, cutoff)
+        self.assertEqual(months, {
+            utc(2030, 1, 1): {'app_order': 'app_order_p203001'},
+            utc(2030, 2, 1): {'app_order': 'app_order_p203002', 'app_ticket': 'app_ticket_p203002'},
+        })
+
+
+class OrderDateCopyTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='buyer', password='123')
+        self.order = Order.objects.create(user=user, price=10, phoneNumber='1', email='a@example.com',
+                                          city='Krakow', address='Main St', date=utc(2030, 1, 15))
+        self.product = Product.objects.create(price=10, description='Ticket')
+
+    def test_bulk_created_lines_copy_order_date(self):
+        OrderProduct.objects.bulk_create([OrderProduct(order_id=self.order.id, product=self.product)])
+        self.order.products.add(Product.objects.create(price=5, description='Parking'))
+        self.assertEqual(set(OrderProduct.objects.values_list('order_date', flat=True)), {self.order.date})
+
+    def test_lines_follow_order_date_changes(self):
+        OrderProduct.objects.create(order=self.order, product=self.product)
+        order = Order.objects.get(id=self.order.id)
+        order.date += timedelta(days=40)
+        order.save()
+
+        self.assertEqual(OrderProduct.objects.get().order_date, order.date)
+        self.assertEqual(order.lines().count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from datetime import timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from app.models.event import Event
+from app.models.event_popularity import EventPopularity
+from app.models.orders import Order, OrderProduct, Product
+from app.models.ticket import Ticket
+from app.models.user_event_favorite import UserEventFavorite
+from app.services.popularity_service import PopularityService
+
+
+class PopularityServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='fan', password='123')
+        soon = timezone.now() + timedelta(days=5)
+        self.quiet = Event.objects.create(title='Quiet', type='CONCERT', date=soon, price=10, created_by=self.user)
+        self.busy = Event.objects.create(title='Busy', type='CONCERT', date=soon, price=10, created_by=self.user)
+        self.past = Event.objects.create(title='Past', type='CONCERT', date=timezone.now() - timedelta(days=1),
+                                         price=10, created_by=self.user)
+
+    def top_ids(self, limit=10):
+        return [event.id for event in PopularityService.top(limit)]
+
+    def test_leaderboard_follows_activity(self):
+        self.assertEqual(self.top_ids(), [self.quiet.id, self.busy.id])
+
+        ticket = Ticket.objects.create(user=self.user, event=self.busy, quantity=2)
+        self.assertEqual(self.top_ids(), [self.busy.id, self.quiet.id])
+
+        product = Product.objects.create(price=10, description='Ticket', event=self.quiet)
+        order = Order.objects.create(user=self.user, price=10, phoneNumber='1', email='a@example.com',
+                                     city='Lodz', address='Main St')
+        OrderProduct.objects.create(order=order, product=product)
+        UserEventFavorite.objects.create(user=self.user, event=self.quiet, is_favorite=True)
+        self.assertEqual(self.top_ids(limit=1), [self.quiet.id])
+        self.assertEqual(EventPopularity.objects.get(event=self.quiet).order_count, 1)
+
+        ticket.delete()
+        self.assertEqual(EventPopularity.objects.get(event=self.busy).score, 0)
+
+    def test_recent_activity_outweighs_older_activity(self):
+        old = Ticket.objects.create(user=self.user, event=self.quiet, quantity=3)
+        Ticket.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=60))
+        Ticket.objects.create(user=self.user, event=self.busy, quantity=1)
+        PopularityService.refresh([self.quiet.id])
+        self.assertEqual(self.top_ids(), [self.busy.id, self.quiet.id])
+
+    def test_rebuild_covers_every_event(self):
+        EventPopularity.objects.all().delete()
+        PopularityService.refresh()
+        self.assertEqual(EventPopularity.objects.count(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
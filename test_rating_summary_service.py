@@ -0,0 +1,102 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APIClient
+from app.models.event import Event
+from app.models.event_card import EventCard
+from app.models.event_rating_summary import EventRatingSummary
+from app.models.orders import Order, OrderProduct, Product, Review
+from app.models.user import AppUser
+from app.serializers.event_serializer import EventSerializer
+from app.services.rating_summary_service import RatingSummaryService
+
+
+class RatingSummaryServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='critic', password='123')
+        AppUser.objects.create(user=self.user, first_name='C', last_name='R')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.gig = Event.objects.create(title='Gig', type='CONCERT', date=timezone.now(), price=10,
+                                        created_by=self.user)
+        self.other = Event.objects.create(title='Other', type='CONCERT', date=timezone.now(), price=10,
+                                          created_by=self.user)
+        self.order = self.order_for(self.gig)
+
+    def order_for(self, event):
+        order = Order.objects.create(user=self.user, price=10, phoneNumber='1', email='a@example.com',
+                                     city='Gdansk', address='Main St')
+        OrderProduct.objects.create(order=order, product=Product.objects.create(price=10, description='T',
+                                                                                event=event), quantity=1)
+        return order
+
+    def summary(self, event):
+        summary = EventRatingSummary.objects.filter(event=event).first()
+        return summary and (summary.review_count, summary.average_rating, summary.histogram)
+
+    def review(self, order, stars):
+        response = self.client.post(f'/api/orders/{order.id}/add_review/',
+                                    {'numberOfStars': stars, 'comment': 'ok', 'rating': int(stars)})
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_review_endpoints_update_summary(self):
+        self.review(self.order, '4')
+        self.review(self.order_for(self.gig), '2')
+        self.assertEqual(self.summary(self.gig), (2, 3.0, {'1': 0, '2': 1, '3': 0, '4': 1, '5': 0}))
+
+        self.client.put(f'/api/orders/{self.order.id}/update_review/', {'numberOfStars': '5'})
+        self.assertEqual(self.summary(self.gig), (2, 3.5, {'1': 0, '2': 1, '3': 0, '4': 0, '5': 1}))
+        self.assertEqual(EventCard.objects.get(event=self.gig).average_rating, 3.5)
+
+        # the review now also rates the other event
+        self.client.post(f'/api/orders/{self.order.id}/add-product/',
+                         {'product_id': Product.objects.create(price=5, description='T', event=self.other).id})
+        self.assertEqual(self.summary(self.other)[:2], (1, 5.0))
+
+        self.client.delete(f'/api/orders/{self.order.id}/delete_review/')
+        self.assertEqual(self.summary(self.gig)[:2], (1, 2.0))
+        self.assertEqual(self.summary(self.other)[:2], (0, None))
+        # event cards copy the summaries
+        self.assertEqual(EventCard.objects.get(event=self.gig).review_count, 1)
+        self.assertEqual(EventCard.objects.get(event=self.gig).average_rating, 2.0)
+        self.assertEqual(EventCard.objects.get(event=self.other).review_count, 0)
+
+    def test_deleting_an_order_drops_its_review(self):
+        self.review(self.order, '4')
+        review_id = Order.objects.get(id=self.order.id).review_id
+        self.assertEqual(self.client.delete(f'/api/orders/{self.order.id}/').status_code, 204)
+
+        self.assertEqual(self.summary(self.gig)[:2], (0, None))
+        self.assertFalse(Review.objects.filter(id=review_id).exists())
+
+    def test_rebuild_repairs_drift(self):
+        self.review(self.order, '3')
+        EventRatingSummary.objects.filter(event=self.gig).update(review_count=7, stars_sum=1)
+        EventRatingSummary.objects.create(event=self.other, review_count=1, stars_sum=5, stars_5=1)
+        Order.objects.filter(id=self.order_for(self.gig).id).update(
+            review=Review.objects.create(numberOfStars='1', comment='meh', rating=1))
+
+        RatingSummaryService.rebuild()
+        self.assertEqual(self.summary(self.gig), (2, 2.0, {'1': 1, '2': 0, '3': 1, '4': 0, '5': 0}))
+        self.assertIsNone(self.summary(self.other))
+
+    def test_payload_reads_joined_summary(self):
+        self.review(self.order, '5')
+        events = list(Event.objects.filter(id__in=[self.gig.id, self.other.id]).with_serializer_relations())
+        with self.assertNumQueries(0):
+            data = EventSerializer(events, many=True).data
+        ratings = {item['id']: item['rating'] for item in data}
+        self.assertEqual(ratings[self.gig.id]['average'], 5.0)
+        self.assertEqual(ratings[self.other.id]['count'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
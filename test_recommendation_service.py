@@ -0,0 +1,83 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from datetime import timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+from app.models.artist import Artist
+from app.models.event import Event
+from app.models.event_recommendation import EventRecommendation
+from app.models.ticket import Ticket
+from app.models.user_event_favorite import UserEventFavorite
+from app.services.recommendation_service import RecommendationService
+
+
+class RecommendationServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.fan = User.objects.create_user(username='rockfan', password='123')
+        self.newcomer = User.objects.create_user(username='newcomer', password='123')
+        rock = Artist.objects.create(name='Rockers')
+
+        def event(title, event_type, days, artist=None):
+            created = Event.objects.create(title=title, type=event_type, date=timezone.now() + timedelta(days=days),
+                                           price=10, created_by=self.fan)
+            if artist:
+                created.artists.add(artist)
+            return created
+
+        self.seen = event('Rockers 2025', 'CONCERT', -30, rock)
+        self.liked = event('Rockers Tour', 'CONCERT', 10, rock)
+        self.same_artist = event('Rockers Encore', 'FESTIVAL', 20, rock)
+        self.same_type = event('Other Concert', 'CONCERT', 5)
+        self.unrelated = event('Chess Open', 'SPORT', 3)
+        for i in range(3):
+            Ticket.objects.create(user=self.newcomer, event=self.unrelated, quantity=1)
+
+        Ticket.objects.create(user=self.fan, event=self.seen, quantity=1)
+        UserEventFavorite.objects.create(user=self.fan, event=self.liked, is_favorite=True)
+
+    def test_ranks_similar_upcoming_events_and_skips_known_ones(self):
+        self.assertEqual(RecommendationService.build(), 2)
+
+        ranked = list(EventRecommendation.objects.filter(user=self.fan).order_by('rank')
+                      .values_list('event_id', flat=True))
+        self.assertEqual(ranked[:2], [self.same_artist.id, self.same_type.id])
+        self.assertNotIn(self.liked.id, ranked)
+        self.assertEqual([event.id for event in RecommendationService.recommend(self.fan, 1)], [self.same_artist.id])
+
+    def test_serves_from_cache_and_falls_back_to_popular(self):
+        RecommendationService.build()
+        RecommendationService.recommended_event_ids(self.fan.id)
+        with self.assertNumQueries(0):
+            RecommendationService.recommended_event_ids(self.fan.id)
+
+        stranger = User.objects.create_user(username='stranger', password='123')
+        self.assertEqual([event.id for event in RecommendationService.recommend(stranger, 1)], [self.unrelated.id])
+
+    def test_falls_back_to_popular_once_picks_are_past(self):
+        RecommendationService.build()
+        picks = EventRecommendation.objects.filter(user=self.fan).values_list('event_id', flat=True)
+        Event.objects.filter(id__in=list(picks)).update(date=timezone.now() - timedelta(days=1))
+        cache.clear()
+
+        self.assertEqual([event.id for event in RecommendationService.recommend(self.fan, 1)], [self.unrelated.id])
+
+    def test_rebuild_drops_cached_picks_of_users_left_out(self):
+        RecommendationService.build()
+        self.assertTrue(RecommendationService.recommended_event_ids(self.fan.id))
+
+        Ticket.objects.filter(user=self.fan).delete()
+        UserEventFavorite.objects.filter(user=self.fan).delete()
+        RecommendationService.build()
+        self.assertEqual(RecommendationService.recommended_event_ids(self.fan.id), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from datetime import timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APIClient
+from app.models.event import Event
+from app.models.orders import Order, OrderProduct, Product
+from app.models.similar_event import SimilarEvent, SimilarEventRefresh
+from app.models.user_event_favorite import UserEventFavorite
+from app.services.similar_event_service import SimilarEventService
+
+
+class SimilarEventServiceTest(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'buyer{i}', password='123') for i in range(3)]
+        soon = timezone.now() + timedelta(days=7)
+        self.a, self.b, self.c = [
+            Event.objects.create(title=title, type='CONCERT', date=soon, price=10, created_by=self.users[0])
+            for title in ('A', 'B', 'C')
+        ]
+
+    def buy(self, user, event):
+        product = Product.objects.create(price=10, description='Ticket', event=event)
+        order = Order.objects.create(user=user, price=10, phoneNumber='1', email='b@example.com',
+                                     city='Gdansk', address='Main St')
+        OrderProduct.objects.create(order=order, product=product)
+
+    def neighbours(self, event):
+        return [(row.similar_id, round(row.score, 3)) for row in SimilarEventService.similar(event.id)]
+
+    def test_incremental_updates_match_batch_build(self):
+        self.buy(self.users[0], self.a)
+        self.buy(self.users[0], self.b)
+        self.buy(self.users[1], self.a)
+        UserEventFavorite.objects.create(user=self.users[1], event=self.c, is_favorite=True)
+        UserEventFavorite.objects.create(user=self.users[2], event=self.a, is_favorite=True)
+        SimilarEventService.refresh_queued()
+
+        # a is in three baskets, b and c in one each, both share one basket with a
+        self.assertEqual(self.neighbours(self.a), [(self.b.id, 0.577), (self.c.id, 0.577)])
+        self.assertEqual(self.neighbours(self.b), [(self.a.id, 0.577)])
+        incremental = set(SimilarEvent.objects.values_list('event_id', 'similar_id', 'rank'))
+
+        SimilarEventService.build()
+        self.assertEqual(set(SimilarEvent.objects.values_list('event_id', 'similar_id', 'rank')), incremental)
+
+    def test_removing_a_favorite_drops_the_pair(self):
+        self.buy(self.users[0], self.a)
+        favorite = UserEventFavorite.objects.create(user=self.users[0], event=self.b, is_favorite=True)
+        SimilarEventService.refresh_queued()
+        self.assertEqual(self.neighbours(self.b), [(self.a.id, 1.0)])
+
+        favorite.delete()
+        SimilarEventService.refresh_queued()
+        self.assertEqual(self.neighbours(self.a), [])
+        self.assertEqual(self.neighbours(self.b), [])
+
+    def test_writes_only_queue_the_basket(self):
+        self.buy(self.users[0], self.a)
+        self.buy(self.users[0], self.a)
+        UserEventFavorite.objects.create(user=self.users[0], event=self.b, is_favorite=True)
+
+        self.assertFalse(SimilarEvent.objects.exists())
+        self.assertEqual(set(SimilarEventRefresh.objects.values_list('user_id', 'event_id')),
+                         {(self.users[0].id, self.a.id), (self.users[0].id, self.b.id)})
+        self.assertEqual(SimilarEventService.refresh_queued(), 2)
+        self.assertFalse(SimilarEventRefresh.objects.exists())
+        self.assertEqual(self.neighbours(self.a), [(self.b.id, 1.0)])
+
+    def test_endpoint_validates_limit(self):
+        client = APIClient()
+        client.force_authenticate(self.users[0])
+        self.assertEqual(client.get(f'/api/events/{self.a.id}/similar/?limit=abc').status_code, 400)
+        self.assertEqual(client.get(f'/api/events/{self.a.id}/similar/?limit=0').status_code, 400)
+        self.assertEqual(client.get(f'/api/events/{self.a.id}/similar/?limit=100000').status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import time
+import unittest
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from app.models.artist import Artist
+from app.models.event import Event
+from app.models.ticket import Ticket
+from app.services import typeahead_service
+from app.services.typeahead_service import PrefixIndex, TypeaheadService
+from rest_framework.test import APIClient
+
+
+class PrefixIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = PrefixIndex(k=2)
+        self.index.add(('event', 1), 'Taylor Swift - Eras Tour', 5)
+        self.index.add(('event', 2), 'Swan Lake', 9)
+        self.index.add(('artist', 3), 'Świetliki', 1)
+
+    def keys(self, prefix, limit=None):
+        return [key for key, label, weight, payload in self.index.lookup(prefix, limit)]
+
+    def test_matches_any_word_ordered_by_weight(self):
+        self.assertEqual(self.keys('sw'), [('event', 2), ('event', 1)])
+        self.assertEqual(self.keys('eras'), [('event', 1)])
+
+    def test_top_k_is_capped_and_accent_folded(self):
+        self.assertEqual(len(self.keys('s', limit=5)), 2)
+        self.assertEqual(self.keys('swie'), [('artist', 3)])
+
+    def test_updates_invalidate_cached_top_k(self):
+        self.assertEqual(self.keys('sw')[0], ('event', 2))
+        self.index.add(('event', 1), 'Taylor Swift - Eras Tour', 20)
+        self.assertEqual(self.keys('sw')[0], ('event', 1))
+        self.index.remove(('event', 1))
+        self.assertEqual(self.keys('sw'), [('event', 2), ('artist', 3)])
+
+
+class TypeaheadServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='typer', password='123')
+        self.quiet = Event.objects.create(title='Metal Night', type='CONCERT', date=timezone.now(),
+                                          price=10, created_by=self.user)
+        self.busy = Event.objects.create(title='Metallica Live', type='CONCERT', date=timezone.now(),
+                                         price=10, created_by=self.user)
+        Ticket.objects.create(user=self.user, event=self.busy, quantity=3)
+        TypeaheadService.rebuild()
+
+    def test_popular_events_first_and_incremental_updates(self):
+        self.assertEqual([s['id'] for s in TypeaheadService.suggest('meta')], [self.busy.id, self.quiet.id])
+
+        self.quiet.title = 'Jazz Night'
+        self.quiet.save()
+        self.assertEqual([s['id'] for s in TypeaheadService.suggest('meta')], [self.busy.id])
+
+        artist = Artist.objects.create(name='Metallica')
+        self.assertIn(('artist', artist.id), [(s['type'], s['id']) for s in TypeaheadService.suggest('metallica')])
+
+        self.busy.delete()
+        self.assertEqual([s['type'] for s in TypeaheadService.suggest('metallica')], ['artist'])
+
+    def test_writes_during_rebuild_reach_the_new_index(self):
+        artist_rows = TypeaheadService._artist_rows
+
+        def rename_while_reading(artists):
+            Event.objects.filter(id=self.quiet.id).update(title='Jazz Night')
+            TypeaheadService.refresh_events([self.quiet.id])
+            return artist_rows(artists)
+
+        with mock.patch.object(TypeaheadService, '_artist_rows', side_effect=rename_while_reading):
+            TypeaheadService.rebuild()
+        self.assertEqual([s['id'] for s in TypeaheadService.suggest('jazz')], [self.quiet.id])
+
+    def test_stale_index_keeps_serving_while_rebuilt_in_background(self):
+        with mock.patch.object(typeahead_service, '_built_at', time.monotonic() - 10 ** 6), \
+                mock.patch.object(typeahead_service.threading, 'Thread') as thread:
+            self.assertEqual(len(TypeaheadService.suggest('meta')), 2)
+            self.assertEqual(len(TypeaheadService.suggest('meta')), 2)
+        thread.assert_called_once()
+        typeahead_service._build_lock.release()
+
+    def test_suggest_limit_is_clamped(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(len(client.get('/api/suggest', {'q': 'meta', 'limit': -3}).data), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tsa_backend.settings')
+django.setup()
+
+import unittest
+from datetime import timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APIClient
+from app.models.event import Event
+from app.models.event_details import EventDetails
+from app.models.user import AppUser
+from app.models.venue import Venue, normalize_venue_name
+from app.services.venue_service import VenueService
+from app.utils import geohash
+
+
+class GeohashTest(unittest.TestCase):
+    def test_encode_and_distance(self):
+        self.assertEqual(geohash.encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.assertAlmostEqual(geohash.distance_km(50.0647, 19.9450, 52.2297, 21.0122), 252, delta=1)
+
+    def test_cells_cover_the_radius(self):
+        cells = geohash.covering_cells(50.06, 19.94, 10)
+        self.assertEqual(len(cells), 9)
+        self.assertIn(geohash.encode(50.06, 19.94)[:len(next(iter(cells)))], cells)
+
+
+class VenueServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='traveller', password='123')
+
+    def event(self, place, days=3):
+        return Event.objects.create(title='Gig', type='CONCERT', date=timezone.now() + timedelta(days=days),
+                                    price=10, place=place, created_by=self.user)
+
+    def test_spellings_share_a_venue(self):
+        self.assertEqual(normalize_venue_name(' Tauron  Arena, Kraków '), 'tauron arena krakow')
+        first, second = self.event('Tauron Arena, Kraków'), self.event('tauron arena krakow')
+        self.assertEqual(first.venue, second.venue)
+        self.assertEqual(Venue.objects.count(), 1)
+
+    def test_backfill_deduplicates_places_and_details(self):
+        by_place, by_details = self.event('Spodek'), self.event(None)
+        EventDetails.objects.create(event=by_details, venue='SPODEK ')
+        Event.objects.update(venue=None)
+        Venue.objects.all().delete()
+
+        self.assertEqual(VenueService.backfill(), sorted([by_place.id, by_details.id]))
+        self.assertEqual(set(Event.objects.values_list('version', flat=True)), {2})
+        self.assertEqual(Venue.objects.get().name, 'Spodek')
+
+    def test_nearby_events_nearest_first(self):
+        close, far = self.event('Tauron Arena'), self.event('Stadion Narodowy')
+        past = self.event('Tauron Arena', days=-3)
+        for venue, (lat, lon) in ((close.venue, (50.0677, 19.9914)), (far.venue, (52.2395, 21.0458))):
+            venue.latitude, venue.longitude = lat, lon
+            venue.save()
+        near_also = self.event('Tauron Arena')
+
+        found = VenueService.nearby_events(50.0614, 19.9366, 10)
+        self.assertEqual([event.id for event, distance in found], [close.id, near_also.id])
+        self.assertNotIn(past.id, [event.id for event, distance in found])
+        self.assertLess(found[0][1], 5)
+        self.assertEqual(len(VenueService.nearby_events(50.0614, 19.9366, 400)), 3)
+
+    def test_blanking_the_place_clears_the_venue(self):
+        event = self.event('Spodek')
+        event.place = ''
+        event.save(update_fields=['place'])
+        event.refresh_from_db()
+        self.assertIsNone(event.venue)
+
+    def test_only_admins_edit_venues(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        spodek, arena = self.event('Spodek').venue, self.event('Tauron Arena').venue
+        self.assertEqual(client.get('/api/venues/').status_code, 200)
+        self.assertEqual(client.patch(f'/api/venues/{spodek.id}/', {'latitude': 50.1}).status_code, 403)
+
+        AppUser.objects.create(user=self.user, role='admin', first_name='V', last_name='A')
+        response = client.patch(f'/api/venues/{spodek.id}/', {'name': 'TAURON arena'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('name', response.data)
+        self.assertEqual(client.patch(f'/api/venues/{arena.id}/', {'name': 'Tauron Arena Kraków'},
+                                      format='json').status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -47,6 +47,8 @@ MIDDLEWARE = [
 ROOT_URLCONF = 'tsa_backend.urls'
 
 MEDIA_URL = '/media/'
+# absolute base for media links in API payloads (e.g. a CDN); None builds them from the request host
+MEDIA_BASE_URL = os.environ.get('MEDIA_BASE_URL') or None
 MEDIA_ROOT = BASE_DIR
 
 TEMPLATES = [
@@ -129,3 +131,91 @@ EMAIL_HOST_USER = 'tticketpurchasesystem@gmail.com'
 EMAIL_USE_TLS = True
 EMAIL_USE_SSL = False
 EMAIL_HOST_PASSWORD = 'lcom wrqv sxeo srwr'
+EMAIL_TIMEOUT = 10
+
+# outbound dependencies guarded by app.utils.circuit_breaker
+CIRCUIT_BREAKERS = {
+    'smtp': {'failure_threshold': 3, 'reset_timeout': 60},
+    'storage': {'failure_threshold': 5, 'reset_timeout': 30},
+    'payment': {'failure_threshold': 5, 'reset_timeout': 30},
+}
+
+# seconds a worker may serve its cached feature flag snapshot
+FEATURE_FLAGS_TTL = 5
+
+# keep ratio of DEBUG/INFO records per logger, see app.utils.log_pipeline.SamplingFilter
+LOG_SAMPLING = {
+    'app.views.ticket_view': 0.1,
+    'app.views.voucher_views': 0.1,
+    'app.views.event_details_views': 0.2,
+    'app.views.event_views': 0.2,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'sampling': {
+            '()': 'app.utils.log_pipeline.SamplingFilter',
+            'rates': LOG_SAMPLING,
+        },
+    },
+    'handlers': {
+        'async_console': {
+            'class': 'app.utils.log_pipeline.QueueingHandler',
+            'filters': ['sampling'],
+        },
+    },
+    'loggers': {
+        'app': {
+            'handlers': ['async_console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# shared by every worker: cached payloads are invalidated by bumping generation keys stored here, a per-process
+# cache would leave the other workers serving stale entries. Create the table with `manage.py createcachetable`
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'app_cache',
+    }
+}
+
+# full rebuild interval of the autocomplete index, titles are also updated incrementally
+TYPEAHEAD_REBUILD_SECONDS = 600
+
+# popularity leaderboard: activity weight halves every this many days
+POPULARITY_HALF_LIFE_DAYS = 14
+
+# personalized recommendations, rebuilt nightly by `manage.py build_recommendations`
+RECOMMENDATIONS_PER_USER = 20
+RECOMMENDATIONS_CACHE_SECONDS = 3600
+
+# "customers also bought": neighbours kept per event; orders and favorites only queue their events,
+# recomputed by `manage.py build_similar_events --queued` every few minutes
+SIMILAR_EVENTS_PER_EVENT = 10
+
+# cached facet counts of /api/events/facets/, also dropped whenever an event changes
+EVENT_FACETS_CACHE_SECONDS = 300
+
+# cached past_events_with_reviews responses, dropped on event, order, review and photo changes
+PAST_EVENTS_CACHE_SECONDS = 60
+
+# upper bound on the occurrences one event series may generate
+EVENT_SERIES_MAX_OCCURRENCES = 500
+
+# rows written per transaction by the bulk event import
+EVENT_IMPORT_CHUNK_SIZE = 500
+
+# cached /api/events/<id>/ payloads, versioned per event and dropped on writes to it, its details, artists,
+# photos, attachments and reviews
+EVENT_CACHE_SECONDS = 300
+
+# cached public part of /api/events/<id>/page/, dropped whenever the event or its activity changes
+EVENT_PAGE_CACHE_SECONDS = 300
+
+# dependent rows removed per transaction by the background event deletion, `manage.py run_event_deletions`
+EVENT_DELETION_CHUNK_SIZE = 1000
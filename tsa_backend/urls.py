@@ -13,12 +13,18 @@ from app.views.technical_issue_views import TechnicalIssueViewSet
 from app.views.loyalty_program_views import LoyaltyProgramViewSet
 from app.views.ticket_view import BasketView
 from app.views.voucher_views import VoucherViewSet
+from app.views.venue_views import VenueViewSet
+from app.views.event_series_views import EventSeriesViewSet
+from app.views.event_deletion_views import EventDeletionViewSet
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
     TokenBlacklistView,
 )
 from app.views.mail_views import send_ticket_email
+from app.views.health_views import circuit_breaker_status, object_cache_status
+from app.views.suggest_views import suggest
+from app.views.calendar_views import calendar_feed, calendar_feed_url
 from django.conf import settings
 from django.conf.urls.static import static
 from app.views.statistics_views import (
@@ -44,6 +50,9 @@ router.register(r'tickets', TicketsViewSet, basename='tickets')
 router.register(r'reviews', ReviewViewSet, basename='reviews')
 router.register(r'attachments', EventAttachmentViewSet, basename='attachments')
 router.register(r'vouchers', VoucherViewSet, basename='vouchers')
+router.register(r'venues', VenueViewSet, basename='venues')
+router.register(r'event-series', EventSeriesViewSet, basename='event-series')
+router.register(r'event-deletions', EventDeletionViewSet, basename='event-deletions')
 router.register(r'reviews', ReviewViewSet)
 
 urlpatterns = [
@@ -54,6 +63,11 @@ urlpatterns = [
     path('api/events/statistics/type-distribution/', event_type_distribution, name='event-type-distribution'),
     path('api/events/statistics/toggle-data-source/', toggle_data_source, name='toggle-data-source'),
     path('api/events/statistics/data-source-status/', data_source_status, name='data-source-status'),
+    path('api/suggest', suggest, name='suggest'),
+    path('api/calendar/feed-url/', calendar_feed_url, name='calendar-feed-url'),
+    path('api/calendar/<int:user_id>.ics', calendar_feed, name='calendar-feed'),
+    path('api/health/circuit-breakers/', circuit_breaker_status, name='circuit-breaker-status'),
+    path('api/health/object-caches/', object_cache_status, name='object-cache-status'),
     path('api/', include(router.urls)),
     path('api/users', UserViewSet.as_view({'get': 'list', 'post': 'create'})),
     path('api/users/<pk>', UserViewSet.as_view({'get': 'retrieve', 'put': 'update', 'delete': 'destroy'})),